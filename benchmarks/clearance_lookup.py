@@ -0,0 +1,107 @@
+"""
+Clearance lookup benchmark for FROST AI
+Compares the compiled role lookup against the original nested-loop resolver
+
+Usage:
+    python -m benchmarks.clearance_lookup
+    python -m benchmarks.clearance_lookup --members 20000 --rounds 5
+
+Builds a synthetic guild whose members hold a realistic spread of configured
+and unconfigured roles, checks that every resolver agrees with the original
+implementation, then times a full pass over the member list (what /stats and
+the operator roster do) for each resolver.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.fakes import FakeAPI, FakeGuild
+from config.settings import Config
+from utils.clearance import ClearanceCache
+
+
+def legacy_security_level(roles):
+    """Config.get_security_level as it was before the compiled lookup"""
+    role_names = [role.lower() for role in roles]
+    for level, role_list in Config.clearance_tiers():
+        for role in role_list:
+            if role and role.lower() in role_names:
+                return level
+    return 'CIVILIAN'
+
+
+def build_guild(members, seed):
+    """Guild with every configured role, some cosmetic roles and ``members`` members"""
+    rng = random.Random(seed)
+    guild = FakeGuild(FakeAPI())
+
+    configured = []
+    for _, role_list in Config.clearance_tiers():
+        for name in role_list:
+            if name not in configured:
+                configured.append(name)
+    configured_roles = [guild.add_role(name) for name in configured]
+    cosmetic_roles = [guild.add_role(f"Cosmetic {n}") for n in range(40)]
+
+    for n in range(members):
+        roles = [guild.default_role]
+        roles += rng.sample(cosmetic_roles, rng.randint(0, 6))
+        # Most members are civilians or enlisted; a few hold several ranks
+        roles += rng.sample(configured_roles, rng.choice([0, 0, 1, 1, 1, 2, 3]))
+        guild.add_member(f"member{n}", roles=roles)
+    return guild
+
+
+def time_pass(resolve, members, rounds):
+    """Best wall time of ``rounds`` passes over every member"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for member in members:
+            resolve(member)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FROST AI clearance resolution")
+    parser.add_argument('--members', type=int, default=5000, help="synthetic guild size")
+    parser.add_argument('--rounds', type=int, default=5, help="passes per resolver (best is reported)")
+    parser.add_argument('--seed', type=int, default=1114936846)
+    args = parser.parse_args()
+
+    guild = build_guild(args.members, args.seed)
+    members = guild.members
+    cache = ClearanceCache()
+    Config.compile_clearance_lookup()
+
+    resolvers = [
+        ('legacy nested loops', lambda m: legacy_security_level([role.name for role in m.roles])),
+        ('compiled name lookup', lambda m: Config.get_security_level([role.name for role in m.roles])),
+        ('role-id ranks', lambda m: cache.level_for_roles(m.roles)),
+        ('memoized per member', cache.level_for_member),
+    ]
+
+    mismatches = 0
+    for member in members:
+        expected = legacy_security_level([role.name for role in member.roles])
+        mismatches += sum(resolve(member) != expected for _, resolve in resolvers[1:])
+
+    print(f"Members: {len(members)} • Configured roles: {len(Config._clearance_ranks)} • "
+          f"Mismatches vs legacy: {mismatches}")
+
+    baseline = None
+    for name, resolve in resolvers:
+        elapsed = time_pass(resolve, members, args.rounds)
+        baseline = baseline or elapsed
+        print(f"  {name:<22} {elapsed * 1000:8.2f} ms/pass  {elapsed / len(members) * 1e6:6.2f} µs/member  "
+              f"{baseline / elapsed:5.1f}x")
+
+    print(f"Memo stats: {cache.stats}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
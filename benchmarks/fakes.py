@@ -0,0 +1,220 @@
+"""
+Lightweight fake Discord objects for FROST AI benchmarks
+Only the attributes and coroutines the moderation pipeline touches are modeled
+"""
+
+import asyncio
+import itertools
+from datetime import datetime, timezone
+
+from config.settings import Config
+from utils.timer_wheel import TimerWheel
+
+_snowflakes = itertools.count(1_400_000_000_000_000_000)
+
+
+def next_id():
+    """Return a fresh snowflake-like ID"""
+    return next(_snowflakes)
+
+
+class FakeAPI:
+    """Shared counters and simulated latency for fake API calls"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = {}
+
+    async def call(self, name):
+        """Record an API call and wait the simulated latency"""
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeRole:
+    """Minimal discord.Role stand-in"""
+
+    def __init__(self, name, role_id=None, position=0):
+        self.id = role_id or next_id()
+        self.name = name
+        self.position = position
+        self.mention = f"<@&{self.id}>"
+
+    def __repr__(self):
+        return f"<FakeRole {self.name}>"
+
+
+class FakeSentMessage:
+    """A message sent by the bot (warnings, alerts)"""
+
+    def __init__(self, api, channel):
+        self.api = api
+        self.id = next_id()
+        self.channel = channel
+
+    async def delete(self):
+        await self.api.call('message.delete')
+
+    async def edit(self, **kwargs):
+        await self.api.call('message.edit')
+
+
+class FakeChannel:
+    """Minimal discord.TextChannel stand-in"""
+
+    def __init__(self, api, guild, name, channel_id=None):
+        self.api = api
+        self.guild = guild
+        self.id = channel_id or next_id()
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.members = []
+
+    async def send(self, content=None, embed=None, embeds=None, **kwargs):
+        await self.api.call('channel.send')
+        return FakeSentMessage(self.api, self)
+
+    def get_partial_message(self, message_id):
+        return FakeSentMessage(self.api, self)
+
+
+class FakeMember:
+    """Minimal discord.Member stand-in"""
+
+    def __init__(self, api, guild, name, roles=None, bot=False, member_id=None, created_at=None):
+        self.api = api
+        self.guild = guild
+        self.id = member_id or next_id()
+        self.name = name
+        self.display_name = name
+        self.nick = None
+        self.bot = bot
+        self.roles = roles or []
+        self.mention = f"<@{self.id}>"
+        self.created_at = created_at or datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+    def __str__(self):
+        return self.name
+
+    async def send(self, content=None, embed=None, **kwargs):
+        await self.api.call('member.send')
+        return FakeSentMessage(self.api, None)
+
+    async def timeout(self, until, reason=None):
+        await self.api.call('member.timeout')
+
+    async def ban(self, reason=None):
+        await self.api.call('member.ban')
+
+
+class FakeGuild:
+    """Minimal discord.Guild stand-in"""
+
+    def __init__(self, api, guild_id=None, name="Merrywinter Benchmark"):
+        self.api = api
+        self.id = guild_id or Config.AUTHORIZED_GUILD_ID
+        self.name = name
+        self.roles = []
+        self.channels = []
+        self.members = []
+        self._members = {}
+        self.default_role = FakeRole("@everyone", role_id=self.id)
+
+    @property
+    def member_count(self):
+        return len(self.members)
+
+    @property
+    def text_channels(self):
+        return self.channels
+
+    @property
+    def voice_channels(self):
+        return []
+
+    def add_role(self, name):
+        role = FakeRole(name, position=len(self.roles))
+        self.roles.append(role)
+        return role
+
+    def add_channel(self, name):
+        channel = FakeChannel(self.api, self, name)
+        self.channels.append(channel)
+        return channel
+
+    def add_member(self, name, roles=None, bot=False):
+        member = FakeMember(self.api, self, name, roles=roles, bot=bot)
+        self.members.append(member)
+        self._members[member.id] = member
+        return member
+
+    def get_member(self, member_id):
+        return self._members.get(member_id)
+
+    def get_channel(self, channel_id):
+        for channel in self.channels:
+            if channel.id == channel_id:
+                return channel
+        return None
+
+    def get_role(self, role_id):
+        for role in self.roles:
+            if role.id == role_id:
+                return role
+        return None
+
+
+class FakeMessage:
+    """Minimal discord.Message stand-in for incoming user messages"""
+
+    def __init__(self, api, author, channel, content, mentions=None):
+        self.api = api
+        self.id = next_id()
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.mentions = mentions or []
+        self.created_at = datetime.now(timezone.utc)
+
+    async def delete(self):
+        await self.api.call('message.delete')
+
+
+class FakeBot:
+    """Bot stand-in exposing the attributes cogs read from ``self.bot``"""
+
+    def __init__(self, api, guild):
+        self.api = api
+        self.guilds = [guild]
+        self.moderation_log_channel = guild.add_channel("moderation-logs")
+        self.lockdown_mode = False
+        self.timer_wheel = TimerWheel(tick=Config.TIMER_WHEEL_TICK, slots=Config.TIMER_WHEEL_SLOTS,
+                                      max_pending=Config.TIMER_WHEEL_MAX_PENDING)
+
+    def get_guild(self, guild_id):
+        for guild in self.guilds:
+            if guild.id == guild_id:
+                return guild
+        return None
+
+    def get_channel(self, channel_id):
+        for guild in self.guilds:
+            channel = guild.get_channel(channel_id)
+            if channel:
+                return channel
+        return None
+
+    def get_user(self, user_id):
+        for guild in self.guilds:
+            member = guild.get_member(user_id)
+            if member:
+                return member
+        return None
+
+    def dispatch(self, event, *args, **kwargs):
+        pass
+
+    async def log_moderation_action(self, user, action_type, reason, guild):
+        await self.api.call('log_moderation_action')
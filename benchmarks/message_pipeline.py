@@ -0,0 +1,301 @@
+"""
+Message pipeline replay benchmark for FROST AI
+Replays synthetic or recorded messages through the moderation listeners
+
+Usage:
+    python -m benchmarks.message_pipeline                 # simulated raid at 50 msg/s
+    python -m benchmarks.message_pipeline --rate 0        # as fast as possible
+    python -m benchmarks.message_pipeline --corpus messages.jsonl
+
+A recorded corpus is JSON lines with ``author``, ``channel`` and ``content``
+keys and an optional ``offset`` (seconds from start). Each listener runs as its
+own task, like discord.py dispatches events, so handlers that sleep show up in
+latency and pending-task counts rather than stalling the replay.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from benchmarks.fakes import FakeAPI, FakeBot, FakeGuild, FakeMessage
+from cogs.moderation import ModerationSystem
+from cogs.advanced_moderation import AdvancedModeration
+from cogs.smart_notifications import SmartNotifications
+
+CHAT_LINES = [
+    "anyone up for training tonight at {n}",
+    "the convoy escort went well, good job team",
+    "what time is the operation briefing",
+    "I'll be on in {n} minutes",
+    "did anyone see the new deployment orders",
+    "gg everyone, that was a clean extraction",
+    "who is leading sector {n} today",
+    "can someone check my training record",
+    "lol that was hilarious",
+    "recon team report in when ready",
+]
+
+RAID_LINES = [
+    "JOIN OUR SERVER discord.gg/raid{n} FREE NITRO NOW",
+    "get rekt merrywinter, this server is ours now {n}",
+    "free robux giveaway click here quick before it ends {n}",
+]
+
+SPECIAL_LINES = [
+    "check this out https://discord-nitro.com/gift/{n}",
+    "short link https://bit.ly/{n}abc",
+    "urgent: help needed in sector {n}",
+    "WHY IS NOBODY ANSWERING ME IN THIS CHANNEL {n}",
+]
+
+# Sub-detectors timed individually when present on the cogs
+SUB_DETECTORS = {
+    'ModerationSystem': ['check_spam', 'check_content'],
+    'AdvancedModeration': ['scan_message', 'check_phishing_links', 'check_suspicious_patterns',
+                           'enhanced_spam_detection', 'check_near_duplicates'],
+}
+
+
+def synthetic_corpus(count, users, raiders, raid_share, seed):
+    """Generate a corpus with normal chat, a coordinated raid and edge cases"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        roll = rng.random()
+        n = rng.randint(1, 999)
+        if roll < raid_share:
+            author = f"raider_{rng.randrange(raiders)}"
+            content = rng.choice(RAID_LINES).format(n=n)
+            channel = "general"
+        elif roll < raid_share + 0.08:
+            author = f"operator_{rng.randrange(users)}"
+            content = rng.choice(SPECIAL_LINES).format(n=n)
+            channel = rng.choice(["general", "operations"])
+        else:
+            author = f"operator_{rng.randrange(users)}"
+            content = rng.choice(CHAT_LINES).format(n=n)
+            channel = rng.choice(["general", "operations", "training"])
+        corpus.append({'author': author, 'channel': channel, 'content': content})
+    return corpus
+
+
+def load_corpus(path):
+    """Load a recorded JSON lines corpus"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class PipelineBenchmark:
+    """Replay a corpus through the moderation listeners and collect metrics"""
+
+    def __init__(self, api_latency=0.0):
+        self.api = FakeAPI(latency=api_latency)
+        self.guild = FakeGuild(self.api)
+        self.bot = FakeBot(self.api, self.guild)
+        self.operator_role = self.guild.add_role("Field Operative I")
+
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.pending = set()
+        self.peak_pending = 0
+
+        self.cogs = [
+            ModerationSystem(self.bot),
+            AdvancedModeration(self.bot),
+            SmartNotifications(self.bot),
+        ]
+        self.listeners = [(f"{type(cog).__name__}.on_message", cog.on_message) for cog in self.cogs]
+
+        for cog in self.cogs:
+            for method_name in SUB_DETECTORS.get(type(cog).__name__, []):
+                if hasattr(cog, method_name):
+                    setattr(cog, method_name, self._timed(f"  {type(cog).__name__}.{method_name}", getattr(cog, method_name)))
+
+    def _timed(self, name, method):
+        """Wrap a detector coroutine to record its latency"""
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.latencies[name].append(time.perf_counter() - started)
+        return wrapper
+
+    async def _run_listener(self, name, listener, message):
+        """Run one listener, recording latency and errors"""
+        started = time.perf_counter()
+        try:
+            await listener(message)
+        except Exception:
+            self.errors[name] += 1
+        finally:
+            self.latencies[name].append(time.perf_counter() - started)
+
+    def _resolve(self, item, members, channels):
+        """Map corpus names to fake members and channels"""
+        author = members.get(item['author'])
+        if author is None:
+            author = self.guild.add_member(item['author'], roles=[self.operator_role])
+            members[item['author']] = author
+
+        channel = channels.get(item['channel'])
+        if channel is None:
+            channel = self.guild.add_channel(item['channel'])
+            channels[item['channel']] = channel
+
+        return author, channel
+
+    async def replay(self, corpus, rate, drain_timeout):
+        """Replay the corpus and wait for outstanding listener tasks"""
+        loop = asyncio.get_running_loop()
+        members, channels = {}, {}
+        started = loop.time()
+
+        for index, item in enumerate(corpus):
+            if 'offset' in item:
+                target = started + item['offset']
+            elif rate:
+                target = started + index / rate
+            else:
+                target = None
+
+            if target is not None:
+                delay = target - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif index % 50 == 0:
+                await asyncio.sleep(0)
+
+            author, channel = self._resolve(item, members, channels)
+            message = FakeMessage(self.api, author, channel, item['content'])
+
+            for name, listener in self.listeners:
+                task = asyncio.create_task(self._run_listener(name, listener, message))
+                self.pending.add(task)
+                task.add_done_callback(self.pending.discard)
+
+            self.peak_pending = max(self.peak_pending, len(self.pending))
+
+        dispatched = loop.time() - started
+
+        unfinished = 0
+        if self.pending:
+            done, still_pending = await asyncio.wait(set(self.pending), timeout=drain_timeout)
+            unfinished = len(still_pending)
+            for task in still_pending:
+                task.cancel()
+
+        return dispatched, loop.time() - started, unfinished
+
+    def state_sizes(self):
+        """Sizes of in-memory detector state after the run"""
+        sizes = {}
+        for cog in self.cogs:
+            for attr in ('warning_counts', 'escalation_tracking', 'warning_points', 'history'):
+                value = getattr(cog, attr, None)
+                if value is not None:
+                    sizes[f"{type(cog).__name__}.{attr}"] = len(value)
+        return sizes
+
+
+def report(bench, corpus_size, dispatched, total, unfinished, memory):
+    """Print benchmark results"""
+    print(f"Messages replayed:      {corpus_size}")
+    print(f"Dispatch time:          {dispatched:.2f}s ({corpus_size / dispatched if dispatched else 0:.1f} msg/s offered)")
+    print(f"Completion time:        {total:.2f}s ({corpus_size / total if total else 0:.1f} msg/s processed)")
+    print(f"Peak pending tasks:     {bench.peak_pending}")
+    print(f"Unfinished after drain: {unfinished}")
+    if memory:
+        start, end, peak = memory
+        print(f"Traced memory:          {start / 1024:.0f} KiB -> {end / 1024:.0f} KiB "
+              f"(growth {(end - start) / 1024:+.0f} KiB, peak {peak / 1024:.0f} KiB)")
+
+    print()
+    print(f"{'detector':<50} {'calls':>7} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name in sorted(bench.latencies, key=lambda n: (n.strip().split('.')[0], n.startswith(' '), n)):
+        values = sorted(bench.latencies[name])
+        print(f"{name:<50} {len(values):>7} {bench.errors.get(name, 0):>7} "
+              f"{percentile(values, 0.50) * 1000:>9.3f} {percentile(values, 0.99) * 1000:>9.3f} "
+              f"{values[-1] * 1000 if values else 0:>9.3f}")
+
+    print()
+    print("Detector state:")
+    for name, size in bench.state_sizes().items():
+        print(f"  {name:<48} {size}")
+
+    for cog in bench.cogs:
+        scan_pool = getattr(cog, 'scan_pool', None)
+        if scan_pool is not None:
+            print(f"  {type(cog).__name__}.scan_pool ({scan_pool.mode}){'':<18} {scan_pool.stats}")
+
+    print(f"  {'timer_wheel':<48} {bench.bot.timer_wheel.stats()}")
+
+    print()
+    print("Fake API calls:")
+    for name, count in sorted(bench.api.calls.items()):
+        print(f"  {name:<48} {count}")
+
+
+async def run(args):
+    """Build the pipeline, replay the corpus and report"""
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = synthetic_corpus(args.messages, args.users, args.raiders, args.raid_share, args.seed)
+
+    # Cogs persist through Storage into ./data; keep benchmark output out of the repo
+    os.chdir(tempfile.mkdtemp(prefix='frost-bench-'))
+
+    if args.memory:
+        tracemalloc.start()
+
+    bench = PipelineBenchmark(api_latency=args.api_latency / 1000)
+    memory_start = tracemalloc.get_traced_memory()[0] if args.memory else 0
+
+    dispatched, total, unfinished = await bench.replay(corpus, args.rate, args.drain_timeout)
+
+    memory = None
+    if args.memory:
+        end, peak = tracemalloc.get_traced_memory()
+        memory = (memory_start, end, peak)
+        tracemalloc.stop()
+
+    report(bench, len(corpus), dispatched, total, unfinished, memory)
+
+    bench.bot.timer_wheel.stop()
+    for cog in bench.cogs:
+        if hasattr(cog, 'scan_pool'):
+            cog.scan_pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay messages through the FROST AI moderation pipeline")
+    parser.add_argument('--corpus', help="JSON lines corpus to replay instead of synthetic messages")
+    parser.add_argument('--messages', type=int, default=1500, help="synthetic corpus size")
+    parser.add_argument('--users', type=int, default=200, help="synthetic regular users")
+    parser.add_argument('--raiders', type=int, default=40, help="synthetic raid accounts")
+    parser.add_argument('--raid-share', type=float, default=0.3, help="share of messages that are raid spam")
+    parser.add_argument('--rate', type=float, default=50, help="messages per second (0 = as fast as possible)")
+    parser.add_argument('--api-latency', type=float, default=0, help="simulated Discord API latency in ms")
+    parser.add_argument('--drain-timeout', type=float, default=30, help="seconds to wait for outstanding handlers")
+    parser.add_argument('--seed', type=int, default=1114936846)
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="disable tracemalloc")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,11 +8,13 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime
 import os
+import time
 import json
 
 from config.settings import Config
 from utils.helpers import get_user_clearance, create_embed
 from utils.storage import Storage
+from utils.roster import guild_roster
 
 class AdminSystem(commands.Cog):
     """Administrative system for bot management"""
@@ -24,7 +26,7 @@ class AdminSystem(commands.Cog):
     @app_commands.command(name="setup", description="Initial bot setup (Administrator only)")
     async def setup_bot(self, interaction: discord.Interaction):
         """Initial bot setup (Administrator only)"""
-        if not Config.is_admin([role.name for role in interaction.user.roles]):
+        if not Config.is_admin(interaction.user.roles):
             await interaction.response.send_message("❌ You need administrator permissions to run setup.", ephemeral=True)
             return
         
@@ -80,7 +82,7 @@ class AdminSystem(commands.Cog):
     @app_commands.command(name="verify", description="Verify bot setup configuration")
     async def verify_setup(self, interaction: discord.Interaction):
         """Verify bot setup configuration"""
-        if not Config.is_admin([role.name for role in interaction.user.roles]):
+        if not Config.is_admin(interaction.user.roles):
             await interaction.response.send_message("❌ You need administrator permissions to verify setup.", ephemeral=True)
             return
         
@@ -169,7 +171,7 @@ class AdminSystem(commands.Cog):
     @app_commands.command(name="stats", description="Display bot statistics")
     async def statistics(self, interaction: discord.Interaction):
         """Display bot statistics"""
-        if not Config.is_admin([role.name for role in interaction.user.roles]):
+        if not Config.is_admin(interaction.user.roles):
             await interaction.response.send_message("❌ You need administrator permissions to view bot statistics.", ephemeral=True)
             return
         
@@ -181,9 +183,10 @@ class AdminSystem(commands.Cog):
         total_warnings = await self.storage.get_total_warnings()
         
         # Count operators by clearance
-        omega_count = len([m for m in guild.members if get_user_clearance(m.roles) == 'OMEGA'])
-        beta_count = len([m for m in guild.members if get_user_clearance(m.roles) == 'BETA'])
-        alpha_count = len([m for m in guild.members if get_user_clearance(m.roles) == 'ALPHA'])
+        roster = guild_roster(self.bot, guild)
+        omega_count = len(roster.tier('OMEGA'))
+        beta_count = len(roster.tier('BETA'))
+        alpha_count = len(roster.tier('ALPHA'))
         
         embed = discord.Embed(
             title="📊 Merrywinter Security Consulting - Statistics",
@@ -220,7 +223,7 @@ class AdminSystem(commands.Cog):
             name="⚠️ Moderation",
             value=f"**Total Warnings:** {total_warnings}\n"
                   f"**Moderation Actions:** {await self.storage.get_moderation_actions_count()}\n"
-                  f"**Active Mutes:** 0",  # Discord timeouts are automatic
+                  f"**Active Mutes:** {self.bot.punishment_scheduler.pending_count(guild.id) if hasattr(self.bot, 'punishment_scheduler') else 0}",
             inline=True
         )
         
@@ -240,6 +243,51 @@ class AdminSystem(commands.Cog):
             inline=True
         )
         
+        if hasattr(self.bot, 'timer_wheel'):
+            wheel_stats = self.bot.timer_wheel.stats()
+            embed.add_field(
+                name="⏱️ Scheduled Actions",
+                value=f"**Pending:** {wheel_stats['pending']}\n"
+                      f"**Fired:** {wheel_stats['fired']} ({wheel_stats['failed']} failed)\n"
+                      f"**Cancelled/Dropped:** {wheel_stats['cancelled']}/{wheel_stats['dropped']}\n"
+                      f"**Max Lag:** {wheel_stats['max_lag_ms']}ms",
+                inline=True
+            )
+        
+        if hasattr(self.bot, 'audit_sink'):
+            sink_stats = self.bot.audit_sink.stats
+            embed.add_field(
+                name="📋 Audit Log",
+                value=f"**Queue Depth:** {self.bot.audit_sink.queue_depth}\n"
+                      f"**Sent:** {sink_stats['embeds_sent']} embeds in {sink_stats['messages_sent']} messages\n"
+                      f"**Collapsed:** {sink_stats['collapsed']} ({sink_stats['summaries']} summaries)\n"
+                      f"**Dropped/Failed:** {sink_stats['dropped']}/{sink_stats['failed']}",
+                inline=True
+            )
+        
+        if hasattr(self.bot, 'message_snapshots'):
+            usage = self.bot.message_snapshots.usage()
+            embed.add_field(
+                name="🗂️ Message Snapshots",
+                value=f"**Cached:** {usage['entries']} messages\n"
+                      f"**Memory:** {usage['bytes'] // 1024}/{usage['max_bytes'] // 1024} KB\n"
+                      f"**Compression:** {usage['compression_ratio']}x\n"
+                      f"**Delete/Edit Hit Rate:** {usage['hit_rate'] * 100:.0f}%",
+                inline=True
+            )
+        
+        if hasattr(self.bot, 'outbound'):
+            outbound_stats = self.bot.outbound.stats
+            embed.add_field(
+                name="📤 Outbound Queue",
+                value=f"**Waiting:** {self.bot.outbound.queue_depth()}\n"
+                      f"**Spooled Backlog:** {self.bot.delivery_spool.depth if hasattr(self.bot, 'delivery_spool') else 0}\n" + "\n".join(
+                    f"**{priority.title()}:** {data['sent']} sent, {data['dropped']} dropped, max wait {data['max_wait_ms']:.0f}ms"
+                    for priority, data in outbound_stats.items()
+                ),
+                inline=False
+            )
+        
         embed.set_footer(text="Merrywinter Security Consulting - Administrative Statistics")
         
         await interaction.response.send_message(embed=embed)
@@ -247,7 +295,7 @@ class AdminSystem(commands.Cog):
     @app_commands.command(name="backup", description="Create a backup of bot data")
     async def backup_data(self, interaction: discord.Interaction):
         """Create a backup of bot data"""
-        if not Config.is_admin([role.name for role in interaction.user.roles]):
+        if not Config.is_admin(interaction.user.roles):
             await interaction.response.send_message("❌ You need administrator permissions to create backups.", ephemeral=True)
             return
         
@@ -281,7 +329,7 @@ class AdminSystem(commands.Cog):
     @app_commands.describe(mode="Mode to set: on, off, or leave blank to check status")
     async def maintenance_mode(self, interaction: discord.Interaction, mode: str = None):
         """Toggle maintenance mode"""
-        if not Config.is_admin([role.name for role in interaction.user.roles]):
+        if not Config.is_admin(interaction.user.roles):
             await interaction.response.send_message("❌ You need administrator permissions to control maintenance mode.", ephemeral=True)
             return
         
@@ -343,7 +391,7 @@ class AdminSystem(commands.Cog):
     @app_commands.describe(cog_name="Name of the cog to reload (leave blank to reload all)")
     async def reload_cog(self, interaction: discord.Interaction, cog_name: str = None):
         """Reload a specific cog or all cogs"""
-        if not Config.is_admin([role.name for role in interaction.user.roles]):
+        if not Config.is_admin(interaction.user.roles):
             await interaction.response.send_message("❌ You need administrator permissions to reload cogs.", ephemeral=True)
             return
         
@@ -397,10 +445,54 @@ class AdminSystem(commands.Cog):
         
         await interaction.response.send_message(embed=embed)
     
+    @app_commands.command(name="dm-deliverability", description="DM delivery stats per member (Administrator only)")
+    @app_commands.describe(user="Member to inspect (omit for an overview)")
+    async def dm_deliverability(self, interaction: discord.Interaction, user: discord.User = None):
+        """Show who can't receive DMs and why"""
+        if not Config.is_admin(interaction.user.roles):
+            await interaction.response.send_message("❌ You need administrator permissions to view DM deliverability.", ephemeral=True)
+            return
+
+        cache = getattr(self.bot, 'dm_deliverability', None)
+        if cache is None:
+            await interaction.response.send_message("❌ DM deliverability tracking is not available.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title="📨 DM Deliverability", color=Config.COLORS['info'])
+
+        if user:
+            status = cache.users.get(user.id)
+            if status is None:
+                embed.description = f"No DMs have been sent to {user.mention} yet."
+            else:
+                embed.description = f"**Member:** {user.mention}"
+                embed.add_field(name="📊 History",
+                                value=f"**Sent:** {status.sent}\n**Failed:** {status.failed}\n**Skipped:** {status.skipped}",
+                                inline=True)
+                if status.reason:
+                    retry = (f"<t:{int(status.retry_at)}:R>" if status.retry_at > time.time()
+                             else "Next notification")
+                    embed.add_field(name="⚠️ Last Failure",
+                                    value=f"**Reason:** `{status.reason}`\n**When:** <t:{int(status.failed_at)}:R>\n"
+                                          f"**Retry:** {retry}",
+                                    inline=True)
+        else:
+            totals = cache.totals()
+            embed.add_field(name="📊 Totals",
+                            value=f"**Members tracked:** {totals['users']}\n**Sent:** {totals['sent']}\n"
+                                  f"**Failed:** {totals['failed']}\n**Skipped:** {totals['skipped']}",
+                            inline=True)
+            blocked = cache.blocked()
+            lines = [f"<@{user_id}> `{status.reason}` • retry <t:{int(status.retry_at)}:R>" for user_id, status in blocked[:10]]
+            embed.add_field(name=f"🚫 Currently Skipped ({len(blocked)})", value="\n".join(lines) or "None", inline=False)
+
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(name="shutdown", description="Shutdown the bot (Administrator only)")
     async def shutdown_bot(self, interaction: discord.Interaction):
         """Shutdown the bot (Administrator only)"""
-        if not Config.is_admin([role.name for role in interaction.user.roles]):
+        if not Config.is_admin(interaction.user.roles):
             await interaction.response.send_message("❌ You need administrator permissions to shutdown the bot.", ephemeral=True)
             return
         
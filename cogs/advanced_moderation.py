@@ -8,13 +8,18 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
 import asyncio
-import re
-import urllib.parse
+import time
+from collections import deque
 
 from config.settings import Config
 from utils.helpers import get_user_clearance, create_embed
 from utils.storage import Storage
 from utils.logger import logger
+from utils.fingerprint import NearDuplicateIndex, signature_similarity
+from utils.content_scanner import ContentScanPool
+from utils.punishment_scheduler import TIMEOUT_EXPIRY
+from utils.outbound import post
+from utils.dm_deliverability import send_dm
 
 class AdvancedModeration(commands.Cog):
     """Advanced moderation system with escalation and smart detection"""
@@ -24,15 +29,30 @@ class AdvancedModeration(commands.Cog):
         self.storage = Storage()
         self.warning_points = {}
         self.escalation_tracking = {}
-        self.suspicious_patterns = [
-            r'nitro.*free',
-            r'discord.*gift',
-            r'free.*robux',
-            r'hack.*account',
-            r'generator.*discord',
-            r'steam.*free.*game'
-        ]
-    
+        # Regex and fingerprint work on long messages runs in a worker
+        # process; verdicts are applied here on the event loop
+        self.scan_pool = ContentScanPool(
+            mode=Config.CONTENT_SCAN_EXECUTOR,
+            workers=Config.CONTENT_SCAN_WORKERS,
+            max_pending=Config.CONTENT_SCAN_MAX_PENDING,
+            inline_threshold=Config.CONTENT_SCAN_INLINE_CHARS
+        )
+
+        duplicate_config = Config.NEAR_DUPLICATE_DETECTION
+        self.duplicate_index = NearDuplicateIndex(
+            window_seconds=duplicate_config['window_seconds'],
+            similarity_threshold=duplicate_config['similarity_threshold'],
+            bands=duplicate_config['lsh_bands'],
+            max_bucket_size=duplicate_config['max_bucket_size']
+        )
+        self.duplicate_removals = {}
+        self.duplicate_escalations = {}
+        self.duplicate_tracking_pruned = 0.0
+
+    def cog_unload(self):
+        """Stop the content scanning pool"""
+        self.scan_pool.shutdown()
+
     def cog_check(self, ctx):
         """Check if command is used in authorized guild"""
         return Config.check_guild_authorization(ctx.guild.id)
@@ -47,67 +67,57 @@ class AdvancedModeration(commands.Cog):
         if message.author.bot or not Config.check_guild_authorization(message.guild.id):
             return
         
+        verdict = await self.scan_message(message)
+
         # Check for phishing links
-        await self.check_phishing_links(message)
+        await self.check_phishing_links(message, verdict)
         
         # Check for suspicious patterns
-        await self.check_suspicious_patterns(message)
+        await self.check_suspicious_patterns(message, verdict)
         
         # Enhanced spam detection
         await self.enhanced_spam_detection(message)
-    
-    async def check_phishing_links(self, message):
-        """Check for phishing domains and suspicious links"""
-        # Extract URLs from message
-        urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', 
-                         message.content)
-        
-        for url in urls:
-            parsed_url = urllib.parse.urlparse(url)
-            domain = parsed_url.netloc.lower()
-            
-            # Check against known phishing domains
-            if any(phishing_domain in domain for phishing_domain in Config.PHISHING_DOMAINS):
+
+        # Coordinated spam across users
+        await self.check_near_duplicates(message, verdict)
+
+    async def scan_message(self, message):
+        """Run the CPU-bound content checks off the event loop"""
+        duplicate_config = Config.NEAR_DUPLICATE_DETECTION
+        return await self.scan_pool.scan(
+            message.content,
+            num_permutations=duplicate_config['num_permutations'] if duplicate_config['enabled'] else 0,
+            min_length=duplicate_config['min_length']
+        )
+
+    async def check_phishing_links(self, message, verdict):
+        """Act on phishing domains and suspicious links found by the scan"""
+        for kind, url, domain in verdict.links:
+            if kind == 'phishing':
                 await self.handle_phishing_detection(message, url, domain)
                 return
-            
-            # Check for suspicious URL patterns
-            if self.is_suspicious_url(url):
-                await self.handle_suspicious_link(message, url)
-    
-    def is_suspicious_url(self, url):
-        """Check if URL matches suspicious patterns"""
-        suspicious_indicators = [
-            'bit.ly', 'tinyurl.com', 'short.link',  # URL shorteners
-            'discord.com.', 'discordapp.com.',      # Typosquatting
-            'steam.com.', 'steampowered.com.',      # Steam typosquatting
-        ]
-        
-        return any(indicator in url.lower() for indicator in suspicious_indicators)
-    
-    async def check_suspicious_patterns(self, message):
-        """Check for suspicious content patterns"""
-        content = message.content.lower()
-        
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                await self.handle_suspicious_content(message, pattern)
-                break
-    
-    async def enhanced_spam_detection(self, message):
-        """Enhanced spam detection with escalation"""
-        user_id = message.author.id
-        current_time = datetime.utcnow()
-        
-        # Initialize tracking
+            await self.handle_suspicious_link(message, url)
+
+    async def check_suspicious_patterns(self, message, verdict):
+        """Act on suspicious content patterns found by the scan"""
+        if verdict.pattern:
+            await self.handle_suspicious_content(message, verdict.pattern)
+
+    def get_escalation_data(self, user_id):
+        """Get or initialize escalation tracking for a user"""
         if user_id not in self.escalation_tracking:
             self.escalation_tracking[user_id] = {
                 'messages': [],
                 'offenses': 0,
                 'last_offense': None
             }
-        
-        user_data = self.escalation_tracking[user_id]
+        return self.escalation_tracking[user_id]
+
+    async def enhanced_spam_detection(self, message):
+        """Enhanced spam detection with escalation"""
+        current_time = datetime.utcnow()
+
+        user_data = self.get_escalation_data(message.author.id)
         user_data['messages'].append({
             'timestamp': current_time,
             'content': message.content,
@@ -147,8 +157,130 @@ class AdvancedModeration(commands.Cog):
             return True
         
         return False
-    
-    async def escalate_spam_action(self, user, user_data):
+
+    async def check_near_duplicates(self, message, verdict):
+        """Detect near-identical messages posted by several users in a short window
+
+        Coordinated spam is removed and reported to moderators once per
+        cluster. Copies that also match at the stricter ``escalate_similarity``
+        across ``escalate_min_users`` users also put their authors through
+        ``escalate_spam_action``, at most once per user per action window.
+        Helpers and staff are never counted.
+        """
+        duplicate_config = Config.NEAR_DUPLICATE_DETECTION
+        signature = verdict.signature
+        if not duplicate_config['enabled'] or signature is None:
+            return
+        if Config.is_helper(message.author.roles, message.author.id):
+            return
+
+        now = time.monotonic()
+        self.prune_duplicate_tracking(now)
+        cluster = self.duplicate_index.add(
+            message.guild.id,
+            message.author.id,
+            message.channel.id,
+            message.id,
+            signature,
+            now
+        )
+
+        if len({entry.user_id for entry in cluster}) < duplicate_config['min_users']:
+            return
+
+        # The first time a cluster qualifies, moderators are alerted; later
+        # copies joining it are removed without a new alert
+        first_detection = not any(entry.handled for entry in cluster)
+        removals = []
+        for entry in cluster:
+            if entry.handled:
+                continue
+            entry.handled = True
+            if self.allow_duplicate_removal(entry.user_id, now):
+                removals.append(entry)
+
+        await asyncio.gather(*(self.remove_duplicate(message, entry) for entry in removals))
+
+        if first_detection:
+            await self.alert_coordinated_spam(message, cluster, len(removals))
+
+        # Only near-verbatim copies across enough accounts reach the ladder
+        threshold = duplicate_config['escalate_similarity']
+        strict = [entry for entry in cluster if signature_similarity(entry.signature, signature) >= threshold]
+        if len({entry.user_id for entry in strict}) < duplicate_config['escalate_min_users']:
+            return
+
+        pending_users = {entry.user_id for entry in strict if not entry.escalated}
+        for entry in strict:
+            entry.escalated = True
+
+        for user_id in pending_users:
+            member = message.author if user_id == message.author.id else message.guild.get_member(user_id)
+            if member is None or member.bot:
+                continue
+            if now - self.duplicate_escalations.get(user_id, float('-inf')) < duplicate_config['action_window_seconds']:
+                continue
+            self.duplicate_escalations[user_id] = now
+            await self.escalate_spam_action(member, self.get_escalation_data(user_id), reason="Coordinated spam")
+
+    def prune_duplicate_tracking(self, now):
+        """Forget per-user removal and escalation history that has aged out"""
+        window = Config.NEAR_DUPLICATE_DETECTION['action_window_seconds']
+        if now - self.duplicate_tracking_pruned <= window:
+            return
+        self.duplicate_tracking_pruned = now
+        for user_id in [uid for uid, times in self.duplicate_removals.items() if not times or now - times[-1] > window]:
+            del self.duplicate_removals[user_id]
+        for user_id in [uid for uid, last in self.duplicate_escalations.items() if now - last > window]:
+            del self.duplicate_escalations[user_id]
+
+    def allow_duplicate_removal(self, user_id, now):
+        """Cap removals per user per window so one member is never hit repeatedly"""
+        duplicate_config = Config.NEAR_DUPLICATE_DETECTION
+        removals = self.duplicate_removals.setdefault(user_id, deque())
+        while removals and now - removals[0] > duplicate_config['action_window_seconds']:
+            removals.popleft()
+        if len(removals) >= duplicate_config['max_removals_per_user']:
+            return False
+        removals.append(now)
+        return True
+
+    async def remove_duplicate(self, message, entry):
+        """Delete one message of a coordinated spam cluster"""
+        try:
+            if entry.message_id == message.id:
+                await message.delete()
+            else:
+                channel = message.guild.get_channel(entry.channel_id)
+                if channel is not None:
+                    await channel.get_partial_message(entry.message_id).delete()
+        except discord.HTTPException:
+            pass
+
+    async def alert_coordinated_spam(self, message, cluster, removed):
+        """Report a coordinated spam cluster to the moderation channel"""
+        if not (hasattr(self.bot, 'moderation_log_channel') and self.bot.moderation_log_channel):
+            return
+
+        users = list(dict.fromkeys(entry.user_id for entry in cluster))
+        channels = list(dict.fromkeys(entry.channel_id for entry in cluster))
+
+        embed = discord.Embed(
+            title="🧬 COORDINATED SPAM",
+            description=f"**{len(users)} users posted near-identical messages**",
+            color=Config.COLORS['error'],
+            timestamp=datetime.utcnow()
+        )
+
+        embed.add_field(name="👥 Users", value=" ".join(f"<@{user_id}>" for user_id in users[:20]), inline=False)
+        embed.add_field(name="📍 Channels", value=" ".join(f"<#{channel_id}>" for channel_id in channels[:10]), inline=True)
+        embed.add_field(name="🗑️ Removed", value=str(removed), inline=True)
+        embed.add_field(name="📝 Content", value=f"```{message.content[:500]}```", inline=False)
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+
+        post(self.bot, self.bot.moderation_log_channel, 'high', durable=True, embed=embed)
+
+    async def escalate_spam_action(self, user, user_data, reason="Spam"):
         """Escalate spam action based on offense count"""
         user_data['offenses'] += 1
         user_data['last_offense'] = datetime.utcnow()
@@ -167,7 +299,7 @@ class AdvancedModeration(commands.Cog):
         else:
             action = Config.ANTI_SPAM_ESCALATION['fifth_offense']
         
-        await self.execute_escalation_action(user, action, f"Spam offense #{offense_count}")
+        await self.execute_escalation_action(user, action, f"{reason} offense #{offense_count}")
     
     async def execute_escalation_action(self, user, action, reason):
         """Execute the escalation action"""
@@ -210,10 +342,8 @@ class AdvancedModeration(commands.Cog):
         embed.add_field(name="🔍 Reason", value=reason, inline=True)
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
         
-        # Send to user's current channel
-        try:
-            await user.send(embed=embed)
-        except:
+        # DM the user; known-closed DMs go straight to the fallback
+        if await send_dm(self.bot, user, embed=embed) is None:
             # If can't DM, send to a general channel
             for channel in user.guild.channels:
                 if channel.name in ['general', 'main', 'chat']:
@@ -226,6 +356,9 @@ class AdvancedModeration(commands.Cog):
             timeout_until = datetime.utcnow() + timedelta(minutes=minutes)
             await user.timeout(timeout_until, reason=reason)
             
+            if hasattr(self.bot, 'punishment_scheduler'):
+                await self.bot.punishment_scheduler.schedule(user.guild.id, user.id, TIMEOUT_EXPIRY, minutes * 60, reason)
+            
             # Log the action
             if hasattr(self.bot, 'log_moderation_action'):
                 await self.bot.log_moderation_action(user, f"TIMEOUT ({minutes}min)", reason, user.guild)
@@ -275,7 +408,7 @@ class AdvancedModeration(commands.Cog):
             embed.add_field(name="🔗 Full URL", value=f"`{url}`", inline=False)
             embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
             
-            await self.bot.moderation_log_channel.send(embed=embed)
+            post(self.bot, self.bot.moderation_log_channel, 'high', durable=True, embed=embed)
     
     async def handle_suspicious_link(self, message, url):
         """Handle suspicious link detection"""
@@ -293,7 +426,7 @@ class AdvancedModeration(commands.Cog):
             embed.add_field(name="🔗 URL", value=f"`{url}`", inline=False)
             embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
             
-            await self.bot.moderation_log_channel.send(embed=embed)
+            post(self.bot, self.bot.moderation_log_channel, 'medium', durable=True, embed=embed)
     
     async def handle_suspicious_content(self, message, pattern):
         """Handle suspicious content detection"""
@@ -312,7 +445,7 @@ class AdvancedModeration(commands.Cog):
             embed.add_field(name="📝 Content", value=f"```{message.content[:500]}```", inline=False)
             embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
             
-            await self.bot.moderation_log_channel.send(embed=embed)
+            post(self.bot, self.bot.moderation_log_channel, 'medium', durable=True, embed=embed)
     
     @app_commands.command(name="warning-points", description="Check warning points for a user")
     async def check_warning_points(self, interaction: discord.Interaction, user: discord.Member = None):
@@ -355,7 +488,7 @@ class AdvancedModeration(commands.Cog):
     async def clear_warnings(self, interaction: discord.Interaction, user: discord.Member):
         """Clear warning points for a user"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to clear warnings.", ephemeral=True)
             return
         
@@ -98,7 +98,7 @@ class AfterActionReports(commands.Cog):
     ):
         """Create a new After Action Report"""
         # Check permissions - only moderators and above can create AARs
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message(
                 "❌ Access denied. Commander permissions required to create AARs.",
                 ephemeral=True
@@ -219,7 +219,7 @@ class AfterActionReports(commands.Cog):
         can_edit = (
             interaction.user.id == aar['commander_id'] or
             interaction.user.id == aar['created_by'] or
-            Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id)
+            Config.is_moderator(interaction.user.roles, interaction.user.id)
         )
         
         if not can_edit:
@@ -420,7 +420,7 @@ class AfterActionReports(commands.Cog):
         can_finalize = (
             interaction.user.id == aar['commander_id'] or
             interaction.user.id == aar['created_by'] or
-            Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id)
+            Config.is_moderator(interaction.user.roles, interaction.user.id)
         )
         
         if not can_finalize:
@@ -0,0 +1,168 @@
+"""
+Anti-Raid Command Center for FROST AI
+Join-burst detector status, lockdown and unlock controls
+"""
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+from datetime import datetime
+import asyncio
+import time
+
+from config.settings import Config
+from utils.storage import Storage
+from utils.lockdown import LockdownProgress
+
+class AntiRaid(commands.Cog):
+    """Anti-raid detector inspection and response commands"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.storage = Storage()
+
+    def cog_check(self, ctx):
+        """Check if command is used in authorized guild"""
+        return Config.check_guild_authorization(ctx.guild.id)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Check if interaction is in authorized guild"""
+        return Config.check_guild_authorization(interaction.guild.id)
+
+    @app_commands.command(name="raid-status", description="View anti-raid detector state (Moderator+ only)")
+    async def raid_status(self, interaction: discord.Interaction):
+        """Show the live join-burst detector state for this server"""
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
+            await interaction.response.send_message("❌ You don't have permission to view raid status.", ephemeral=True)
+            return
+
+        if not hasattr(self.bot, 'raid_detector'):
+            await interaction.response.send_message("❌ Anti-raid detector is not available.", ephemeral=True)
+            return
+
+        state = self.bot.raid_detector.snapshot(interaction.guild.id, time.monotonic())
+
+        if state['cooling_down'] or getattr(self.bot, 'lockdown_mode', False):
+            color = Config.COLORS['error']
+            threat = "🔴 RAID RESPONSE ACTIVE"
+        elif state['joins'] >= state['join_threshold'] // 2:
+            color = Config.COLORS['warning']
+            threat = "🟡 ELEVATED"
+        else:
+            color = Config.COLORS['success']
+            threat = "🟢 NOMINAL"
+
+        embed = discord.Embed(
+            title="🛡️ Anti-Raid Detector Status",
+            description=f"**Threat Level:** {threat}\n"
+                       f"**Enabled:** {'Yes' if Config.ANTI_RAID_ENABLED else 'No'}\n"
+                       f"**Lockdown Mode:** {'Active' if getattr(self.bot, 'lockdown_mode', False) else 'Inactive'}",
+            color=color,
+            timestamp=datetime.utcnow()
+        )
+
+        embed.add_field(
+            name="📈 Join Rate",
+            value=f"{state['joins']}/{state['join_threshold']} joins in {state['window_seconds']}s",
+            inline=True
+        )
+        embed.add_field(
+            name="🆕 New Accounts",
+            value=f"{state['new_accounts']} ({state['new_account_ratio']:.0%}, trigger ≥ {Config.RAID_NEW_ACCOUNT_RATIO:.0%})",
+            inline=True
+        )
+
+        if state['top_name']:
+            name_key, count = state['top_name']
+            embed.add_field(
+                name="👥 Similar Usernames",
+                value=f"`{name_key}` × {count} (trigger ≥ {Config.RAID_SIMILAR_NAME_THRESHOLD})",
+                inline=True
+            )
+
+        if state['last_triggered_ago'] is not None:
+            embed.add_field(
+                name="🚨 Last Detection",
+                value=f"{int(state['last_triggered_ago'])}s ago • {', '.join(state['last_reasons'])}\n"
+                      f"Total detections: {state['total_triggers']}",
+                inline=False
+            )
+
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    def _progress_embed(self, progress, elapsed):
+        """Build the unlock progress embed"""
+        if progress.finished:
+            title = "🔓 LOCKDOWN LIFTED" if not progress.failed else "⚠️ LOCKDOWN PARTIALLY LIFTED"
+            color = Config.COLORS['success'] if not progress.failed else Config.COLORS['warning']
+        else:
+            title = "🔓 LIFTING LOCKDOWN..."
+            color = Config.COLORS['info']
+
+        embed = discord.Embed(
+            title=title,
+            description=f"**Channels Restored:** {progress.done}/{progress.total}\n"
+                       f"**Failed:** {progress.failed}\n"
+                       f"**Elapsed:** {elapsed:.1f}s",
+            color=color,
+            timestamp=datetime.utcnow()
+        )
+
+        if progress.finished and progress.failed:
+            embed.add_field(
+                name="🔁 Retry",
+                value="The snapshot was kept. Run `/unlock` again to retry the failed channels.",
+                inline=False
+            )
+
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+        return embed
+
+    @app_commands.command(name="unlock", description="Lift an anti-raid lockdown and restore channel permissions (Moderator+ only)")
+    async def unlock(self, interaction: discord.Interaction):
+        """Restore every channel overwrite captured by the last lockdown"""
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
+            await interaction.response.send_message("❌ You don't have permission to lift a lockdown.", ephemeral=True)
+            return
+
+        executor = getattr(self.bot, 'lockdown_executor', None)
+        if executor is None or not await executor.is_locked(interaction.guild.id):
+            await interaction.response.send_message("📋 This server is not under lockdown.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        progress = LockdownProgress()
+        started = time.monotonic()
+        task = asyncio.create_task(
+            executor.unlock(interaction.guild, reason=f"Lockdown lifted by {interaction.user}", progress=progress)
+        )
+
+        status_message = await interaction.followup.send(embed=self._progress_embed(progress, 0), ephemeral=True, wait=True)
+
+        # Report progress every couple of seconds until the restore completes
+        while not task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=2)
+            except asyncio.TimeoutError:
+                await status_message.edit(embed=self._progress_embed(progress, time.monotonic() - started))
+
+        await task
+        await status_message.edit(embed=self._progress_embed(progress, time.monotonic() - started))
+
+        if not await executor.is_locked(interaction.guild.id):
+            self.bot.lockdown_mode = False
+
+        if hasattr(self.bot, 'log_moderation_action'):
+            await self.bot.log_moderation_action(
+                interaction.user,
+                "UNLOCK",
+                f"Lockdown lifted: {progress.done}/{progress.total} channels restored ({progress.failed} failed)",
+                interaction.guild
+            )
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(AntiRaid(bot))
@@ -0,0 +1,99 @@
+"""
+Audit Log Search for FROST AI
+Query the local audit event store by member, channel, event type and time
+"""
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+from typing import List
+import time
+
+from config.settings import Config
+
+PAGE_SIZE = 10
+
+class AuditLog(commands.Cog):
+    """Search over locally stored audit events"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Check if interaction is in authorized guild"""
+        return Config.check_guild_authorization(interaction.guild.id)
+
+    @app_commands.command(name="audit-search", description="Search the audit log (Moderator+ only)")
+    @app_commands.describe(
+        user="Member the events concern",
+        channel="Channel the events happened in",
+        event_type="Event type, e.g. message_delete or role_change",
+        hours="Only events from the last N hours",
+        page="Result page (10 events per page)"
+    )
+    async def audit_search(self, interaction: discord.Interaction, user: discord.User = None,
+                           channel: discord.abc.GuildChannel = None, event_type: str = None,
+                           hours: app_commands.Range[int, 1, 24 * 365] = None, page: app_commands.Range[int, 1] = 1):
+        """Search stored audit events, newest first"""
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
+            await interaction.response.send_message("❌ You don't have permission to search the audit log.", ephemeral=True)
+            return
+
+        if not hasattr(self.bot, 'audit_store'):
+            await interaction.response.send_message("❌ Audit store is not available.", ephemeral=True)
+            return
+
+        started = time.perf_counter()
+        total, events = await self.bot.audit_store.search(
+            user_id=user.id if user else None,
+            channel_id=channel.id if channel else None,
+            event_type=event_type,
+            since=time.time() - hours * 3600 if hours else None,
+            offset=(page - 1) * PAGE_SIZE,
+            limit=PAGE_SIZE
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        filters = [f"**User:** {user.mention}" if user else None,
+                   f"**Channel:** {channel.mention}" if channel else None,
+                   f"**Type:** `{event_type}`" if event_type else None,
+                   f"**Window:** last {hours}h" if hours else None]
+        pages = max(1, -(-total // PAGE_SIZE))
+
+        lines = []
+        for event in events:
+            line = f"<t:{int(event['ts'])}:f> `{event['type']}`"
+            if event.get('user_id') and not user:
+                line += f" <@{event['user_id']}>"
+            if event.get('channel_id') and not channel:
+                line += f" <#{event['channel_id']}>"
+            if event.get('summary'):
+                line += f"\n└ {event['summary'][:200]}"
+            lines.append(line)
+
+        embed = discord.Embed(
+            title="🔎 Audit Log Search",
+            description="\n".join(lines) if lines else "📭 No audit events match these filters.",
+            color=Config.COLORS['info']
+        )
+        embed.add_field(name="🔍 Filters", value=" • ".join(f for f in filters if f) or "All events", inline=False)
+        embed.add_field(name="📊 Matches", value=f"{total}", inline=True)
+
+        embed.set_footer(text=f"Page {page}/{pages} • {elapsed_ms:.1f}ms • F.R.O.S.T AI • {Config.AI_VERSION}")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @audit_search.autocomplete('event_type')
+    async def event_type_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Suggest event types that have been recorded"""
+        if not hasattr(self.bot, 'audit_store'):
+            return []
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in sorted(self.bot.audit_store.event_types)
+            if current.lower() in name
+        ][:25]
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(AuditLog(bot))
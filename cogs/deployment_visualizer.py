@@ -59,8 +59,7 @@ class DeploymentVisualizer(commands.Cog):
         """Create an animated deployment status visualizer"""
         
         # Check permissions
-        user_roles = [role.name for role in interaction.user.roles]
-        if not Config.is_moderator(user_roles, interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You need moderator permissions to create deployment visualizers.", ephemeral=True)
             return
         
@@ -158,8 +157,7 @@ class DeploymentVisualizer(commands.Cog):
     async def stop_visualizer(self, interaction: discord.Interaction, deployment_id: str):
         """Stop an active deployment visualizer"""
         
-        user_roles = [role.name for role in interaction.user.roles]
-        if not Config.is_moderator(user_roles, interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You need moderator permissions to stop visualizers.", ephemeral=True)
             return
         
@@ -46,7 +46,7 @@ class EquipmentManagement(commands.Cog):
     ):
         """Add equipment to inventory"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message(
                 "❌ Access denied. Moderator permissions required.",
                 ephemeral=True
@@ -115,7 +115,7 @@ class EquipmentManagement(commands.Cog):
     ):
         """Check out equipment to an operator"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message(
                 "❌ Access denied. Moderator permissions required.",
                 ephemeral=True
@@ -216,7 +216,7 @@ class EquipmentManagement(commands.Cog):
         can_return = (
             interaction.user.id == equipment['checked_out_to'] or
             interaction.user.id == equipment['checked_out_by'] or
-            Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id)
+            Config.is_moderator(interaction.user.roles, interaction.user.id)
         )
         
         if not can_return:
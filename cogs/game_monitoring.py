@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from config.settings import Config
 from utils.helpers import create_embed
 from utils.storage import Storage
+from utils.outbound import deliver
 
 class GameMonitoring(commands.Cog):
     """Automated game server monitoring and notification system"""
@@ -221,7 +222,7 @@ class GameMonitoring(commands.Cog):
         embed.set_footer(text=f"F.R.O.S.T AI Game Monitor • Priority: {alert['priority'].upper()}")
         
         try:
-            await self.notification_channel.send(embed=embed)
+            await deliver(self.bot, self.notification_channel, alert['priority'], durable=True, embed=embed)
         except Exception as e:
             print(f"Error sending alert: {e}")
     
@@ -252,7 +253,7 @@ class GameMonitoring(commands.Cog):
     ):
         """Configure game server monitoring"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message(
                 "❌ Access denied. Administrator permissions required.",
                 ephemeral=True
@@ -322,7 +323,7 @@ class GameMonitoring(commands.Cog):
     async def force_status_check(self, interaction: discord.Interaction):
         """Force immediate status check"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message(
                 "❌ Access denied. Administrator permissions required.",
                 ephemeral=True
@@ -8,10 +8,14 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime
 import random
+import asyncio
 
 from config.settings import Config
 from utils.helpers import get_user_clearance, create_embed
 from utils.storage import Storage
+from utils.roster import guild_roster
+from utils.dm_fanout import DMFanout
+from utils.logger import logger
 
 class HighCommand(commands.Cog):
     """High Command operations management system"""
@@ -62,7 +66,7 @@ class HighCommand(commands.Cog):
     )
     async def deployment(self, interaction: discord.Interaction, sector: str, units: int, mission_type: str, priority: str, classified: bool = False):
         """Deploy units to operational sectors"""
-        user_clearance = get_user_clearance(interaction.user.roles)
+        user_clearance = get_user_clearance(interaction.user)
         
         # Check if user has Director+ clearance
         if not Config.has_permission(user_clearance, 'DIRECTOR_SECURITY'):
@@ -180,10 +184,12 @@ class HighCommand(commands.Cog):
         
         await self.storage.save_deployment(deployment_data)
         
-        # Send DM notifications to selected roles
-        await self._send_dm_notifications(interaction.guild, deployment_data, 'deployment')
-        
         await interaction.response.send_message(f"✅ Deployment {deployment_id} authorized successfully!", ephemeral=True)
+        
+        # Send DM notifications to selected roles
+        report = await self._send_dm_notifications(interaction.guild, deployment_data, 'deployment')
+        if report:
+            await interaction.followup.send(f"📨 Encrypted transmissions: {report.summary()}", ephemeral=True)
     
     @app_commands.command(name="operation_start", description="Start a new operation (Chief+ only)")
     @app_commands.describe(
@@ -195,7 +201,7 @@ class HighCommand(commands.Cog):
     )
     async def operation_start(self, interaction: discord.Interaction, operation_name: str, objective: str, participants: int, duration: int, classified: bool = False):
         """Start a new operation"""
-        user_clearance = get_user_clearance(interaction.user.roles)
+        user_clearance = get_user_clearance(interaction.user)
         
         # Check if user has Chief+ clearance
         if not Config.has_permission(user_clearance, 'CHIEF_OPERATIONS'):
@@ -288,10 +294,12 @@ class HighCommand(commands.Cog):
         
         await self.storage.save_operation(operation_data)
         
-        # Send DM notifications to selected roles
-        await self._send_dm_notifications(interaction.guild, operation_data, 'operation')
-        
         await interaction.response.send_message(f"✅ Operation {operation_name} ({operation_id}) has been started!", ephemeral=True)
+        
+        # Send DM notifications to selected roles
+        report = await self._send_dm_notifications(interaction.guild, operation_data, 'operation')
+        if report:
+            await interaction.followup.send(f"📨 Encrypted transmissions: {report.summary()}", ephemeral=True)
     
     @app_commands.command(name="operation_log", description="Log operation activities (Director+ only)")
     @app_commands.describe(
@@ -309,7 +317,7 @@ class HighCommand(commands.Cog):
     )
     async def operation_log(self, interaction: discord.Interaction, operation_id: str, activity: str, status: str):
         """Log operation activities"""
-        user_clearance = get_user_clearance(interaction.user.roles)
+        user_clearance = get_user_clearance(interaction.user)
         
         # Check if user has Director+ clearance
         if not Config.has_permission(user_clearance, 'DIRECTOR_SECURITY'):
@@ -376,34 +384,25 @@ class HighCommand(commands.Cog):
         await interaction.response.send_message(f"✅ Activity logged for operation {operation_id}!", ephemeral=True)
     
     async def _send_dm_notifications(self, guild, data, notification_type):
-        """Send encrypted-style DM notifications with decryption animation"""
+        """Send encrypted-style DM notifications with decryption animation; returns a FanoutReport"""
         if notification_type == 'deployment':
             target_roles = Config.DEPLOYMENT_NOTIFICATION_ROLES
         elif notification_type == 'operation':
             target_roles = Config.OPERATION_NOTIFICATION_ROLES
         else:
-            return
+            return None
         
         # Find members with target roles
-        notified_count = 0
-        failed_count = 0
-        
-        for member in guild.members:
-            if member.bot:
-                continue
-                
-            member_role_names = [role.name for role in member.roles]
-            if any(role_name in member_role_names for role_name in target_roles):
-                try:
-                    await self._send_encrypted_message(member, data, notification_type)
-                    notified_count += 1
-                except discord.Forbidden:
-                    failed_count += 1
-                except Exception as e:
-                    failed_count += 1
-                    print(f"Failed to send DM to {member}: {e}")
-        
-        print(f"✅ Sent {notification_type} encrypted DM notifications to {notified_count} commanders ({failed_count} failed - DMs disabled)")
+        roster = guild_roster(self.bot, guild)
+        recipients = roster.resolve(guild, roster.with_role_names(guild, target_roles))
+        
+        # Sent concurrently; the decryption phases are scheduled edits, so no send waits on them
+        fanout = getattr(self.bot, 'dm_fanout', None) or DMFanout(deliverability=getattr(self.bot, 'dm_deliverability', None))
+        report = await fanout.run(recipients, lambda member: self._send_encrypted_message(member, data, notification_type))
+        
+        logger.info(f"Sent {notification_type} encrypted DM notifications to {report.sent} commanders "
+                    f"({report.closed} DMs disabled, {report.failed} failed, {report.skipped} skipped) in {report.elapsed:.1f}s")
+        return report
     
     async def _send_encrypted_message(self, member, data, notification_type):
         """Send animated encrypted message to member"""
@@ -419,7 +418,6 @@ class HighCommand(commands.Cog):
         
         # Send initial message
         message = await member.send(embed=initial_embed)
-        await asyncio.sleep(2)
         
         # Phase 2: Decrypting
         decrypt_embed = discord.Embed(
@@ -430,11 +428,17 @@ class HighCommand(commands.Cog):
         )
         decrypt_embed.set_footer(text="F.R.O.S.T AI • Quantum Decryption Engine")
         
-        await message.edit(embed=decrypt_embed)
-        await asyncio.sleep(3)
-        
-        # Phase 3: Reveal actual content
-        await self._send_decrypted_content(message, data, notification_type)
+        # Later phases are scheduled so the sender never waits on the animation
+        if hasattr(self.bot, 'timer_wheel'):
+            self.bot.timer_wheel.edit_later(message, 2, embed=decrypt_embed)
+            
+            # Phase 3: Reveal actual content; never lost to a full wheel
+            if self.bot.timer_wheel.schedule(5, self._send_decrypted_content, message, data, notification_type,
+                                             name='reveal_transmission') is None:
+                asyncio.get_running_loop().call_later(
+                    5, lambda: asyncio.ensure_future(self._send_decrypted_content(message, data, notification_type)))
+        else:
+            await self._send_decrypted_content(message, data, notification_type)
     
     async def _send_decrypted_content(self, message, data, notification_type):
         """Send the actual decrypted content"""
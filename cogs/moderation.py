@@ -12,6 +12,7 @@ import asyncio
 from config.settings import Config
 from utils.helpers import get_user_clearance, create_embed
 from utils.storage import Storage
+from utils.punishment_scheduler import TIMEOUT_EXPIRY
 
 class ModerationSystem(commands.Cog):
     """Moderation and logging system"""
@@ -85,7 +86,7 @@ class ModerationSystem(commands.Cog):
     
     async def handle_spam(self, message):
         """Handle spam detection"""
-        user_clearance = get_user_clearance(message.author.roles)
+        user_clearance = get_user_clearance(message.author)
         
         # Don't moderate high-clearance users
         if user_clearance in ['OMEGA', 'BETA']:
@@ -108,11 +109,8 @@ class ModerationSystem(commands.Cog):
         warning_msg = await message.channel.send(embed=embed)
         
         # Delete warning after 10 seconds
-        await asyncio.sleep(10)
-        try:
-            await warning_msg.delete()
-        except discord.NotFound:
-            pass
+        if hasattr(self.bot, 'timer_wheel'):
+            self.bot.timer_wheel.delete_later(warning_msg, 10)
         
         # Log the incident
         await self.log_moderation_action(
@@ -124,7 +122,7 @@ class ModerationSystem(commands.Cog):
     
     async def handle_inappropriate_content(self, message, trigger_word):
         """Handle inappropriate content detection"""
-        user_clearance = get_user_clearance(message.author.roles)
+        user_clearance = get_user_clearance(message.author)
         
         # Don't moderate high-clearance users
         if user_clearance in ['OMEGA', 'BETA']:
@@ -147,11 +145,8 @@ class ModerationSystem(commands.Cog):
         warning_msg = await message.channel.send(embed=embed)
         
         # Delete warning after 15 seconds
-        await asyncio.sleep(15)
-        try:
-            await warning_msg.delete()
-        except discord.NotFound:
-            pass
+        if hasattr(self.bot, 'timer_wheel'):
+            self.bot.timer_wheel.delete_later(warning_msg, 15)
         
         # Log the incident
         await self.log_moderation_action(
@@ -201,7 +196,7 @@ class ModerationSystem(commands.Cog):
     async def purge(self, interaction: discord.Interaction, amount: int, user: discord.Member = None, reason: str = "No reason provided"):
         """Purge messages from a channel"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to purge messages.", ephemeral=True)
             return
         
@@ -212,8 +207,8 @@ class ModerationSystem(commands.Cog):
         
         # Check if user can purge messages from the target user
         if user:
-            user_clearance = get_user_clearance(user.roles)
-            issuer_clearance = get_user_clearance(interaction.user.roles)
+            user_clearance = get_user_clearance(user)
+            issuer_clearance = get_user_clearance(interaction.user)
             
             if (Config.has_permission(user_clearance, issuer_clearance) and 
                 not Config.is_community_manager(interaction.user.id)):
@@ -263,13 +258,13 @@ class ModerationSystem(commands.Cog):
     )
     async def warn_user(self, interaction: discord.Interaction, user: discord.Member, reason: str = "No reason provided"):
         """Warn a user (Moderator only)"""
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to warn users.", ephemeral=True)
             return
         
         # Don't warn high-clearance users unless issuer has higher clearance
-        user_clearance = get_user_clearance(user.roles)
-        issuer_clearance = get_user_clearance(interaction.user.roles)
+        user_clearance = get_user_clearance(user)
+        issuer_clearance = get_user_clearance(interaction.user)
         
         if (Config.has_permission(user_clearance, issuer_clearance) and 
             not Config.is_community_manager(interaction.user.id)):
@@ -321,7 +316,7 @@ class ModerationSystem(commands.Cog):
         
         # Check permissions
         if (target_user != ctx.author and 
-            not Config.is_moderator([role.name for role in ctx.author.roles])):
+            not Config.is_moderator(ctx.author.roles)):
             await ctx.send("❌ You can only check your own warnings.")
             return
         
@@ -354,13 +349,13 @@ class ModerationSystem(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     async def mute_user(self, ctx, user: discord.Member, duration: int = 10, *, reason: str = "No reason provided"):
         """Mute a user for specified minutes (Moderator only)"""
-        if not Config.is_moderator([role.name for role in ctx.author.roles]):
+        if not Config.is_moderator(ctx.author.roles):
             await ctx.send("❌ You don't have permission to mute users.")
             return
         
         # Don't mute high-clearance users unless issuer has higher clearance
-        user_clearance = get_user_clearance(user.roles)
-        issuer_clearance = get_user_clearance(ctx.author.roles)
+        user_clearance = get_user_clearance(user)
+        issuer_clearance = get_user_clearance(ctx.author)
         
         if (user_clearance in ['OMEGA', 'BETA'] and 
             not Config.has_permission(issuer_clearance, user_clearance)):
@@ -372,6 +367,9 @@ class ModerationSystem(commands.Cog):
             timeout_until = datetime.utcnow() + timedelta(minutes=duration)
             await user.timeout(timeout_until, reason=reason)
             
+            if hasattr(self.bot, 'punishment_scheduler'):
+                await self.bot.punishment_scheduler.schedule(ctx.guild.id, user.id, TIMEOUT_EXPIRY, duration * 60, reason)
+            
             embed = discord.Embed(
                 title="🔇 User Muted",
                 description=f"**User:** {user.mention}\n"
@@ -400,13 +398,16 @@ class ModerationSystem(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     async def unmute_user(self, ctx, user: discord.Member):
         """Unmute a user (Moderator only)"""
-        if not Config.is_moderator([role.name for role in ctx.author.roles]):
+        if not Config.is_moderator(ctx.author.roles):
             await ctx.send("❌ You don't have permission to unmute users.")
             return
         
         try:
             await user.timeout(None, reason=f"Unmuted by {ctx.author}")
             
+            if hasattr(self.bot, 'punishment_scheduler'):
+                await self.bot.punishment_scheduler.cancel(ctx.guild.id, user.id, TIMEOUT_EXPIRY)
+            
             embed = discord.Embed(
                 title="🔊 User Unmuted",
                 description=f"**User:** {user.mention}\n"
@@ -433,7 +434,7 @@ class ModerationSystem(commands.Cog):
     @commands.has_permissions(manage_guild=True)
     async def moderation_logs(self, ctx, user: discord.Member = None):
         """View moderation logs (Admin only)"""
-        if not Config.is_admin([role.name for role in ctx.author.roles]):
+        if not Config.is_admin(ctx.author.roles):
             await ctx.send("❌ You don't have permission to view moderation logs.")
             return
         
@@ -22,7 +22,7 @@ class PMCOperations(commands.Cog):
     @commands.command(name='mission')
     async def mission_briefing(self, ctx, mission_type: str = None, classified: bool = False):
         """Get mission briefing or create new mission"""
-        user_clearance = get_user_clearance(ctx.author.roles)
+        user_clearance = get_user_clearance(ctx.author)
         
         if user_clearance == 'CIVILIAN':
             await ctx.send("❌ You need military clearance to access mission briefings.")
@@ -205,7 +205,7 @@ class PMCOperations(commands.Cog):
     async def operator_status(self, ctx, user: discord.Member = None):
         """Check operator status and active missions"""
         target_user = user or ctx.author
-        user_clearance = get_user_clearance(target_user.roles)
+        user_clearance = get_user_clearance(target_user)
         
         if user_clearance == 'CIVILIAN':
             await ctx.send("❌ No military status available for civilian personnel.")
@@ -256,7 +256,7 @@ class PMCOperations(commands.Cog):
     @commands.command(name='deploy')
     async def deploy_to_sector(self, ctx, *, sector: str = None):
         """Deploy operator to a specific sector"""
-        user_clearance = get_user_clearance(ctx.author.roles)
+        user_clearance = get_user_clearance(ctx.author)
         
         if user_clearance == 'CIVILIAN':
             await ctx.send("❌ You need military clearance to deploy to operational sectors.")
@@ -343,7 +343,7 @@ class PMCOperations(commands.Cog):
     @commands.command(name='intel')
     async def intelligence_report(self, ctx, report_type: str = None):
         """Access intelligence reports"""
-        user_clearance = get_user_clearance(ctx.author.roles)
+        user_clearance = get_user_clearance(ctx.author)
         
         if user_clearance == 'CIVILIAN':
             await ctx.send("❌ You need military clearance to access intelligence reports.")
@@ -497,7 +497,7 @@ class PMCOperations(commands.Cog):
     @commands.command(name='sitrep')
     async def situation_report(self, ctx):
         """Generate situation report for current operations"""
-        user_clearance = get_user_clearance(ctx.author.roles)
+        user_clearance = get_user_clearance(ctx.author)
         
         if user_clearance == 'CIVILIAN':
             await ctx.send("❌ You need military clearance to access situation reports.")
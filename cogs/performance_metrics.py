@@ -178,7 +178,7 @@ class PerformanceMetrics(commands.Cog):
     async def record_achievement(self, interaction: discord.Interaction, user: discord.Member, achievement: str, description: str):
         """Record an achievement for a user"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to record achievements.", ephemeral=True)
             return
         
@@ -260,6 +260,48 @@ class PerformanceMetrics(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
+    @app_commands.command(name="voice-time", description="View time spent in voice channels")
+    @app_commands.describe(user="Member to check", days="Number of days to show (1-30)")
+    async def view_voice_time(self, interaction: discord.Interaction, user: discord.Member = None,
+                              days: app_commands.Range[int, 1, 30] = 7):
+        """View daily time-in-voice totals for a user"""
+        target_user = user or interaction.user
+        
+        if not hasattr(self.bot, 'voice_tracking'):
+            await interaction.response.send_message("❌ Voice tracking is not available.", ephemeral=True)
+            return
+        
+        # Credit time for sessions still open
+        self.bot.voice_tracking.sweep()
+        daily = self.bot.voice_tracking.member_days(target_user.id, days)
+        channels = self.bot.voice_tracking.member_channels(target_user.id, days)
+        total = sum(seconds for _, seconds in daily)
+        
+        embed = discord.Embed(
+            title=f"🎤 Voice Time - {target_user.display_name}",
+            description=f"**Total (last {days} days):** {timedelta(seconds=int(total))}",
+            color=Config.COLORS['info'],
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(
+            name="📅 Daily",
+            value="\n".join(f"`{day}` {timedelta(seconds=int(seconds))}" for day, seconds in daily if seconds) or "No voice activity",
+            inline=True
+        )
+        
+        if channels:
+            embed.add_field(
+                name="🔊 Channels",
+                value="\n".join(f"<#{channel_id}>: {timedelta(seconds=int(seconds))}"
+                                for channel_id, seconds in channels.most_common(10)),
+                inline=True
+            )
+        
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="record-event", description="Record event attendance (Admin only)")
     @app_commands.describe(
         event_type="Type of event (training, operation, meeting)",
@@ -269,7 +311,7 @@ class PerformanceMetrics(commands.Cog):
     async def record_event(self, interaction: discord.Interaction, event_type: str, event_name: str, participants: str):
         """Record event attendance"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to record events.", ephemeral=True)
             return
         
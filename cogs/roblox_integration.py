@@ -324,7 +324,7 @@ class RobloxIntegration(commands.Cog):
         """View PMC group roster from Roblox"""
         # Check permissions
         user_clearance = get_user_clearance(interaction.user)
-        if user_clearance not in ['OMEGA', 'BETA'] and not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if user_clearance not in ['OMEGA', 'BETA'] and not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message(
                 "❌ Access denied. BETA clearance or higher required.",
                 ephemeral=True
@@ -10,6 +10,7 @@ from datetime import datetime
 from config.settings import Config
 from utils.helpers import get_user_clearance, create_embed
 from utils.storage import Storage
+from utils.roster import guild_roster
 
 class SecurityClearance(commands.Cog):
     """Security clearance management system"""
@@ -23,7 +24,7 @@ class SecurityClearance(commands.Cog):
         """Check security clearance level"""
         target_user = user or ctx.author
         
-        clearance_level = get_user_clearance(target_user.roles)
+        clearance_level = get_user_clearance(target_user)
         chain_info = Config.CHAIN_OF_COMMAND.get(clearance_level, {
             'title': 'Civilian',
             'description': 'No military clearance',
@@ -75,24 +76,13 @@ class SecurityClearance(commands.Cog):
     async def operator_roster(self, ctx):
         """Display operator roster by clearance level"""
         guild = ctx.guild
+        roster = guild_roster(self.bot, guild)
         
         # Organize members by clearance level
-        omega_ops = []
-        beta_ops = []
-        alpha_ops = []
-        
-        for member in guild.members:
-            if member.bot:
-                continue
-            
-            clearance = get_user_clearance(member.roles)
-            
-            if clearance == 'OMEGA':
-                omega_ops.append(member)
-            elif clearance == 'BETA':
-                beta_ops.append(member)
-            elif clearance == 'ALPHA':
-                alpha_ops.append(member)
+        by_name = lambda member: member.display_name.lower()
+        omega_ops = sorted(roster.resolve(guild, roster.tier('OMEGA')), key=by_name)
+        beta_ops = sorted(roster.resolve(guild, roster.tier('BETA')), key=by_name)
+        alpha_ops = sorted(roster.resolve(guild, roster.tier('ALPHA')), key=by_name)
         
         embed = discord.Embed(
             title="🎖️ Merrywinter Security Consulting - Operator Roster",
@@ -142,7 +132,7 @@ class SecurityClearance(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     async def promote_operator(self, ctx, user: discord.Member, level: str):
         """Promote an operator to a higher clearance level (Admin only)"""
-        if not Config.is_admin([role.name for role in ctx.author.roles]):
+        if not Config.is_admin(ctx.author.roles):
             await ctx.send("❌ You don't have permission to promote operators.")
             return
         
@@ -153,7 +143,7 @@ class SecurityClearance(commands.Cog):
             return
         
         # Get current clearance
-        current_clearance = get_user_clearance(user.roles)
+        current_clearance = get_user_clearance(user)
         
         if current_clearance == level:
             await ctx.send(f"❌ {user.mention} already has {level} clearance.")
@@ -209,7 +199,7 @@ class SecurityClearance(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     async def demote_operator(self, ctx, user: discord.Member, level: str):
         """Demote an operator to a lower clearance level (Admin only)"""
-        if not Config.is_admin([role.name for role in ctx.author.roles]):
+        if not Config.is_admin(ctx.author.roles):
             await ctx.send("❌ You don't have permission to demote operators.")
             return
         
@@ -220,7 +210,7 @@ class SecurityClearance(commands.Cog):
             return
         
         # Get current clearance
-        current_clearance = get_user_clearance(user.roles)
+        current_clearance = get_user_clearance(user)
         
         if current_clearance == level:
             await ctx.send(f"❌ {user.mention} already has {level} clearance.")
@@ -281,32 +271,25 @@ class SecurityClearance(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def security_audit(self, ctx):
         """Perform security audit of all operators (Admin only)"""
-        if not Config.is_admin([role.name for role in ctx.author.roles]):
+        if not Config.is_admin(ctx.author.roles):
             await ctx.send("❌ You don't have permission to perform security audits.")
             return
         
         guild = ctx.guild
+        roster = guild_roster(self.bot, guild)
         issues = []
         
-        # Check for role configuration issues
-        for member in guild.members:
-            if member.bot:
-                continue
-            
-            member_roles = [role.name for role in member.roles]
-            
-            # Check for conflicting clearance levels
-            clearance_roles = []
-            for role_name in member_roles:
-                if role_name in Config.OMEGA_ROLES:
-                    clearance_roles.append('OMEGA')
-                elif role_name in Config.BETA_ROLES:
-                    clearance_roles.append('BETA')
-                elif role_name in Config.ALPHA_ROLES:
-                    clearance_roles.append('ALPHA')
-            
-            if len(set(clearance_roles)) > 1:
-                issues.append(f"🔴 {member.display_name} has conflicting clearance levels: {', '.join(set(clearance_roles))}")
+        # Check for conflicting clearance levels: members holding roles from more than one tier
+        holders = {
+            'OMEGA': roster.with_role_names(guild, Config.OMEGA_ROLES),
+            'BETA': roster.with_role_names(guild, Config.BETA_ROLES),
+            'ALPHA': roster.with_role_names(guild, Config.ALPHA_ROLES)
+        }
+        conflicted = (holders['OMEGA'] & holders['BETA']) | (holders['OMEGA'] & holders['ALPHA']) | (holders['BETA'] & holders['ALPHA'])
+        
+        for member in roster.resolve(guild, conflicted):
+            levels = [level for level, member_ids in holders.items() if member.id in member_ids]
+            issues.append(f"🔴 {member.display_name} has conflicting clearance levels: {', '.join(levels)}")
         
         embed = discord.Embed(
             title="🔍 Security Audit Report",
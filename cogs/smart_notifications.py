@@ -4,16 +4,25 @@ Context-aware notification system with priority levels
 """
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 import asyncio
+import time
 from enum import Enum
 
 from config.settings import Config
 from utils.helpers import get_user_clearance, create_embed
 from utils.storage import Storage
+from utils.outbound import deliver, SPOOLED
+from utils.dm_deliverability import send_dm
+from utils.notification_throttle import NotificationThrottle
+from utils.notification_digest import NotificationDigest
+from utils.notification_log import NotificationLog, BROADCAST
+from utils.notification_scheduler import DeliveryScheduler, PreferenceIndex, parse_quiet_hours
+from utils.roster import guild_roster
+from utils.activity_counters import ActivityCounters, ContextMonitor
 
 class NotificationPriority(Enum):
     CRITICAL = "critical"
@@ -21,15 +30,70 @@ class NotificationPriority(Enum):
     MEDIUM = "medium"
     LOW = "low"
 
+PRIORITY_EMOJI = {
+    'critical': '🚨',
+    'high': '⚠️',
+    'medium': '🔵',
+    'low': '🟢'
+}
+
 class SmartNotifications(commands.Cog):
     """Smart notification system with context awareness"""
     
     def __init__(self, bot):
         self.bot = bot
         self.storage = Storage()
-        self.notification_queue = []
         self.user_preferences = {}
         self.notification_history = {}
+        
+        # Automatic alerts (keywords, joins, activity) are rate limited per rule
+        self.throttle = NotificationThrottle(
+            Config.NOTIFICATION_THROTTLE_RULES,
+            self.send_suppression_summary,
+            timer_wheel=getattr(bot, 'timer_wheel', None)
+        )
+        
+        # LOW/MEDIUM notifications are batched per channel or user
+        self.digest = NotificationDigest(
+            self.send_digest,
+            interval=Config.NOTIFICATION_DIGEST_INTERVAL,
+            timer_wheel=getattr(bot, 'timer_wheel', None)
+        )
+        
+        # Recent notifications in memory, the rest in append-only segments
+        self.history = NotificationLog(
+            f"{Config.DATA_DIR}/notifications",
+            segment_entries=Config.NOTIFICATION_LOG_SEGMENT_ENTRIES,
+            retention_days=Config.NOTIFICATION_RETENTION_DAYS,
+            ring_size=Config.NOTIFICATION_HISTORY_SIZE
+        )
+        
+        # Future-dated notifications and DMs held for quiet hours
+        self.scheduler = DeliveryScheduler(self.deliver_scheduled)
+        self.preferences = PreferenceIndex()
+        
+        # Context rules read counters kept up to date by the listeners below
+        self.activity = ActivityCounters()
+        self.context = ContextMonitor(self.activity, Config.CONTEXT_NOTIFICATION_RULES)
+        self.context_monitor.change_interval(seconds=Config.CONTEXT_NOTIFICATION_INTERVAL)
+    
+    async def cog_load(self):
+        """Load preferences and scheduled deliveries, index the notification history"""
+        self.user_preferences = {int(user_id): settings
+                                 for user_id, settings in (await self.storage.load_user_preferences()).items()}
+        self.preferences.load(self.user_preferences)
+        self.scheduler.load_list(await self.storage.load_scheduled_notifications())
+        await self.history.load(legacy_file=f"{Config.DATA_DIR}/notifications.json")
+        if Config.CONTEXT_NOTIFICATION_RULES:
+            self.context_monitor.start()
+    
+    async def cog_unload(self):
+        """Report alerts still held back by the throttle, deliver pending digests, save the schedule"""
+        self.scheduler.stop()
+        self.context_monitor.cancel()
+        await self.throttle.flush()
+        await self.digest.flush()
+        await self.save_schedule()
     
     def cog_check(self, ctx):
         """Check if command is used in authorized guild"""
@@ -39,8 +103,31 @@ class SmartNotifications(commands.Cog):
         """Check if interaction is in authorized guild"""
         return Config.check_guild_authorization(interaction.guild.id)
     
-    async def send_smart_notification(self, title, message, priority, target_users=None, target_roles=None, channel=None):
-        """Send a smart notification with priority handling"""
+    async def send_smart_notification(self, title, message, priority, target_users=None, target_roles=None, channel=None,
+                                      rule=None, key=None, deliver_at=None):
+        """Send a smart notification with priority handling
+        
+        Automatic notifications pass a throttle ``rule`` and ``key`` (channel,
+        member...); they return None without sending while throttled. With
+        ``deliver_at`` (epoch seconds) in the future the notification waits
+        in the delivery scheduler and is sent then.
+        """
+        if rule and not self.throttle.allow(rule, key, title, priority.value):
+            return None
+        
+        if deliver_at and deliver_at > time.time():
+            self.scheduler.schedule(deliver_at, {
+                'kind': 'notification',
+                'title': title,
+                'message': message,
+                'priority': priority.value,
+                'target_users': target_users or [],
+                'target_roles': target_roles or [],
+                'channel_id': channel.id if channel else None
+            })
+            await self.save_schedule()
+            return f"sched_{int(deliver_at)}"
+        
         notification = {
             'id': f"notif_{int(datetime.utcnow().timestamp())}",
             'title': title,
@@ -48,15 +135,62 @@ class SmartNotifications(commands.Cog):
             'priority': priority.value,
             'target_users': target_users or [],
             'target_roles': target_roles or [],
-            'channel': channel,
+            'channel_id': channel.id if channel else None,
             'timestamp': datetime.utcnow().isoformat(),
             'sent': False
         }
         
-        # Get priority configuration
+        priority_config = Config.NOTIFICATION_PRIORITIES[priority.value]
+        embed = self.build_embed(title, message, priority)
+        
+        # Determine where to send
+        if channel:
+            target_channel = channel
+        elif hasattr(self.bot, 'moderation_log_channel') and self.bot.moderation_log_channel:
+            target_channel = self.bot.moderation_log_channel
+        else:
+            target_channel = None
+        
+        # LOW and MEDIUM wait for the next digest; CRITICAL and HIGH go out now
+        batched = self.is_batched(priority)
+        notification['digest'] = batched
+        
+        # Send to channel
+        if target_channel and batched:
+            self.digest.add(('channel', target_channel.id), target_channel, title, message, priority.value)
+        elif target_channel:
+            content = ""
+            if priority_config['ping_roles'] and target_roles:
+                for role_name in target_roles:
+                    role = discord.utils.get(target_channel.guild.roles, name=role_name)
+                    if role:
+                        content += f"{role.mention} "
+            
+            try:
+                sent = await deliver(self.bot, target_channel, priority.value, durable=True, content=content, embed=embed)
+                notification['sent'] = sent is not None and sent is not SPOOLED
+            except Exception as e:
+                print(f"Failed to send notification: {e}")
+        
+        # DM the target users, plus members of the target roles who enabled DMs
+        recipients = set(target_users or [])
+        if target_roles:
+            guild = target_channel.guild if target_channel else self.bot.get_guild(Config.AUTHORIZED_GUILD_ID)
+            if guild:
+                role_members = guild_roster(self.bot, guild).with_role_names(guild, target_roles)
+                recipients |= role_members & self.preferences.subscribers
+        if recipients:
+            notification['dms'] = await self.send_dms(recipients, title, message, priority, embed)
+        
+        # Store notification
+        await self.history.append(notification)
+        
+        return notification['id']
+    
+    def build_embed(self, title, message, priority):
+        """Notification embed with its priority indicator"""
         priority_config = Config.NOTIFICATION_PRIORITIES[priority.value]
         
-        # Create embed
         embed = discord.Embed(
             title=f"🔔 {title}",
             description=message,
@@ -65,16 +199,9 @@ class SmartNotifications(commands.Cog):
         )
         
         # Add priority indicator
-        priority_emoji = {
-            'critical': '🚨',
-            'high': '⚠️',
-            'medium': '🔵',
-            'low': '🟢'
-        }
-        
         embed.add_field(
             name="📊 Priority",
-            value=f"{priority_emoji[priority.value]} {priority.value.upper()}",
+            value=f"{PRIORITY_EMOJI[priority.value]} {priority.value.upper()}",
             inline=True
         )
         
@@ -86,45 +213,110 @@ class SmartNotifications(commands.Cog):
             )
         
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+        return embed
+    
+    @staticmethod
+    def is_batched(priority):
+        return Config.NOTIFICATION_DIGEST_INTERVAL > 0 and priority.value in Config.NOTIFICATION_DIGEST_PRIORITIES
+    
+    async def send_dms(self, user_ids, title, message, priority, embed=None):
+        """DM a set of users in one pass, following each user's preferences
+        
+        Users who filtered out this priority or disabled DMs are skipped,
+        users in their quiet hours are deferred to its end (one scheduled
+        entry per release time), and the rest go to the digest or out
+        through the bot's concurrent DM fan-out.
+        """
+        immediate, deferred, filtered = self.preferences.route(user_ids, priority.value)
+        
+        for release, deferred_ids in deferred.items():
+            self.scheduler.schedule(release.replace(tzinfo=timezone.utc).timestamp(), {
+                'kind': 'dm',
+                'user_ids': deferred_ids,
+                'title': title,
+                'message': message,
+                'priority': priority.value
+            })
+        if deferred:
+            await self.save_schedule()
+        
+        users = [user for user in map(self.bot.get_user, immediate) if user]
+        if self.is_batched(priority):
+            for user in users:
+                self.digest.add(('user', user.id), user, title, message, priority.value)
+        elif users:
+            embed = embed or self.build_embed(title, message, priority)
+            fanout = getattr(self.bot, 'dm_fanout', None)
+            if fanout is not None:
+                # Users with closed DMs are skipped until their retry time
+                await fanout.run(users, lambda user: user.send(embed=embed))
+            else:
+                for user in users:
+                    await send_dm(self.bot, user, embed=embed)
         
-        # Determine where to send
-        if channel:
-            target_channel = channel
-        elif hasattr(self.bot, 'moderation_log_channel') and self.bot.moderation_log_channel:
-            target_channel = self.bot.moderation_log_channel
+        return {
+            'sent': len(users),
+            'deferred': sum(len(deferred_ids) for deferred_ids in deferred.values()),
+            'filtered': filtered
+        }
+    
+    async def deliver_scheduled(self, payload):
+        """Send a notification or quiet-hours DMs whose time has come"""
+        priority = NotificationPriority(payload['priority'])
+        if payload['kind'] == 'dm':
+            await self.send_dms(payload['user_ids'], payload['title'], payload['message'], priority)
         else:
-            target_channel = None
-        
-        # Send to channel
-        if target_channel:
-            content = ""
-            if priority_config['ping_roles'] and target_roles:
-                for role_name in target_roles:
-                    role = discord.utils.get(target_channel.guild.roles, name=role_name)
-                    if role:
-                        content += f"{role.mention} "
-            
-            try:
-                await target_channel.send(content=content, embed=embed)
-                notification['sent'] = True
-            except Exception as e:
-                print(f"Failed to send notification: {e}")
-        
-        # Send DMs to specific users
-        if target_users:
-            for user_id in target_users:
-                try:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        await user.send(embed=embed)
-                except:
-                    pass  # Ignore if can't send DM
+            channel = self.bot.get_channel(payload['channel_id']) if payload.get('channel_id') else None
+            await self.send_smart_notification(payload['title'], payload['message'], priority,
+                                               target_users=payload['target_users'],
+                                               target_roles=payload['target_roles'], channel=channel)
+        await self.save_schedule()
+    
+    async def save_schedule(self):
+        if self.scheduler.dirty:
+            await self.storage.save_scheduled_notifications(self.scheduler.to_list())
+    
+    async def send_digest(self, target, entries, dropped):
+        """Deliver a batch of low-urgency notifications as one embed"""
+        highest = min(entries, key=lambda entry: ['critical', 'high', 'medium', 'low'].index(entry.priority)).priority
+        
+        lines = []
+        length = 0
+        for entry in entries:
+            line = f"{PRIORITY_EMOJI[entry.priority]} **{entry.title}** • <t:{int(entry.created)}:R>\n{entry.message[:200]}"
+            if length + len(line) > 3800:
+                break
+            lines.append(line)
+            length += len(line) + 1
+        hidden = len(entries) - len(lines) + dropped
         
-        # Store notification
-        self.notification_queue.append(notification)
-        await self.storage.save_notifications(self.notification_queue)
+        embed = discord.Embed(
+            title=f"🗂️ Notification Digest ({len(entries) + dropped})",
+            description="\n".join(lines),
+            color=Config.NOTIFICATION_PRIORITIES[highest]['color'],
+            timestamp=datetime.utcnow()
+        )
+        if hidden:
+            embed.add_field(name="➕ More", value=f"{hidden} more notification{'s' if hidden != 1 else ''} not shown", inline=False)
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
         
-        return notification['id']
+        try:
+            if isinstance(target, (discord.User, discord.Member)):
+                await send_dm(self.bot, target, embed=embed)
+            else:
+                await deliver(self.bot, target, highest, durable=True, embed=embed)
+        except Exception as e:
+            print(f"Failed to send notification digest: {e}")
+    
+    async def send_suppression_summary(self, rule, held):
+        """Report alerts the throttle held back as one notification"""
+        elapsed = max(1, int(time.monotonic() - held.since))
+        await self.send_smart_notification(
+            title=f"{held.title} (suppressed)",
+            message=f"{held.count} similar alert{'s' if held.count != 1 else ''} suppressed in the last {elapsed}s "
+                    f"across {len(held.keys)} source{'s' if len(held.keys) != 1 else ''} (rule `{rule}`).",
+            priority=NotificationPriority(held.priority)
+        )
     
     @app_commands.command(name="send-notification", description="Send a notification (Admin only)")
     @app_commands.describe(
@@ -132,12 +324,13 @@ class SmartNotifications(commands.Cog):
         message="Notification message",
         priority="Priority level (critical, high, medium, low)",
         target_roles="Target roles (comma-separated)",
-        target_channel="Target channel"
+        target_channel="Target channel",
+        delay_minutes="Deliver after this many minutes instead of now"
     )
-    async def send_notification(self, interaction: discord.Interaction, title: str, message: str, priority: str, target_roles: str = None, target_channel: discord.TextChannel = None):
+    async def send_notification(self, interaction: discord.Interaction, title: str, message: str, priority: str, target_roles: str = None, target_channel: discord.TextChannel = None, delay_minutes: int = None):
         """Send a notification"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to send notifications.", ephemeral=True)
             return
         
@@ -156,26 +349,38 @@ class SmartNotifications(commands.Cog):
         if target_roles:
             target_roles_list = [role.strip() for role in target_roles.split(',')]
         
+        # Role fan-out can take a while; acknowledge first
+        await interaction.response.defer(ephemeral=True)
+        
         # Send notification
+        deliver_at = time.time() + delay_minutes * 60 if delay_minutes and delay_minutes > 0 else None
         notification_id = await self.send_smart_notification(
             title=title,
             message=message,
             priority=priority_enum,
             target_roles=target_roles_list,
-            channel=target_channel
+            channel=target_channel,
+            deliver_at=deliver_at
         )
         
-        await interaction.response.send_message(
-            f"✅ Notification sent successfully. ID: `{notification_id}`",
-            ephemeral=True
-        )
+        if deliver_at:
+            await interaction.followup.send(
+                f"🕒 Notification scheduled for <t:{int(deliver_at)}:f>. ID: `{notification_id}`",
+                ephemeral=True
+            )
+        else:
+            await interaction.followup.send(
+                f"✅ Notification sent successfully. ID: `{notification_id}`",
+                ephemeral=True
+            )
     
     @app_commands.command(name="notification-settings", description="Configure notification preferences")
     @app_commands.describe(
         priority_filter="Minimum priority level to receive (critical, high, medium, low)",
-        enable_dms="Enable direct message notifications"
+        enable_dms="Enable direct message notifications",
+        quiet_hours="Hold non-critical DMs during these UTC hours, e.g. 22:00-07:00 (or 'off')"
     )
-    async def notification_settings(self, interaction: discord.Interaction, priority_filter: str = None, enable_dms: bool = None):
+    async def notification_settings(self, interaction: discord.Interaction, priority_filter: str = None, enable_dms: bool = None, quiet_hours: str = None):
         """Configure notification preferences"""
         user_id = interaction.user.id
         
@@ -202,7 +407,18 @@ class SmartNotifications(commands.Cog):
         if enable_dms is not None:
             settings['enable_dms'] = enable_dms
         
+        if quiet_hours is not None:
+            try:
+                settings['quiet_hours'] = parse_quiet_hours(quiet_hours)
+            except ValueError:
+                await interaction.response.send_message(
+                    "❌ Invalid quiet hours. Use HH:MM-HH:MM in UTC (e.g. 22:00-07:00) or 'off'",
+                    ephemeral=True
+                )
+                return
+        
         # Save settings
+        self.preferences.update(user_id, settings)
         await self.storage.save_user_preferences(self.user_preferences)
         
         # Show current settings
@@ -217,7 +433,7 @@ class SmartNotifications(commands.Cog):
         embed.add_field(name="📧 Direct Messages", value="Enabled" if settings['enable_dms'] else "Disabled", inline=True)
         
         if settings['quiet_hours']:
-            embed.add_field(name="🌙 Quiet Hours", value=f"{settings['quiet_hours']['start']} - {settings['quiet_hours']['end']}", inline=True)
+            embed.add_field(name="🌙 Quiet Hours", value=f"{settings['quiet_hours']['start']} - {settings['quiet_hours']['end']} UTC", inline=True)
         
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
         
@@ -226,17 +442,21 @@ class SmartNotifications(commands.Cog):
     @app_commands.command(name="notification-history", description="View recent notifications")
     async def notification_history(self, interaction: discord.Interaction):
         """View notification history"""
-        if not self.notification_queue:
+        # The caller's own notifications, their roles' and broadcasts
+        user = interaction.user
+        keys = [f"user:{user.id}", BROADCAST]
+        keys.extend(f"role:{role.name.lower()}" for role in getattr(user, 'roles', []))
+        # Automatic alerts target the generic staff roles
+        if Config.is_moderator(user.roles, user.id):
+            keys.append("role:moderator")
+        if Config.is_admin(user.roles, user.id):
+            keys.append("role:administrator")
+        
+        recent_notifications = await self.history.recent(keys, limit=10)
+        if not recent_notifications:
             await interaction.response.send_message("📋 No notifications in history.", ephemeral=True)
             return
         
-        # Get recent notifications
-        recent_notifications = sorted(
-            self.notification_queue,
-            key=lambda x: x['timestamp'],
-            reverse=True
-        )[:10]
-        
         embed = discord.Embed(
             title="📋 Recent Notifications",
             description="**Notification History**",
@@ -245,19 +465,11 @@ class SmartNotifications(commands.Cog):
         )
         
         for notif in recent_notifications:
-            timestamp = datetime.fromisoformat(notif['timestamp'])
-            priority_emoji = {
-                'critical': '🚨',
-                'high': '⚠️',
-                'medium': '🔵',
-                'low': '🟢'
-            }
-            
             embed.add_field(
-                name=f"{priority_emoji[notif['priority']]} {notif['title']}",
+                name=f"{PRIORITY_EMOJI[notif['priority']]} {notif['title']}",
                 value=f"**Message:** {notif['message'][:100]}{'...' if len(notif['message']) > 100 else ''}\n"
                       f"**Priority:** {notif['priority'].title()}\n"
-                      f"**Time:** <t:{int(timestamp.timestamp())}:R>",
+                      f"**Time:** <t:{int(notif['ts'])}:R>",
                 inline=False
             )
         
@@ -265,29 +477,76 @@ class SmartNotifications(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
-    async def detect_context_notifications(self, guild):
-        """Detect context-based notifications"""
-        current_time = datetime.utcnow()
-        
-        # Check for low activity (no messages in 2 hours)
-        if hasattr(self.bot, 'last_message_time'):
-            if current_time - self.bot.last_message_time > timedelta(hours=2):
+    @tasks.loop(seconds=60)
+    async def context_monitor(self):
+        """Raise context notifications for rules that have just triggered"""
+        guild = self.bot.get_guild(Config.AUTHORIZED_GUILD_ID)
+        key = guild.id if guild else None
+        rules = Config.CONTEXT_NOTIFICATION_RULES
+        
+        for rule, channel_id, value in self.context.evaluate():
+            if rule == 'low_activity':
                 await self.send_smart_notification(
                     title="Low Activity Detected",
-                    message="Server activity has been low for the past 2 hours. Consider checking if everything is operational.",
+                    message=f"Server activity has been low for the past {int(value // 3600)}h {int(value % 3600 // 60)}m. "
+                            f"Consider checking if everything is operational.",
                     priority=NotificationPriority.MEDIUM,
-                    target_roles=["Administrator", "Moderator"]
+                    target_roles=["Administrator", "Moderator"],
+                    rule=rule,
+                    key=key
                 )
-        
-        # Check for high voice channel activity
-        total_voice_members = sum(len(channel.members) for channel in guild.voice_channels)
-        if total_voice_members > 20:  # Threshold for high activity
-            await self.send_smart_notification(
-                title="High Voice Activity",
-                message=f"High voice channel activity detected: {total_voice_members} members in voice channels.",
-                priority=NotificationPriority.LOW,
-                target_roles=["Administrator"]
-            )
+            elif rule == 'high_voice':
+                await self.send_smart_notification(
+                    title="High Voice Activity",
+                    message=f"High voice channel activity detected: {value} members in voice channels.",
+                    priority=NotificationPriority.LOW,
+                    target_roles=["Administrator"],
+                    rule=rule,
+                    key=key
+                )
+            elif rule == 'join_surge':
+                await self.send_smart_notification(
+                    title="Join Surge Detected",
+                    message=f"{value} members joined in the last {rules['join_surge']['minutes']} minutes.",
+                    priority=NotificationPriority.HIGH,
+                    target_roles=["Moderator"],
+                    rule=rule,
+                    key=key
+                )
+            elif rule == 'message_surge':
+                await self.send_smart_notification(
+                    title="Message Surge Detected",
+                    message=f"<#{channel_id}> received {value} messages in the last minute.",
+                    priority=NotificationPriority.MEDIUM,
+                    target_roles=["Moderator"],
+                    rule=rule,
+                    key=channel_id
+                )
+    
+    @context_monitor.before_loop
+    async def before_context_monitor(self):
+        """Wait for the guild cache, then take the starting voice counts"""
+        await self.bot.wait_until_ready()
+        self.seed_voice_counts()
+    
+    def seed_voice_counts(self):
+        guild = self.bot.get_guild(Config.AUTHORIZED_GUILD_ID)
+        if guild:
+            self.activity.seed_voice({channel.id: len(channel.members) for channel in guild.voice_channels})
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Voice events missed while disconnected would leave the counts stale"""
+        if self.activity.voice_seeded:
+            self.seed_voice_counts()
+    
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        """Keep voice occupancy current"""
+        if not Config.check_guild_authorization(member.guild.id):
+            return
+        self.activity.record_voice(before.channel.id if before.channel else None,
+                                   after.channel.id if after.channel else None)
     
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -295,8 +554,8 @@ class SmartNotifications(commands.Cog):
         if message.author.bot or not Config.check_guild_authorization(message.guild.id):
             return
         
-        # Update last message time
-        self.bot.last_message_time = datetime.utcnow()
+        # Count the message for the context rules
+        self.activity.record_message(message.channel.id)
         
         # Check for emergency keywords
         emergency_keywords = ['emergency', 'urgent', 'help needed', 'mayday', 'crisis']
@@ -306,7 +565,9 @@ class SmartNotifications(commands.Cog):
                 title="Emergency Alert",
                 message=f"Emergency keyword detected in message from {message.author.mention} in {message.channel.mention}",
                 priority=NotificationPriority.CRITICAL,
-                target_roles=["Administrator", "Moderator"]
+                target_roles=["Administrator", "Moderator"],
+                rule='emergency_keyword',
+                key=message.channel.id
             )
     
     @commands.Cog.listener()
@@ -315,6 +576,8 @@ class SmartNotifications(commands.Cog):
         if not Config.check_guild_authorization(member.guild.id):
             return
         
+        self.activity.record_join()
+        
         # Check account age
         account_age = datetime.utcnow() - member.created_at
         
@@ -323,7 +586,9 @@ class SmartNotifications(commands.Cog):
                 title="New Account Alert",
                 message=f"New member {member.mention} has a very recent account (created {account_age.days} days ago).",
                 priority=NotificationPriority.HIGH,
-                target_roles=["Moderator"]
+                target_roles=["Moderator"],
+                rule='new_account',
+                key=member.id
             )
         
         # Welcome notification
@@ -331,7 +596,9 @@ class SmartNotifications(commands.Cog):
             title="New Member",
             message=f"Welcome {member.mention} to {member.guild.name}!",
             priority=NotificationPriority.LOW,
-            target_roles=["Moderator"]
+            target_roles=["Moderator"],
+            rule='member_welcome',
+            key=member.id
         )
 
 async def setup(bot):
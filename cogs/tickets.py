@@ -284,8 +284,8 @@ class TicketSystem(commands.Cog):
     async def close_ticket(self, interaction: discord.Interaction, ticket_id: str = None):
         """Close a ticket (Staff only)"""
         # Check if user has permission
-        user_clearance = get_user_clearance(interaction.user.roles)
-        if not (Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id) or 
+        user_clearance = get_user_clearance(interaction.user)
+        if not (Config.is_moderator(interaction.user.roles, interaction.user.id) or 
                 Config.has_permission(user_clearance, 'BETA')):
             await interaction.response.send_message("❌ You don't have permission to close tickets.", ephemeral=True)
             return
@@ -350,8 +350,8 @@ class TicketSystem(commands.Cog):
     async def update_ticket_status(self, interaction: discord.Interaction, ticket_id: str, status: str):
         """Update ticket status (Staff only)"""
         # Check if user has permission
-        user_clearance = get_user_clearance(interaction.user.roles)
-        if not (Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id) or 
+        user_clearance = get_user_clearance(interaction.user)
+        if not (Config.is_moderator(interaction.user.roles, interaction.user.id) or 
                 Config.has_permission(user_clearance, 'BETA')):
             await interaction.response.send_message("❌ You don't have permission to update tickets.", ephemeral=True)
             return
@@ -276,7 +276,7 @@ class TicketSystem(commands.Cog):
                 return
             
             # Check if user has permission to view this ticket
-            user_clearance = get_user_clearance(ctx.author.roles)
+            user_clearance = get_user_clearance(ctx.author)
             if (ticket.get('reporter') != ctx.author.id and 
                 ticket.get('client') != ctx.author.id and
                 not Config.has_permission(user_clearance, 'BETA')):
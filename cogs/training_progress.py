@@ -72,7 +72,7 @@ class TrainingProgress(commands.Cog):
     ):
         """Record training completion"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message(
                 "❌ Access denied. Instructor permissions required.",
                 ephemeral=True
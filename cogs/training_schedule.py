@@ -42,7 +42,7 @@ class TrainingSchedule(commands.Cog):
     async def schedule_training(self, interaction: discord.Interaction, training_type: str, date: str, time: str, instructor: discord.Member, description: str):
         """Schedule a training session"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to schedule training.", ephemeral=True)
             return
         
@@ -145,7 +145,7 @@ class TrainingSchedule(commands.Cog):
             return
         
         # Check requirements
-        user_clearance = get_user_clearance(interaction.user.roles)
+        user_clearance = get_user_clearance(interaction.user)
         if not any(req in [user_clearance] + [role.name for role in interaction.user.roles] for req in training['requirements']):
             await interaction.response.send_message(
                 f"❌ You don't meet the requirements for this training. Required: {', '.join(training['requirements'])}",
@@ -306,7 +306,7 @@ class TrainingSchedule(commands.Cog):
     async def cancel_training(self, interaction: discord.Interaction, training_id: str):
         """Cancel a training session"""
         # Check permissions
-        if not Config.is_moderator([role.name for role in interaction.user.roles], interaction.user.id):
+        if not Config.is_moderator(interaction.user.roles, interaction.user.id):
             await interaction.response.send_message("❌ You don't have permission to cancel training.", ephemeral=True)
             return
         
@@ -2,6 +2,7 @@
 Configuration settings for Merrywinter Security Consulting Bot
 """
 
+import json
 import os
 from typing import Dict, List
 
@@ -115,6 +116,26 @@ class Config:
     MODERATOR_ROLES = DEPARTMENT_DIRECTORS_ROLES[:5]  # First 5 department directors
     HELPER_ROLES = DEPARTMENT_DIRECTORS_ROLES[5:] + COMMAND_ROLES[:10]  # Other directors + command roles
     
+    # Permission bits carried by roles; a member's permissions are the OR over their roles
+    PERM_EXECUTIVE_COMMAND = 1 << 0
+    PERM_BOARD_OF_DIRECTORS = 1 << 1
+    PERM_DEPARTMENT_DIRECTOR = 1 << 2
+    PERM_COMMAND = 1 << 3
+    PERM_ENLISTED = 1 << 4
+    PERMISSION_FLAGS = {
+        'EXECUTIVE_COMMAND': PERM_EXECUTIVE_COMMAND,
+        'BOARD_OF_DIRECTORS': PERM_BOARD_OF_DIRECTORS,
+        'DEPARTMENT_DIRECTOR': PERM_DEPARTMENT_DIRECTOR,
+        'COMMAND': PERM_COMMAND,
+        'ENLISTED': PERM_ENLISTED
+    }
+    ADMIN_MASK = PERM_EXECUTIVE_COMMAND | PERM_BOARD_OF_DIRECTORS
+    MODERATOR_MASK = ADMIN_MASK | PERM_DEPARTMENT_DIRECTOR
+    HELPER_MASK = MODERATOR_MASK | PERM_COMMAND
+    
+    # Role ID -> permissions/clearance registry written by guild_roles_update.py
+    ROLE_REGISTRY_FILE = os.getenv('ROLE_REGISTRY_FILE', 'config/role_registry.json')
+    
     # Channel Configuration
     TICKET_CATEGORY = "TICKET SYSTEM"
     LOG_CHANNEL = "bot-logs"
@@ -152,6 +173,28 @@ class Config:
         'fifth_offense': 'ban'
     }
     
+    # Cross-user near-duplicate detection (coordinated spam raids)
+    NEAR_DUPLICATE_DETECTION = {
+        'enabled': True,
+        'window_seconds': 30,       # Rolling window of fingerprints per guild
+        'min_users': 3,             # Distinct users posting near-identical content
+        'similarity_threshold': 0.7,  # Estimated Jaccard similarity of shingles
+        'num_permutations': 32,     # MinHash signature length
+        'lsh_bands': 16,            # Must divide num_permutations
+        'max_bucket_size': 64,
+        'min_length': 30,           # Ignore short messages and common phrases
+        'max_removals_per_user': 5,  # Messages removed per user per action window
+        'action_window_seconds': 300,
+        'escalate_similarity': 0.9,  # Stricter match before the spam ladder applies
+        'escalate_min_users': 4
+    }
+
+    # Content scanning pool (regex/fingerprint work off the event loop)
+    CONTENT_SCAN_EXECUTOR = os.getenv('CONTENT_SCAN_EXECUTOR', 'process')  # process, thread or inline
+    CONTENT_SCAN_WORKERS = int(os.getenv('CONTENT_SCAN_WORKERS', '2'))
+    CONTENT_SCAN_MAX_PENDING = int(os.getenv('CONTENT_SCAN_MAX_PENDING', '64'))  # Scan inline beyond this backlog
+    CONTENT_SCAN_INLINE_CHARS = int(os.getenv('CONTENT_SCAN_INLINE_CHARS', '500'))  # Shorter messages are scanned inline
+
     WARNING_POINT_SYSTEM = {
         'spam': 2,
         'inappropriate_content': 3,
@@ -189,6 +232,33 @@ class Config:
         'low': {'color': 0x00ff00, 'ping_roles': False, 'urgent': False}
     }
     
+    # Automatic notification throttling: cooldown per key (channel/member), burst per rule per window (seconds)
+    NOTIFICATION_THROTTLE_RULES = {
+        'emergency_keyword': {'cooldown': int(os.getenv('EMERGENCY_ALERT_COOLDOWN', '120')), 'burst': 5, 'window': 60},
+        'new_account': {'cooldown': 3600, 'burst': 5, 'window': 60},
+        'member_welcome': {'cooldown': 3600, 'burst': 10, 'window': 60},
+        'low_activity': {'cooldown': 7200, 'burst': 1, 'window': 7200},
+        'high_voice': {'cooldown': 3600, 'burst': 1, 'window': 3600},
+        'join_surge': {'cooldown': 900, 'burst': 1, 'window': 900},
+        'message_surge': {'cooldown': 900, 'burst': 5, 'window': 300}
+    }
+    
+    # Context notifications: rules evaluated against live activity counters (remove a rule to disable it)
+    CONTEXT_NOTIFICATION_INTERVAL = int(os.getenv('CONTEXT_NOTIFICATION_INTERVAL', '60'))  # Seconds between evaluations
+    CONTEXT_NOTIFICATION_RULES = {
+        'low_activity': {'idle_minutes': int(os.getenv('LOW_ACTIVITY_MINUTES', '120'))},  # No messages for this long
+        'high_voice': {'members': int(os.getenv('HIGH_VOICE_MEMBERS', '20'))},  # More members than this in voice
+        'join_surge': {'joins': int(os.getenv('JOIN_SURGE_COUNT', '10')), 'minutes': 5},  # Joins within the window
+        'message_surge': {'per_minute': int(os.getenv('MESSAGE_SURGE_PER_MINUTE', '60'))}  # Messages in one channel per minute
+    }
+    
+    # Notification digests: these priorities are batched per channel/user (0 disables)
+    NOTIFICATION_DIGEST_INTERVAL = int(os.getenv('NOTIFICATION_DIGEST_INTERVAL', '900'))  # Seconds
+    NOTIFICATION_DIGEST_PRIORITIES = ['low', 'medium']
+    NOTIFICATION_HISTORY_SIZE = int(os.getenv('NOTIFICATION_HISTORY_SIZE', '500'))  # Recent notifications kept in memory
+    NOTIFICATION_LOG_SEGMENT_ENTRIES = int(os.getenv('NOTIFICATION_LOG_SEGMENT_ENTRIES', '5000'))  # Notifications per segment file
+    NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '30'))  # 0 keeps everything
+    
     # Roblox Integration Settings
     ROBLOX_GAME_ID = None  # To be configured
     ROBLOX_UNIVERSE_ID = None  # To be configured
@@ -226,13 +296,6 @@ class Config:
         """Check if guild is authorized to use the bot"""
         return guild_id == Config.AUTHORIZED_GUILD_ID
     
-    @staticmethod
-    def is_moderator(user_roles, user_id):
-        """Check if user has moderator permissions"""
-        return (any(role in Config.MODERATOR_ROLES for role in user_roles) or
-                any(role in Config.ADMIN_ROLES for role in user_roles) or
-                user_id in Config.COMMUNITY_MANAGERS)
-    
 
     
     # High Command Operations Channels
@@ -245,6 +308,77 @@ class Config:
     RAID_DETECTION_THRESHOLD = int(os.getenv('RAID_DETECTION_THRESHOLD', '10'))  # Users joining in timeframe
     RAID_DETECTION_TIMEFRAME = int(os.getenv('RAID_DETECTION_TIMEFRAME', '30'))  # Seconds
     RAID_ACTION = os.getenv('RAID_ACTION', 'lockdown')  # lockdown, kick, ban
+    RAID_NEW_ACCOUNT_AGE_DAYS = int(os.getenv('RAID_NEW_ACCOUNT_AGE_DAYS', '7'))  # Accounts younger than this are "new"
+    RAID_NEW_ACCOUNT_RATIO = float(os.getenv('RAID_NEW_ACCOUNT_RATIO', '0.6'))  # Share of new accounts in window
+    RAID_NEW_ACCOUNT_MIN_JOINS = int(os.getenv('RAID_NEW_ACCOUNT_MIN_JOINS', '5'))  # Minimum joins before ratio applies
+    RAID_SIMILAR_NAME_THRESHOLD = int(os.getenv('RAID_SIMILAR_NAME_THRESHOLD', '4'))  # Joins sharing a username skeleton
+    RAID_COOLDOWN = int(os.getenv('RAID_COOLDOWN', '300'))  # Seconds before the same guild can re-trigger
+    LOCKDOWN_CONCURRENCY = int(os.getenv('LOCKDOWN_CONCURRENCY', '5'))  # Parallel channel overwrite requests
+
+    # Deferred actions (warning cleanup, embed edits, restriction lifts)
+    TIMER_WHEEL_TICK = float(os.getenv('TIMER_WHEEL_TICK', '0.25'))  # Seconds per slot
+    TIMER_WHEEL_SLOTS = int(os.getenv('TIMER_WHEEL_SLOTS', '256'))
+    TIMER_WHEEL_MAX_PENDING = int(os.getenv('TIMER_WHEEL_MAX_PENDING', '5000'))  # Drop new actions beyond this
+
+    # Persistent punishment expirations (timeouts)
+    PUNISHMENT_BATCH_SIZE = int(os.getenv('PUNISHMENT_BATCH_SIZE', '25'))  # Expirations fired per batch
+    PUNISHMENT_MAX_ATTEMPTS = int(os.getenv('PUNISHMENT_MAX_ATTEMPTS', '5'))
+
+    # Audit log batching
+    AUDIT_BATCH_WINDOW = float(os.getenv('AUDIT_BATCH_WINDOW', '2'))  # Seconds to buffer before sending
+    AUDIT_FLOOD_THRESHOLD = int(os.getenv('AUDIT_FLOOD_THRESHOLD', '20'))  # Events per flood window before summarizing
+    AUDIT_FLOOD_WINDOW = float(os.getenv('AUDIT_FLOOD_WINDOW', '30'))
+    AUDIT_MAX_QUEUE = int(os.getenv('AUDIT_MAX_QUEUE', '500'))
+
+    # Outbound message pacing (Discord allows ~5 messages per 5s per channel)
+    OUTBOUND_CHANNEL_BURST = int(os.getenv('OUTBOUND_CHANNEL_BURST', '5'))
+    OUTBOUND_CHANNEL_RATE = float(os.getenv('OUTBOUND_CHANNEL_RATE', '1.0'))  # Messages per second per channel
+    OUTBOUND_GLOBAL_RATE = float(os.getenv('OUTBOUND_GLOBAL_RATE', '45'))  # Requests per second bot-wide
+    OUTBOUND_MAX_QUEUE = int(os.getenv('OUTBOUND_MAX_QUEUE', '200'))  # Per channel; least urgent dropped beyond this
+    DM_FANOUT_CONCURRENCY = int(os.getenv('DM_FANOUT_CONCURRENCY', '5'))  # DMs in flight at once during notifications
+    DM_CLOSED_RETRY_HOURS = float(os.getenv('DM_CLOSED_RETRY_HOURS', '24'))  # Skip closed DMs this long, doubling per failure
+    DM_ERROR_RETRY_MINUTES = float(os.getenv('DM_ERROR_RETRY_MINUTES', '10'))  # Skip after other DM errors
+    DM_RETRY_MAX_DAYS = float(os.getenv('DM_RETRY_MAX_DAYS', '7'))
+
+    # On-disk spool for log and alert messages that failed to send
+    SPOOL_SEGMENT_RECORDS = int(os.getenv('SPOOL_SEGMENT_RECORDS', '500'))  # Records per segment file
+    SPOOL_MAX_RECORDS = int(os.getenv('SPOOL_MAX_RECORDS', '10000'))
+    SPOOL_MAX_BACKOFF = int(os.getenv('SPOOL_MAX_BACKOFF', '300'))  # Seconds between retries at most
+
+    # Local searchable audit event store (/audit-search)
+    AUDIT_STORE_SEGMENT_EVENTS = int(os.getenv('AUDIT_STORE_SEGMENT_EVENTS', '100000'))  # Events per segment file
+    AUDIT_STORE_RETENTION_DAYS = int(os.getenv('AUDIT_STORE_RETENTION_DAYS', '90'))  # 0 keeps everything
+    AUDIT_STORE_FLUSH_INTERVAL = float(os.getenv('AUDIT_STORE_FLUSH_INTERVAL', '1.0'))  # Seconds between disk writes
+
+    # Reaction/voice activity is summarized instead of logged per event
+    ACTIVITY_SUMMARY_INTERVAL = int(os.getenv('ACTIVITY_SUMMARY_INTERVAL', '15'))  # Minutes between summaries
+    ACTIVITY_MAX_TRACKED_MESSAGES = int(os.getenv('ACTIVITY_MAX_TRACKED_MESSAGES', '2000'))  # Reacted messages tallied per period
+    ACTIVITY_FLAG_MIN_POINTS = int(os.getenv('ACTIVITY_FLAG_MIN_POINTS', '1'))  # Warning points that enable per-event logs
+    ACTIVITY_WATCHLIST = [int(user_id) for user_id in os.getenv('ACTIVITY_WATCHLIST', '').split(',') if user_id.strip()]
+
+    # Voice sessions and automatic attendance
+    VOICE_RECONNECT_GRACE = int(os.getenv('VOICE_RECONNECT_GRACE', '60'))  # Seconds a rejoin continues the same session
+    VOICE_TOTALS_RETENTION_DAYS = int(os.getenv('VOICE_TOTALS_RETENTION_DAYS', '30'))
+    VOICE_ATTENDANCE_MIN_MINUTES = int(os.getenv('VOICE_ATTENDANCE_MIN_MINUTES', '10'))  # Minutes in channel per day to count as attended
+    VOICE_ATTENDANCE_CHANNELS = {  # channel_id:event_type pairs, e.g. "123:training,456:operation"
+        int(pair.split(':')[0]): pair.split(':')[1].strip()
+        for pair in os.getenv('VOICE_ATTENDANCE_CHANNELS', '').split(',') if ':' in pair
+    }
+    VOICE_ATTENDANCE_KEYWORDS = {  # Fallback: voice channel name keywords per event type
+        'training': ['training', 'drill', 'course'],
+        'operation': ['operation', 'deployment', 'mission'],
+        'meeting': ['briefing', 'meeting']
+    }
+
+    # Message snapshots for delete/edit auditing (replaces most of discord.py's message cache)
+    DISCORD_MESSAGE_CACHE_SIZE = int(os.getenv('DISCORD_MESSAGE_CACHE_SIZE', '100'))  # Full Message objects kept by the library
+    MESSAGE_SNAPSHOT_MAX_BYTES = int(os.getenv('MESSAGE_SNAPSHOT_MAX_BYTES', str(8 * 1024 * 1024)))
+    MESSAGE_SNAPSHOT_MAX_CONTENT = int(os.getenv('MESSAGE_SNAPSHOT_MAX_CONTENT', '1000'))  # Characters kept per message
+    MESSAGE_SNAPSHOT_COMPRESS = os.getenv('MESSAGE_SNAPSHOT_COMPRESS', 'true').lower() == 'true'
+
+    # Member update debouncing (bulk role edits, promotions)
+    MEMBER_UPDATE_DEBOUNCE = float(os.getenv('MEMBER_UPDATE_DEBOUNCE', '2.0'))  # Quiet seconds before a burst is settled
+    MEMBER_UPDATE_MAX_DELAY = float(os.getenv('MEMBER_UPDATE_MAX_DELAY', '10.0'))  # Settle at most this long after the first update
     
     # Ticket Configuration
     TICKET_TYPES = {
@@ -337,12 +471,9 @@ class Config:
     MISSIONS_FILE = f'{DATA_DIR}/missions.json'
     
     @classmethod
-    def get_security_level(cls, roles: List[str]) -> str:
-        """Get security clearance level based on roles"""
-        role_names = [role.lower() for role in roles]
-        
-        # Check all clearance levels from highest to lowest
-        clearance_checks = [
+    def clearance_tiers(cls) -> List[tuple]:
+        """Clearance levels and the roles granting them, highest first"""
+        return [
             ('EXECUTIVE_COMMAND', cls.EXECUTIVE_COMMAND_ROLES),
             ('BOARD_OF_DIRECTORS', cls.BOARD_OF_DIRECTORS_ROLES),
             ('DEPARTMENT_DIRECTORS', cls.DEPARTMENT_DIRECTORS_ROLES),
@@ -354,13 +485,45 @@ class Config:
             ('ENLISTED', cls.ENLISTED_ROLES),
             ('CIVILIAN', cls.CLIENT_ROLES + cls.VERIFICATION_ROLES)
         ]
-        
-        for level, role_list in clearance_checks:
+    
+    # Lowercased role name -> clearance rank, built on first use
+    _clearance_ranks: Dict[str, int] = None
+    _clearance_names: Dict[int, str] = None
+    
+    @classmethod
+    def compile_clearance_lookup(cls):
+        """Build the role name -> clearance rank table (call again if role lists change)"""
+        ranks = {}
+        for level, role_list in cls.clearance_tiers():
             for role in role_list:
-                if role and role.lower() in role_names:
-                    return level
-        
-        return 'CIVILIAN'
+                # A role listed under several tiers grants the highest one
+                if role:
+                    ranks.setdefault(role.lower(), cls.SECURITY_LEVELS[level])
+        cls._clearance_ranks = ranks
+        cls._clearance_names = {rank: level for level, rank in cls.SECURITY_LEVELS.items()}
+    
+    @classmethod
+    def get_role_rank(cls, role_name: str) -> int:
+        """Clearance rank granted by a single role (0 if none)"""
+        if cls._clearance_ranks is None:
+            cls.compile_clearance_lookup()
+        return cls._clearance_ranks.get(role_name.lower(), 0)
+    
+    @classmethod
+    def get_level_name(cls, rank: int) -> str:
+        """Clearance level for a rank; anything below the lowest tier is CIVILIAN"""
+        if cls._clearance_names is None:
+            cls.compile_clearance_lookup()
+        return cls._clearance_names.get(rank, 'CIVILIAN')
+    
+    @classmethod
+    def get_security_level(cls, roles: List[str]) -> str:
+        """Get security clearance level based on roles"""
+        if cls._clearance_ranks is None:
+            cls.compile_clearance_lookup()
+        ranks = cls._clearance_ranks
+        best = max((ranks.get(role.lower(), 0) for role in roles), default=0)
+        return cls._clearance_names.get(best, 'CIVILIAN')
     
     @classmethod
     def has_permission(cls, user_level: str, required_level: str) -> bool:
@@ -376,61 +539,121 @@ class Config:
         return user_id in cls.COMMUNITY_MANAGERS
     
     @classmethod
-    def is_executive_command(cls, roles: List[str]) -> bool:
+    def permission_role_lists(cls) -> List[tuple]:
+        """Permission flags and the role names granting them"""
+        return [
+            ('EXECUTIVE_COMMAND', cls.EXECUTIVE_COMMAND_ROLES),
+            ('BOARD_OF_DIRECTORS', cls.BOARD_OF_DIRECTORS_ROLES),
+            ('DEPARTMENT_DIRECTOR', cls.DEPARTMENT_DIRECTORS_ROLES),
+            ('COMMAND', cls.COMMAND_ROLES),
+            ('ENLISTED', cls.ENLISTED_ROLES)
+        ]
+    
+    # Registered role ID -> permission bits / clearance rank, and lowercased name -> bits
+    _role_permissions: Dict[int, int] = None
+    _role_clearance: Dict[int, int] = None
+    _name_permissions: Dict[str, int] = None
+    
+    @classmethod
+    def load_role_registry(cls, path: str = None) -> int:
+        """Load the role ID registry (falls back to role names when it is missing); returns roles registered"""
+        names = {}
+        for flag, role_list in cls.permission_role_lists():
+            for role in role_list:
+                if role:
+                    names[role.lower()] = names.get(role.lower(), 0) | cls.PERMISSION_FLAGS[flag]
+        cls._name_permissions = names
+        
+        permissions, clearance = {}, {}
+        try:
+            with open(path or cls.ROLE_REGISTRY_FILE, 'r', encoding='utf-8') as f:
+                registry = json.load(f)
+        except FileNotFoundError:
+            registry = {}
+        for role_id, entry in registry.get('roles', {}).items():
+            mask = 0
+            for flag in entry.get('permissions', []):
+                mask |= cls.PERMISSION_FLAGS.get(flag, 0)
+            permissions[int(role_id)] = mask
+            if entry.get('clearance') in cls.SECURITY_LEVELS:
+                clearance[int(role_id)] = cls.SECURITY_LEVELS[entry['clearance']]
+        cls._role_permissions = permissions
+        cls._role_clearance = clearance
+        return len(permissions)
+    
+    @classmethod
+    def role_permissions(cls, role) -> int:
+        """Permission bits for a discord.Role (by ID) or a role name"""
+        if cls._name_permissions is None:
+            cls.load_role_registry()
+        if isinstance(role, str):
+            return cls._name_permissions.get(role.lower(), 0)
+        mask = cls._role_permissions.get(role.id)
+        if mask is None:
+            # Role created after the registry was generated
+            return cls._name_permissions.get(role.name.lower(), 0)
+        return mask
+    
+    @classmethod
+    def registered_clearance(cls, role_id: int):
+        """Clearance rank recorded for a role ID, or None if unregistered"""
+        if cls._role_clearance is None:
+            cls.load_role_registry()
+        return cls._role_clearance.get(role_id)
+    
+    @classmethod
+    def permission_mask(cls, roles) -> int:
+        """OR of the permission bits of every role"""
+        mask = 0
+        for role in roles:
+            mask |= cls.role_permissions(role)
+        return mask
+    
+    @classmethod
+    def is_executive_command(cls, roles) -> bool:
         """Check if user has Executive Command clearance"""
-        role_names = [role.lower() for role in roles]
-        return any(role.lower() in role_names for role in cls.EXECUTIVE_COMMAND_ROLES if role)
+        return bool(cls.permission_mask(roles) & cls.PERM_EXECUTIVE_COMMAND)
     
     @classmethod
-    def is_board_of_directors(cls, roles: List[str]) -> bool:
+    def is_board_of_directors(cls, roles) -> bool:
         """Check if user has Board of Directors clearance"""
-        role_names = [role.lower() for role in roles]
-        return any(role.lower() in role_names for role in cls.BOARD_OF_DIRECTORS_ROLES if role)
+        return bool(cls.permission_mask(roles) & cls.PERM_BOARD_OF_DIRECTORS)
     
     @classmethod
-    def is_department_director(cls, roles: List[str]) -> bool:
+    def is_department_director(cls, roles) -> bool:
         """Check if user has Department Director clearance"""
-        role_names = [role.lower() for role in roles]
-        return any(role.lower() in role_names for role in cls.DEPARTMENT_DIRECTORS_ROLES if role)
+        return bool(cls.permission_mask(roles) & cls.PERM_DEPARTMENT_DIRECTOR)
     
     @classmethod
-    def is_enlisted(cls, roles: List[str]) -> bool:
+    def is_enlisted(cls, roles) -> bool:
         """Check if user has Enlisted clearance"""
-        role_names = [role.lower() for role in roles]
-        return any(role.lower() in role_names for role in cls.ENLISTED_ROLES if role)
+        return bool(cls.permission_mask(roles) & cls.PERM_ENLISTED)
     
     @classmethod
-    def is_admin(cls, roles: List[str], user_id: int = None) -> bool:
+    def is_admin(cls, roles, user_id: int = None) -> bool:
         """Check if user has admin permissions"""
         # Community managers are always admins
         if user_id and cls.is_community_manager(user_id):
             return True
         
         # Executive Command and Board of Directors have admin permissions
-        return cls.is_executive_command(roles) or cls.is_board_of_directors(roles)
+        return bool(cls.permission_mask(roles) & cls.ADMIN_MASK)
     
     @classmethod
-    def is_moderator(cls, roles: List[str], user_id: int = None) -> bool:
+    def is_moderator(cls, roles, user_id: int = None) -> bool:
         """Check if user has moderator permissions"""
-        # Community managers and admins have moderator permissions
+        # Community managers, admins and Department Directors
         if user_id and cls.is_community_manager(user_id):
             return True
-        if cls.is_admin(roles, user_id):
-            return True
-        
-        # Department Directors have moderator permissions
-        return cls.is_department_director(roles)
+        return bool(cls.permission_mask(roles) & cls.MODERATOR_MASK)
     
     @classmethod
-    def is_helper(cls, roles: List[str], user_id: int = None) -> bool:
+    def is_helper(cls, roles, user_id: int = None) -> bool:
         """Check if user has helper permissions"""
-        # Higher roles have helper permissions
-        if cls.is_moderator(roles, user_id):
+        # Moderators and above plus command roles
+        if user_id and cls.is_community_manager(user_id):
             return True
-        
-        # Command roles have helper permissions
-        role_names = [role.lower() for role in roles]
-        return any(role.lower() in role_names for role in cls.COMMAND_ROLES if role)
+        return bool(cls.permission_mask(roles) & cls.HELPER_MASK)
     
     @classmethod
     def check_guild_authorization(cls, guild_id: int) -> bool:
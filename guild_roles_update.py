@@ -1,12 +1,22 @@
 """
 Script to get ALL roles and channels from the guild and update settings.py
+
+Also writes the role ID registry (Config.ROLE_REGISTRY_FILE) used for
+permission and clearance checks. Roles are matched to the Config role lists
+by name; a role that no longer matches any configured name (renamed since the
+last run) keeps the permissions it was registered with, so renaming a role
+does not change what it grants. Delete its entry to revoke them.
 """
 
 import discord
 import asyncio
+import json
 import os
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
+from config.settings import Config
+
 load_dotenv()
 
 class GuildRolesBot(discord.Client):
@@ -125,8 +135,53 @@ class GuildRolesBot(discord.Client):
         print(f"BETA_ROLES = {senior_field_roles}")
         print(f"ALPHA_ROLES = {field_operative_roles + trainee_roles}")
         
+        path = write_role_registry(guild)
+        print(f'\n=== ROLE REGISTRY ===\nWrote {path}')
+        
         await self.close()
 
+def build_role_registry(guild, previous=None):
+    """Map every guild role ID to its permission flags and clearance level"""
+    previous = (previous or {}).get('roles', {})
+    roles = {}
+    
+    for role in guild.roles:
+        if role.is_default():
+            continue
+        
+        permissions = [flag for flag, role_list in Config.permission_role_lists()
+                       if role.name.lower() in (name.lower() for name in role_list)]
+        rank = Config.get_role_rank(role.name)
+        clearance = Config.get_level_name(rank) if rank else None
+        
+        old = previous.get(str(role.id))
+        if old and not permissions and not clearance:
+            # Renamed away from a configured name: keep what it was registered with
+            permissions, clearance = old.get('permissions', []), old.get('clearance')
+        
+        if permissions or clearance:
+            roles[str(role.id)] = {'name': role.name, 'permissions': permissions, 'clearance': clearance}
+    
+    return {
+        'guild_id': guild.id,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'roles': roles
+    }
+
+def write_role_registry(guild, path=None):
+    """Regenerate the role registry file, keeping entries for renamed roles"""
+    path = path or Config.ROLE_REGISTRY_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except FileNotFoundError:
+        previous = None
+    
+    registry = build_role_registry(guild, previous)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(registry, f, indent=2)
+    return path
+
 async def main():
     bot = GuildRolesBot()
     token = os.getenv('DISCORD_TOKEN')
@@ -4,6 +4,7 @@ A comprehensive Discord bot for Roblox PMC operations management
 """
 
 import os
+import time
 import asyncio
 import logging
 from datetime import datetime, timedelta
@@ -14,6 +15,22 @@ from dotenv import load_dotenv
 from config.settings import Config
 from utils.logger import setup_logger
 from utils.storage import Storage
+from utils.raid_detection import JoinBurstDetector
+from utils.lockdown import LockdownExecutor
+from utils.timer_wheel import TimerWheel
+from utils.punishment_scheduler import PunishmentScheduler
+from utils.audit_sink import AuditSink
+from utils.outbound import OutboundScheduler, post
+from utils.dm_fanout import DMFanout
+from utils.dm_deliverability import DeliverabilityCache
+from utils.spool import DeliverySpool
+from utils.audit_store import AuditEventStore
+from utils.activity_aggregator import ActivityAggregator
+from utils.voice_sessions import VoiceSessionTracker
+from utils.message_snapshots import MessageSnapshotCache
+from utils.member_updates import MemberUpdateDebouncer
+from utils.clearance import clearance_cache
+from utils.roster import RosterIndex
 
 # Load environment variables
 load_dotenv()
@@ -34,7 +51,8 @@ class MerrywinterBot(commands.Bot):
             command_prefix=Config.COMMAND_PREFIX,
             intents=intents,
             help_command=None,
-            description=f"{Config.AI_FULL_NAME} - Advanced AI Command System"
+            description=f"{Config.AI_FULL_NAME} - Advanced AI Command System",
+            max_messages=Config.DISCORD_MESSAGE_CACHE_SIZE
         )
 
         self.config = Config()
@@ -42,18 +60,106 @@ class MerrywinterBot(commands.Bot):
         self.start_time = datetime.utcnow()
 
         # Anti-raid system
-        self.recent_joins = []
+        self.raid_detector = JoinBurstDetector(
+            window_seconds=Config.RAID_DETECTION_TIMEFRAME,
+            join_threshold=Config.RAID_DETECTION_THRESHOLD,
+            new_account_age_days=Config.RAID_NEW_ACCOUNT_AGE_DAYS,
+            new_account_ratio=Config.RAID_NEW_ACCOUNT_RATIO,
+            new_account_min_joins=Config.RAID_NEW_ACCOUNT_MIN_JOINS,
+            similar_name_threshold=Config.RAID_SIMILAR_NAME_THRESHOLD,
+            cooldown_seconds=Config.RAID_COOLDOWN
+        )
+        self.lockdown_executor = LockdownExecutor(self.storage, concurrency=Config.LOCKDOWN_CONCURRENCY)
         self.lockdown_mode = False
 
+        # Deferred actions scheduled by cogs instead of sleeping in handlers
+        self.timer_wheel = TimerWheel(
+            tick=Config.TIMER_WHEEL_TICK,
+            slots=Config.TIMER_WHEEL_SLOTS,
+            max_pending=Config.TIMER_WHEEL_MAX_PENDING
+        )
+
+        # Timeout and mute expirations that must survive restarts
+        self.punishment_scheduler = PunishmentScheduler(
+            self.storage,
+            batch_size=Config.PUNISHMENT_BATCH_SIZE,
+            max_attempts=Config.PUNISHMENT_MAX_ATTEMPTS
+        )
+
         # AI System status
         self.ai_status_index = 0
         self.uptime_start = datetime.utcnow()
 
         # Enhanced logging
         self.moderation_log_channel = None
+        self.delivery_spool = DeliverySpool(
+            directory=f"{Config.DATA_DIR}/spool",
+            segment_records=Config.SPOOL_SEGMENT_RECORDS,
+            max_records=Config.SPOOL_MAX_RECORDS,
+            max_backoff=Config.SPOOL_MAX_BACKOFF
+        )
+        self.outbound = OutboundScheduler(
+            channel_burst=Config.OUTBOUND_CHANNEL_BURST,
+            channel_rate=Config.OUTBOUND_CHANNEL_RATE,
+            global_rate=Config.OUTBOUND_GLOBAL_RATE,
+            max_queue=Config.OUTBOUND_MAX_QUEUE,
+            spool=self.delivery_spool
+        )
+        # Notification DMs share the outbound scheduler's bot-wide budget and skip closed DMs
+        self.dm_deliverability = DeliverabilityCache(
+            closed_ttl=Config.DM_CLOSED_RETRY_HOURS * 3600,
+            error_ttl=Config.DM_ERROR_RETRY_MINUTES * 60,
+            max_ttl=Config.DM_RETRY_MAX_DAYS * 86400
+        )
+        self.dm_fanout = DMFanout(concurrency=Config.DM_FANOUT_CONCURRENCY, bucket=self.outbound.global_bucket,
+                                  deliverability=self.dm_deliverability)
+        self.audit_sink = AuditSink(
+            lambda: self.moderation_log_channel,
+            window=Config.AUDIT_BATCH_WINDOW,
+            flood_threshold=Config.AUDIT_FLOOD_THRESHOLD,
+            flood_window=Config.AUDIT_FLOOD_WINDOW,
+            max_queue=Config.AUDIT_MAX_QUEUE,
+            outbound=self.outbound
+        )
+        self.audit_store = AuditEventStore(
+            directory=f"{Config.DATA_DIR}/audit",
+            segment_events=Config.AUDIT_STORE_SEGMENT_EVENTS,
+            retention_days=Config.AUDIT_STORE_RETENTION_DAYS,
+            flush_interval=Config.AUDIT_STORE_FLUSH_INTERVAL
+        )
+
+        # Voice sessions feed daily totals, activity summaries and attendance
+        self.voice_tracking = VoiceSessionTracker(
+            reconnect_grace=Config.VOICE_RECONNECT_GRACE,
+            retention_days=Config.VOICE_TOTALS_RETENTION_DAYS,
+            attendance_channels=Config.VOICE_ATTENDANCE_CHANNELS,
+            attendance_keywords=Config.VOICE_ATTENDANCE_KEYWORDS,
+            attendance_min_seconds=Config.VOICE_ATTENDANCE_MIN_MINUTES * 60
+        )
+
+        # Bursts of role/nickname updates are merged into one net change per member
+        self.member_updates = MemberUpdateDebouncer(
+            self.timer_wheel,
+            self.settle_member_update,
+            window=Config.MEMBER_UPDATE_DEBOUNCE,
+            max_delay=Config.MEMBER_UPDATE_MAX_DELAY
+        )
+
+        # Compact copies of recent messages so raw delete/edit events can be audited
+        self.message_snapshots = MessageSnapshotCache(
+            max_bytes=Config.MESSAGE_SNAPSHOT_MAX_BYTES,
+            max_content=Config.MESSAGE_SNAPSHOT_MAX_CONTENT,
+            compress=Config.MESSAGE_SNAPSHOT_COMPRESS
+        )
+        self.add_listener(self.snapshot_message, 'on_message')
+
+        # Members by clearance tier and role, kept current from member events
+        self.roster = RosterIndex()
+
+        # Reaction and voice events are aggregated; flagged members keep per-event logs
+        self.activity = ActivityAggregator(self.voice_tracking, max_messages=Config.ACTIVITY_MAX_TRACKED_MESSAGES)
 
         # Advanced tracking systems
-        self.voice_tracking = {}
         self.reaction_tracking = {}
         self.nickname_history = {}
         self.role_change_history = {}
@@ -62,7 +168,6 @@ class MerrywinterBot(commands.Bot):
         self.command_usage_stats = {}
         self.performance_metrics = {}
         self.training_schedules = {}
-        self.notification_queue = []
         self.mass_action_tracking = {}
         self.bot_stats = {}
         self.storage = Storage()
@@ -92,7 +197,9 @@ class MerrywinterBot(commands.Bot):
                 'cogs.equipment_management',
                 'cogs.training_progress',
                 'cogs.after_action_reports',
-                'cogs.deployment_visualizer'
+                'cogs.deployment_visualizer',
+                'cogs.anti_raid',
+                'cogs.audit_log'
             ]
 
             for cog in cogs:
@@ -102,6 +209,24 @@ class MerrywinterBot(commands.Bot):
                 except Exception as e:
                     logger.error(f"Failed to load cog {cog}: {e}")
 
+            # Fires once the bot is ready and the journal has been replayed
+            self.punishment_scheduler.start(self)
+
+            # Redeliver audit logs and alerts that failed before a restart
+            self.delivery_spool.start(self.get_channel, self.outbound.send)
+
+            # Index the local audit log for /audit-search
+            await self.audit_store.load()
+
+            # Restore daily time-in-voice totals
+            self.voice_tracking.load_dict(await self.storage.load_voice_totals())
+            self.dm_deliverability.load_dict(await self.storage.load_dm_deliverability())
+
+            # Permission checks resolve roles by ID through the registry
+            if not Config.load_role_registry():
+                logger.warning(f"No role registry at {Config.ROLE_REGISTRY_FILE}; permissions fall back to role names "
+                               f"(run guild_roles_update.py to generate it)")
+
             # Sync slash commands globally (avoid duplicate syncing)
             try:
                 global_synced = await self.tree.sync()
@@ -113,6 +238,8 @@ class MerrywinterBot(commands.Bot):
             # Start background tasks
             self.status_update.start()
             self.health_check.start()
+            self.activity_summary.start()
+            self.voice_sweep.start()
 
             # Start keepalive for 24/7 uptime
             if Config.ENABLE_KEEPALIVE:
@@ -136,6 +263,17 @@ class MerrywinterBot(commands.Bot):
         logger.info(f"Established: {Config.COMPANY_ESTABLISHED}")
         logger.info("=" * 60)
 
+        # Members already in voice get a session from now on
+        for guild in self.guilds:
+            if Config.check_guild_authorization(guild.id):
+                self.roster.rebuild(guild)
+                logger.info(f"👥 Roster indexed: {len(self.roster)} members")
+
+                for channel in guild.voice_channels + guild.stage_channels:
+                    for member in channel.members:
+                        if not member.bot:
+                            self.voice_tracking.seed(member.id, channel)
+
         # Get moderation log channel
         try:
             self.moderation_log_channel = self.get_channel(Config.MODERATION_LOG_CHANNEL_ID)
@@ -176,59 +314,53 @@ class MerrywinterBot(commands.Bot):
         if not Config.check_guild_authorization(member.guild.id):
             return
 
+        self.roster.add(member)
+
         # Log member join
         await self.log_member_action(member, "JOIN", f"New member joined the server")
 
         if Config.ANTI_RAID_ENABLED:
-            current_time = datetime.utcnow()
-
-            # Add to recent joins
-            self.recent_joins.append({
-                'user_id': member.id,
-                'timestamp': current_time,
-                'guild_id': member.guild.id
-            })
-
-            # Clean old entries
-            cutoff_time = current_time - timedelta(seconds=Config.RAID_DETECTION_TIMEFRAME)
-            self.recent_joins = [
-                join for join in self.recent_joins 
-                if join['timestamp'] > cutoff_time and join['guild_id'] == member.guild.id
-            ]
+            account_age = (discord.utils.utcnow() - member.created_at).total_seconds()
+
+            # Record join in the per-guild window and check for raid signals
+            reasons = self.raid_detector.record_join(
+                member.guild.id,
+                member.id,
+                member.name,
+                account_age,
+                time.monotonic()
+            )
 
-            # Check for raid
-            if len(self.recent_joins) >= Config.RAID_DETECTION_THRESHOLD:
-                await self.handle_raid_detection(member.guild)
+            if reasons:
+                await self.handle_raid_detection(member.guild, reasons)
 
-    async def handle_raid_detection(self, guild):
+    async def handle_raid_detection(self, guild, reasons=None):
         """Handle raid detection"""
-        logger.warning(f"Raid detected in guild {guild.name} ({guild.id})")
+        reasons = reasons or ['join_rate']
+        logger.warning(f"Raid detected in guild {guild.name} ({guild.id}): {', '.join(reasons)}")
 
         if Config.RAID_ACTION == 'lockdown':
             self.lockdown_mode = True
-            # Lock down the server
-            for channel in guild.channels:
-                if isinstance(channel, discord.TextChannel):
-                    try:
-                        await channel.set_permissions(
-                            guild.default_role,
-                            send_messages=False,
-                            reason="Anti-raid lockdown"
-                        )
-                    except discord.Forbidden:
-                        pass
+            # Lock down the server; prior overwrites are snapshotted for /unlock
+            await self.lockdown_executor.lock(guild, guild.default_role, reason="Anti-raid lockdown")
 
         # Log to admin channel
         log_channel = discord.utils.get(guild.channels, name=Config.LOG_CHANNEL)
         if log_channel:
+            reason_names = {
+                'join_rate': 'Join rate',
+                'new_accounts': 'New account surge',
+                'similar_names': 'Similar usernames'
+            }
             embed = discord.Embed(
                 title="🚨 RAID DETECTED",
                 description=f"**Action Taken:** {Config.RAID_ACTION.title()}\n"
                            f"**Detection Time:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC\n"
+                           f"**Signals:** {', '.join(reason_names.get(r, r) for r in reasons)}\n"
                            f"**Threshold:** {Config.RAID_DETECTION_THRESHOLD} users in {Config.RAID_DETECTION_TIMEFRAME} seconds",
                 color=0xFF0000
             )
-            await log_channel.send(embed=embed)
+            post(self, log_channel, 'critical', durable=True, embed=embed)
 
     async def on_guild_join(self, guild):
         """Event triggered when bot joins a guild"""
@@ -281,30 +413,57 @@ class MerrywinterBot(commands.Bot):
         if not Config.check_guild_authorization(member.guild.id):
             return
 
+        clearance_cache.invalidate(member.id)
+        self.roster.remove(member.id)
+
         # Log member leave
         await self.log_member_action(member, "LEAVE", f"Member left the server")
 
-    async def on_message_delete(self, message):
-        """Handle message deletions"""
-        if not Config.check_guild_authorization(message.guild.id):
+    async def snapshot_message(self, message):
+        """Keep a compact copy of each message for delete/edit auditing"""
+        if message.guild is None or not Config.check_guild_authorization(message.guild.id):
             return
 
-        if message.author.bot:
+        self.message_snapshots.put(message)
+
+    async def on_raw_message_delete(self, payload):
+        """Handle message deletions, cached or not"""
+        if not Config.check_guild_authorization(payload.guild_id):
+            return
+
+        snapshot = self.message_snapshots.pop(payload.message_id)
+        if snapshot is None and payload.cached_message is not None:
+            snapshot = self.message_snapshots.snapshot(payload.cached_message)
+
+        # Snapshot is None when the message predates the cache; only the ids are known
+        if snapshot is not None and snapshot.bot:
             return
 
         # Log message deletion
-        await self.log_message_action(message, "DELETE", f"Message deleted")
+        await self.log_message_action(payload.message_id, payload.channel_id, snapshot, "DELETE", "Message deleted")
+
+    async def on_raw_message_edit(self, payload):
+        """Handle message edits, cached or not"""
+        if not Config.check_guild_authorization(payload.guild_id):
+            return
 
-    async def on_message_edit(self, before, after):
-        """Handle message edits"""
-        if not Config.check_guild_authorization(before.guild.id):
+        content = payload.data.get('content')
+        if content is None:
+            # Embed/unfurl updates carry no content
             return
 
-        if before.author.bot or before.content == after.content:
+        before = self.message_snapshots.replace_content(payload.message_id, content)
+        if before is None:
+            if payload.cached_message is None:
+                return
+            before = self.message_snapshots.put(payload.cached_message)
+            self.message_snapshots.replace_content(payload.message_id, content)
+
+        if before.bot or before.content == content[:self.message_snapshots.max_content]:
             return
 
         # Log message edit
-        await self.log_message_edit(before, after)
+        await self.log_message_edit(before, content)
 
     async def on_member_ban(self, guild, user):
         """Handle member bans"""
@@ -322,7 +481,14 @@ class MerrywinterBot(commands.Bot):
 
     async def on_voice_state_update(self, member, before, after):
         """Handle voice channel state changes"""
-        if not Config.check_guild_authorization(member.guild.id):
+        if not Config.check_guild_authorization(member.guild.id) or member.bot:
+            return
+
+        self.voice_tracking.update(member.id, before.channel, after.channel)
+        await self.process_voice_events()
+
+        # Per-event voice logs only for flagged members
+        if not self.is_flagged_member(member.id):
             return
 
         # Voice channel join
@@ -340,31 +506,114 @@ class MerrywinterBot(commands.Bot):
         if not Config.check_guild_authorization(payload.guild_id):
             return
 
-        guild = self.get_guild(payload.guild_id)
-        if guild:
-            await self.log_reaction_activity(payload, "ADD", guild)
+        await self.track_reaction(payload, "ADD")
 
     async def on_raw_reaction_remove(self, payload):
         """Handle reaction removals"""
         if not Config.check_guild_authorization(payload.guild_id):
             return
 
+        await self.track_reaction(payload, "REMOVE")
+
+    async def track_reaction(self, payload, action_type):
+        """Count a reaction; log it individually only for flagged members"""
         guild = self.get_guild(payload.guild_id)
-        if guild:
-            await self.log_reaction_activity(payload, "REMOVE", guild)
+        if not guild:
+            return
+
+        member = payload.member or guild.get_member(payload.user_id)
+        if member is None or member.bot:
+            return
+
+        self.activity.add_reaction(payload.message_id, payload.channel_id, payload.user_id,
+                                   str(payload.emoji), added=action_type == "ADD")
+
+        if self.is_flagged_member(payload.user_id):
+            await self.log_reaction_activity(payload, action_type, guild)
+
+    async def process_voice_events(self):
+        """Record finished voice sessions and attendance earned in voice"""
+        attendance, ended = self.voice_tracking.take_events()
+
+        for user_id, channel_id, seconds in ended:
+            self.audit_store.record("voice_session", user_id=user_id, channel_id=channel_id,
+                                    summary=f"Spent {timedelta(seconds=int(seconds))} in voice",
+                                    seconds=round(seconds))
+
+        if not attendance:
+            return
+
+        metrics = self.get_cog('PerformanceMetrics')
+        for user_id, event_type, event_name in attendance:
+            self.audit_store.record("voice_attendance", user_id=user_id, summary=f"Attended {event_name}",
+                                    event_type=event_type)
+            if metrics:
+                try:
+                    await metrics.record_attendance(user_id, event_type, event_name)
+                except Exception as e:
+                    logger.error(f"Failed to record voice attendance for {user_id}: {e}")
+
+    @tasks.loop(minutes=1)
+    async def voice_sweep(self):
+        """Credit time for open voice sessions and persist daily totals"""
+        try:
+            self.voice_tracking.sweep()
+            await self.process_voice_events()
+            if self.voice_tracking.dirty:
+                await self.storage.save_voice_totals(self.voice_tracking.to_dict())
+        except Exception as e:
+            logger.error(f"Error sweeping voice sessions: {e}")
+
+        try:
+            if self.dm_deliverability.dirty:
+                await self.storage.save_dm_deliverability(self.dm_deliverability.to_dict())
+        except Exception as e:
+            logger.error(f"Error saving DM deliverability: {e}")
+
+    def is_flagged_member(self, user_id):
+        """Members whose reactions and voice moves are logged individually"""
+        if user_id in Config.ACTIVITY_WATCHLIST:
+            return True
+
+        if self.punishment_scheduler.has_pending(user_id):
+            return True
+
+        moderation = self.get_cog('AdvancedModeration')
+        points = moderation.warning_points.get(user_id) if moderation else None
+        return bool(points and points.get('points', 0) >= Config.ACTIVITY_FLAG_MIN_POINTS)
 
     async def on_member_update(self, before, after):
         """Handle member updates (nickname, roles, etc.)"""
         if not Config.check_guild_authorization(after.guild.id):
             return
 
-        # Nickname change
-        if before.nick != after.nick:
-            await self.log_nickname_change(before, after)
-
-        # Role changes
+        # The roster follows every role change; logging waits for the burst to settle
         if before.roles != after.roles:
-            await self.log_role_changes(before, after)
+            self.roster.update(after)
+
+        # Buffered so bulk role edits produce one audit event per member
+        if before.nick != after.nick or before.roles != after.roles:
+            self.member_updates.push(before, after)
+
+    async def settle_member_update(self, diff):
+        """Handle the net result of a burst of member updates"""
+        if diff.roles_changed:
+            clearance_cache.invalidate(diff.member.id)
+
+        await self.log_member_changes(diff)
+
+    async def on_guild_role_update(self, before, after):
+        """Re-resolve clearances when a role is renamed"""
+        if before.name != after.name:
+            clearance_cache.clear()
+            if Config.check_guild_authorization(after.guild.id):
+                self.roster.rebuild(after.guild)
+
+    async def on_guild_role_delete(self, role):
+        """Drop clearances that may have come from a deleted role"""
+        clearance_cache.clear()
+        if Config.check_guild_authorization(role.guild.id):
+            self.roster.rebuild(role.guild)
 
     async def on_guild_channel_create(self, channel):
         """Handle channel creation"""
@@ -430,6 +679,9 @@ class MerrywinterBot(commands.Bot):
 
     async def log_member_action(self, member, action_type, description):
         """Log member actions to moderation channel"""
+        self.audit_store.record(f"member_{action_type.lower()}", user_id=member.id,
+                                summary=f"{member} - {description}")
+
         if not self.moderation_log_channel:
             return
 
@@ -448,13 +700,16 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log member action: {e}")
+        self.audit_sink.submit(embed, 'member')
 
-    async def log_message_action(self, message, action_type, description):
+    async def log_message_action(self, message_id, channel_id, snapshot, action_type, description):
         """Log message actions to moderation channel"""
+        content = snapshot.content if snapshot else ""
+        self.audit_store.record(f"message_{action_type.lower()}", user_id=snapshot.author_id if snapshot else None,
+                                channel_id=channel_id,
+                                summary=f"{snapshot.author_name if snapshot else 'Unknown author'} - {description}",
+                                message_id=message_id, content=content)
+
         if not self.moderation_log_channel:
             return
 
@@ -464,24 +719,34 @@ class MerrywinterBot(commands.Bot):
             timestamp=datetime.utcnow()
         )
 
-        embed.add_field(name="👤 Author", value=f"{message.author.mention} ({message.author})", inline=False)
-        embed.add_field(name="📍 Channel", value=f"{message.channel.mention}", inline=True)
-        embed.add_field(name="🆔 Message ID", value=f"`{message.id}`", inline=True)
+        if snapshot:
+            embed.add_field(name="👤 Author", value=f"<@{snapshot.author_id}> ({snapshot.author_name})", inline=False)
+        embed.add_field(name="📍 Channel", value=f"<#{channel_id}>", inline=True)
+        embed.add_field(name="🆔 Message ID", value=f"`{message_id}`", inline=True)
+
+        if snapshot is None:
+            embed.add_field(name="📝 Content", value="Not captured (message older than the snapshot cache)", inline=False)
+        else:
+            embed.add_field(name="📅 Sent", value=f"<t:{int(snapshot.created)}:R>", inline=True)
+            if snapshot.attachments:
+                embed.add_field(name="📎 Attachments", value=f"{snapshot.attachments}", inline=True)
 
         # Truncate long messages
-        content = message.content[:1000] + "..." if len(message.content) > 1000 else message.content
+        content = content[:1000] + "..." if len(content) > 1000 else content
         if content:
             embed.add_field(name="📝 Content", value=f"```{content}```", inline=False)
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log message action: {e}")
+        self.audit_sink.submit(embed, 'message')
 
-    async def log_message_edit(self, before, after):
+    async def log_message_edit(self, before, after_content):
         """Log message edits to moderation channel"""
+        before_content = before.content
+        self.audit_store.record("message_edit", user_id=before.author_id, channel_id=before.channel_id,
+                                summary=f"{before.author_name} edited a message", message_id=before.id,
+                                before=before_content[:1000], after=after_content[:1000])
+
         if not self.moderation_log_channel:
             return
 
@@ -491,13 +756,13 @@ class MerrywinterBot(commands.Bot):
             timestamp=datetime.utcnow()
         )
 
-        embed.add_field(name="👤 Author", value=f"{before.author.mention} ({before.author})", inline=False)
-        embed.add_field(name="📍 Channel", value=f"{before.channel.mention}", inline=True)
+        embed.add_field(name="👤 Author", value=f"<@{before.author_id}> ({before.author_name})", inline=False)
+        embed.add_field(name="📍 Channel", value=f"<#{before.channel_id}>", inline=True)
         embed.add_field(name="🆔 Message ID", value=f"`{before.id}`", inline=True)
 
         # Truncate long messages
-        before_content = before.content[:500] + "..." if len(before.content) > 500 else before.content
-        after_content = after.content[:500] + "..." if len(after.content) > 500 else after.content
+        before_content = before_content[:500] + "..." if len(before_content) > 500 else before_content
+        after_content = after_content[:500] + "..." if len(after_content) > 500 else after_content
 
         if before_content:
             embed.add_field(name="📝 Before", value=f"```{before_content}```", inline=False)
@@ -506,13 +771,13 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log message edit: {e}")
+        self.audit_sink.submit(embed, 'message')
 
     async def log_moderation_action(self, user, action_type, reason, guild):
         """Log moderation actions to moderation channel"""
+        self.audit_store.record("moderation", user_id=user.id, summary=f"{action_type} {user} - {reason}",
+                                action=action_type, reason=reason)
+
         if not self.moderation_log_channel:
             return
 
@@ -529,13 +794,14 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log moderation action: {e}")
+        self.audit_sink.submit(embed, 'moderation', collapsible=False, priority='high')
 
     async def log_voice_activity(self, member, action_type, channel, previous_channel=None):
         """Log voice channel activity"""
+        self.audit_store.record(f"voice_{action_type.lower()}", user_id=member.id, channel_id=channel.id,
+                                summary=f"{member} {action_type.lower()} #{channel.name}",
+                                from_channel_id=previous_channel.id if previous_channel else None)
+
         if not self.moderation_log_channel:
             return
 
@@ -554,16 +820,10 @@ class MerrywinterBot(commands.Bot):
         embed.add_field(name="👥 Channel Members", value=f"{len(channel.members)}", inline=True)
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log voice activity: {e}")
+        self.audit_sink.submit(embed, 'voice')
 
     async def log_reaction_activity(self, payload, action_type, guild):
         """Log reaction activity"""
-        if not self.moderation_log_channel:
-            return
-
         try:
             channel = guild.get_channel(payload.channel_id)
             user = guild.get_member(payload.user_id)
@@ -571,6 +831,13 @@ class MerrywinterBot(commands.Bot):
             if not channel or not user or user.bot:
                 return
 
+            self.audit_store.record(f"reaction_{action_type.lower()}", user_id=user.id, channel_id=channel.id,
+                                    summary=f"{user} {action_type.lower()} {payload.emoji}",
+                                    message_id=payload.message_id, emoji=str(payload.emoji))
+
+            if not self.moderation_log_channel:
+                return
+
             embed = discord.Embed(
                 title=f"👍 REACTION {action_type}",
                 color=Config.COLORS['secondary'],
@@ -583,67 +850,60 @@ class MerrywinterBot(commands.Bot):
             embed.add_field(name="📝 Message ID", value=f"`{payload.message_id}`", inline=True)
             embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-            await self.moderation_log_channel.send(embed=embed)
+            self.audit_sink.submit(embed, 'reaction')
         except Exception as e:
             logger.error(f"Failed to log reaction activity: {e}")
 
-    async def log_nickname_change(self, before, after):
-        """Log nickname changes"""
-        if not self.moderation_log_channel:
-            return
-
-        embed = discord.Embed(
-            title="🏷️ NICKNAME CHANGE",
-            color=Config.COLORS['warning'],
-            timestamp=datetime.utcnow()
+    async def log_member_changes(self, diff):
+        """Log the net nickname and role changes of a member"""
+        member = diff.member
+        changes = []
+        if diff.nick_changed:
+            changes.append(f"{diff.nick_before or 'No nickname'} -> {diff.nick_after or 'No nickname'}")
+        changes.extend([f"+@{role.name}" for role in diff.added_roles] + [f"-@{role.name}" for role in diff.removed_roles])
+
+        self.audit_store.record(
+            "role_change" if diff.roles_changed else "nickname_change", user_id=member.id,
+            summary=" ".join(changes),
+            added=[role.id for role in diff.added_roles], removed=[role.id for role in diff.removed_roles],
+            nick_before=diff.nick_before, nick_after=diff.nick_after, updates=diff.updates
         )
 
-        embed.add_field(name="👤 Member", value=f"{after.mention} ({after})", inline=False)
-        embed.add_field(name="📝 Before", value=f"{before.nick or 'No nickname'}", inline=True)
-        embed.add_field(name="📝 After", value=f"{after.nick or 'No nickname'}", inline=True)
-        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
-
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log nickname change: {e}")
-
-    async def log_role_changes(self, before, after):
-        """Log role changes"""
         if not self.moderation_log_channel:
             return
 
-        added_roles = set(after.roles) - set(before.roles)
-        removed_roles = set(before.roles) - set(after.roles)
-
-        if not added_roles and not removed_roles:
-            return
-
         embed = discord.Embed(
-            title="🎭 ROLE CHANGES",
+            title="🎭 ROLE CHANGES" if diff.roles_changed else "🏷️ NICKNAME CHANGE",
             color=Config.COLORS['warning'],
             timestamp=datetime.utcnow()
         )
 
-        embed.add_field(name="👤 Member", value=f"{after.mention} ({after})", inline=False)
+        embed.add_field(name="👤 Member", value=f"{member.mention} ({member})", inline=False)
 
-        if added_roles:
-            roles_text = ", ".join([f"@{role.name}" for role in added_roles])
-            embed.add_field(name="➕ Added Roles", value=roles_text, inline=False)
+        if diff.nick_changed:
+            embed.add_field(name="📝 Before", value=f"{diff.nick_before or 'No nickname'}", inline=True)
+            embed.add_field(name="📝 After", value=f"{diff.nick_after or 'No nickname'}", inline=True)
 
-        if removed_roles:
-            roles_text = ", ".join([f"@{role.name}" for role in removed_roles])
-            embed.add_field(name="➖ Removed Roles", value=roles_text, inline=False)
+        if diff.added_roles:
+            roles_text = ", ".join([f"@{role.name}" for role in diff.added_roles])
+            embed.add_field(name="➕ Added Roles", value=roles_text[:1024], inline=False)
+
+        if diff.removed_roles:
+            roles_text = ", ".join([f"@{role.name}" for role in diff.removed_roles])
+            embed.add_field(name="➖ Removed Roles", value=roles_text[:1024], inline=False)
+
+        if diff.updates > 1:
+            embed.add_field(name="🔁 Updates Merged", value=f"{diff.updates}", inline=True)
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log role changes: {e}")
+        self.audit_sink.submit(embed, 'role' if diff.roles_changed else 'nickname')
 
     async def log_channel_activity(self, channel, action_type):
         """Log channel creation/deletion"""
+        self.audit_store.record(f"channel_{action_type.lower()}", channel_id=channel.id,
+                                summary=f"#{channel.name} ({channel.type})")
+
         if not self.moderation_log_channel:
             return
 
@@ -662,13 +922,14 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log channel activity: {e}")
+        self.audit_sink.submit(embed, 'channel')
 
     async def log_invite_activity(self, invite, action_type):
         """Log invite creation/deletion"""
+        self.audit_store.record(f"invite_{action_type.lower()}", user_id=invite.inviter.id if invite.inviter else None,
+                                channel_id=invite.channel.id if invite.channel else None,
+                                summary=f"Invite {invite.code}", code=invite.code)
+
         if not self.moderation_log_channel:
             return
 
@@ -692,18 +953,17 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log invite activity: {e}")
+        self.audit_sink.submit(embed, 'invite')
 
     async def log_server_boost(self, before, after):
         """Log server boost changes"""
+        boost_change = after.premium_subscription_count - before.premium_subscription_count
+        self.audit_store.record("server_boost", summary=f"{boost_change:+d} boosts ({after.premium_subscription_count} total)",
+                                total=after.premium_subscription_count, tier=after.premium_tier)
+
         if not self.moderation_log_channel:
             return
 
-        boost_change = after.premium_subscription_count - before.premium_subscription_count
-
         embed = discord.Embed(
             title="💎 SERVER BOOST UPDATE",
             color=Config.COLORS['success'] if boost_change > 0 else Config.COLORS['warning'],
@@ -716,10 +976,7 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log server boost: {e}")
+        self.audit_sink.submit(embed, 'boost', collapsible=False)
 
     async def track_command_usage(self, command_name, user_id, guild_id):
         """Track command usage statistics"""
@@ -762,6 +1019,9 @@ class MerrywinterBot(commands.Bot):
 
     async def alert_mass_action(self, action_type, count):
         """Alert about mass actions"""
+        self.audit_store.record("mass_action", summary=f"{count} {action_type} actions in 5 minutes",
+                                action=action_type, count=count)
+
         if not self.moderation_log_channel:
             return
 
@@ -778,10 +1038,77 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
 
+        self.audit_sink.submit(embed, 'mass_action', collapsible=False, priority='critical')
+
+    @tasks.loop(minutes=Config.ACTIVITY_SUMMARY_INTERVAL)
+    async def activity_summary(self):
+        """Post the aggregated reaction and voice activity for the last period"""
         try:
-            await self.moderation_log_channel.send(embed=embed)
+            summary = self.activity.drain()
+            await self.process_voice_events()
+            if summary.empty:
+                return
+
+            guild_id = Config.AUTHORIZED_GUILD_ID
+            for message_id, tally in summary.reactions.items():
+                self.audit_store.record("reaction_summary", channel_id=tally.channel_id,
+                                        summary=f"+{tally.adds}/-{tally.removes} from {len(tally.users)} members",
+                                        message_id=message_id, adds=tally.adds, removes=tally.removes,
+                                        emojis=tally.emojis)
+
+            if self.moderation_log_channel:
+                self.audit_sink.submit(self.build_activity_summary(summary, guild_id), 'activity', collapsible=False)
         except Exception as e:
-            logger.error(f"Failed to alert mass action: {e}")
+            logger.error(f"Error posting activity summary: {e}")
+
+    def build_activity_summary(self, summary, guild_id):
+        """Build the periodic activity summary embed"""
+        minutes = max(1, int((summary.ended - summary.started) // 60))
+        embed = discord.Embed(
+            title=f"📊 ACTIVITY SUMMARY - LAST {minutes} MIN",
+            color=Config.COLORS['info'],
+            timestamp=datetime.utcnow()
+        )
+
+        if summary.reactions or summary.overflow:
+            lines = []
+            for message_id, tally in summary.top_messages():
+                top_emoji = max(tally.emojis, key=tally.emojis.get) if tally.emojis else "—"
+                lines.append(f"[Message](https://discord.com/channels/{guild_id}/{tally.channel_id}/{message_id}) "
+                             f"in <#{tally.channel_id}>: +{tally.adds}/-{tally.removes} {top_emoji} "
+                             f"({len(tally.users)} members)")
+            embed.add_field(
+                name="👍 Reactions",
+                value=f"**Added:** {summary.reaction_adds} • **Removed:** {summary.reaction_removes} • "
+                      f"**Messages:** {len(summary.reactions)}"
+                      + (f" (+{summary.overflow} untracked)" if summary.overflow else "")
+                      + ("\n" + "\n".join(lines) if lines else ""),
+                inline=False
+            )
+
+        if summary.voice_totals or summary.channel_seconds:
+            sessions = sum(totals.sessions for totals in summary.voice_totals.values())
+            moves = sum(totals.moves for totals in summary.voice_totals.values())
+            members = "\n".join(
+                f"<@{user_id}>: {timedelta(seconds=int(totals.seconds))} ({totals.sessions} sessions, {totals.moves} moves)"
+                for user_id, totals in summary.top_members() if totals.seconds
+            )
+            channels = "\n".join(
+                f"<#{channel_id}>: {timedelta(seconds=int(seconds))}"
+                for channel_id, seconds in summary.channel_seconds.most_common(5)
+            )
+            embed.add_field(
+                name="🎤 Voice",
+                value=f"**Sessions Ended:** {sessions} • **Moves:** {moves} • **In Voice Now:** {summary.open_sessions}",
+                inline=False
+            )
+            if members:
+                embed.add_field(name="👥 Top Members", value=members[:1024], inline=True)
+            if channels:
+                embed.add_field(name="🔊 Busiest Channels", value=channels[:1024], inline=True)
+
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+        return embed
 
     @tasks.loop(minutes=Config.HEALTH_CHECK_INTERVAL)
     async def health_check(self):
@@ -847,10 +1174,7 @@ class MerrywinterBot(commands.Bot):
 
         embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION} • Auto-monitoring active")
 
-        try:
-            await self.moderation_log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log health status: {e}")
+        self.audit_sink.submit(embed, 'health', collapsible=False)
 
     async def recover_from_error(self):
         """Attempt to recover from errors"""
@@ -889,11 +1213,27 @@ class MerrywinterBot(commands.Bot):
 
     @status_update.before_loop
     @health_check.before_loop
+    @activity_summary.before_loop
+    @voice_sweep.before_loop
     @keepalive.before_loop
     async def before_loops(self):
         """Wait until bot is ready before starting loops"""
         await self.wait_until_ready()
 
+    async def close(self):
+        """Write buffered audit events before disconnecting"""
+        try:
+            await self.member_updates.flush()
+            await self.audit_store.close()
+        except Exception as e:
+            logger.error(f"Failed to flush audit store: {e}")
+        try:
+            if self.dm_deliverability.dirty:
+                await self.storage.save_dm_deliverability(self.dm_deliverability.to_dict())
+        except Exception as e:
+            logger.error(f"Failed to save DM deliverability: {e}")
+        await super().close()
+
 # Slash commands
 async def help_command(interaction: discord.Interaction):
     """Display comprehensive help information"""
@@ -954,7 +1294,9 @@ async def help_command(interaction: discord.Interaction):
               "`/warn` - Issue warning (Moderator+ only)\n"
               "`/warnings` - Check warnings\n"
               "`/mute` - Mute user (Moderator+ only)\n"
-              "`/unmute` - Unmute user (Moderator+ only)",
+              "`/unmute` - Unmute user (Moderator+ only)\n"
+              "`/raid-status` - Anti-raid detector state (Moderator+ only)\n"
+              "`/unlock` - Lift anti-raid lockdown (Moderator+ only)",
         inline=False
     )
 
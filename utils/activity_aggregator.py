@@ -0,0 +1,98 @@
+"""
+Activity aggregation utilities for Merrywinter Security Consulting Bot
+In-memory reaction counters and voice sessions summarized periodically
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+from utils.voice_sessions import VoiceTotals
+
+
+class ReactionTally:
+    """Reaction activity on one message during the current period"""
+
+    __slots__ = ('channel_id', 'adds', 'removes', 'emojis', 'users')
+
+    def __init__(self, channel_id):
+        self.channel_id = channel_id
+        self.adds = 0
+        self.removes = 0
+        self.emojis: Dict[str, int] = {}
+        self.users = set()
+
+
+class ActivitySummary:
+    """Aggregated activity for one reporting period"""
+
+    __slots__ = ('started', 'ended', 'reactions', 'reaction_adds', 'reaction_removes', 'overflow',
+                 'voice_totals', 'channel_seconds', 'open_sessions')
+
+    def __init__(self, started, ended, reactions, overflow, voice_totals, channel_seconds, open_sessions):
+        self.started = started
+        self.ended = ended
+        self.reactions = reactions
+        self.reaction_adds = sum(tally.adds for tally in reactions.values())
+        self.reaction_removes = sum(tally.removes for tally in reactions.values())
+        self.overflow = overflow
+        self.voice_totals = voice_totals
+        self.channel_seconds = channel_seconds
+        self.open_sessions = open_sessions
+
+    @property
+    def empty(self) -> bool:
+        return not (self.reactions or self.overflow or self.voice_totals)
+
+    def top_messages(self, limit=5) -> List[Tuple[int, ReactionTally]]:
+        return sorted(self.reactions.items(), key=lambda item: item[1].adds + item[1].removes, reverse=True)[:limit]
+
+    def top_members(self, limit=5) -> List[Tuple[int, VoiceTotals]]:
+        return sorted(self.voice_totals.items(), key=lambda item: item[1].seconds, reverse=True)[:limit]
+
+
+class ActivityAggregator:
+    """Count reactions per message and voice time per member
+
+    Reaction and voice events are the noisiest traffic the bot sees, so
+    instead of one log entry each they are folded into small slotted
+    records: a tally per reacted message here, and voice time per member and
+    channel in ``voice`` (a VoiceSessionTracker). ``drain`` hands back
+    everything since the previous drain as an ActivitySummary and starts a
+    new period. At most ``max_messages`` messages are tallied per period;
+    reactions on further messages are only counted.
+    """
+
+    def __init__(self, voice, max_messages=2000):
+        self.voice = voice
+        self.max_messages = max_messages
+        self.reactions: Dict[int, ReactionTally] = {}
+        self.overflow = 0
+        self.period_started = time.time()
+
+    def add_reaction(self, message_id, channel_id, user_id, emoji, added=True):
+        """Count one reaction add or remove"""
+        tally = self.reactions.get(message_id)
+        if tally is None:
+            if len(self.reactions) >= self.max_messages:
+                self.overflow += 1
+                return
+            tally = self.reactions[message_id] = ReactionTally(channel_id)
+
+        if added:
+            tally.adds += 1
+            tally.emojis[emoji] = tally.emojis.get(emoji, 0) + 1
+        else:
+            tally.removes += 1
+        tally.users.add(user_id)
+
+    def drain(self, now=None) -> ActivitySummary:
+        """Return the current period's activity and start a new period"""
+        now = now or time.time()
+        self.voice.sweep(now)
+        voice_totals, channel_seconds = self.voice.drain_period(now)
+        summary = ActivitySummary(self.period_started, now, self.reactions, self.overflow,
+                                  voice_totals, channel_seconds, self.voice.open_count)
+        self.reactions = {}
+        self.overflow = 0
+        self.period_started = now
+        return summary
@@ -0,0 +1,173 @@
+"""
+Activity counter utilities for Merrywinter Security Consulting Bot
+Incremental message, voice and join counters for context notifications
+"""
+
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class MinuteCounter:
+    """Counts per minute over the last ``size`` minutes in a fixed ring"""
+
+    __slots__ = ('counts', 'minutes')
+
+    def __init__(self, size=5):
+        self.counts = [0] * size
+        self.minutes = [-1] * size
+
+    def add(self, minute, amount=1):
+        slot = minute % len(self.counts)
+        if self.minutes[slot] != minute:
+            self.minutes[slot] = minute
+            self.counts[slot] = 0
+        self.counts[slot] += amount
+
+    def get(self, minute) -> int:
+        slot = minute % len(self.counts)
+        return self.counts[slot] if self.minutes[slot] == minute else 0
+
+    def latest(self) -> int:
+        return max(self.minutes)
+
+
+class ActivityCounters:
+    """Message, voice and join activity maintained event by event
+
+    Every message adds one to its channel's minute ring, voice state
+    changes move one member between channel occupancy counts, and joins
+    are kept as timestamps for the join window. Reading any of them costs
+    O(1) (or O(active channels) for the per-channel surge check), so the
+    context rules never need to walk the guild's channels or members.
+    Voice counts are seeded once from the guild when the bot is ready.
+    """
+
+    def __init__(self, channel_minutes=5, join_window=3600):
+        self.channel_minutes = channel_minutes
+        self.join_window = join_window
+        self.channels: Dict[int, MinuteCounter] = {}
+        self.last_message = time.time()
+        self.voice: Dict[int, int] = {}
+        self.voice_total = 0
+        self.voice_seeded = False
+        self.joins = deque()
+
+    def record_message(self, channel_id, now=None):
+        now = now or time.time()
+        counter = self.channels.get(channel_id)
+        if counter is None:
+            counter = self.channels[channel_id] = MinuteCounter(self.channel_minutes)
+        counter.add(int(now // 60))
+        self.last_message = now
+
+    def record_voice(self, before_id: Optional[int], after_id: Optional[int]):
+        """Apply a voice state change; ignored until ``seed_voice``"""
+        if before_id == after_id or not self.voice_seeded:
+            return
+        if before_id is not None and self.voice.get(before_id, 0) > 0:
+            self.voice[before_id] -= 1
+            self.voice_total -= 1
+            if not self.voice[before_id]:
+                del self.voice[before_id]
+        if after_id is not None:
+            self.voice[after_id] = self.voice.get(after_id, 0) + 1
+            self.voice_total += 1
+
+    def seed_voice(self, occupancy: Dict[int, int]):
+        """Reset voice counts from {channel_id: members} (on ready)"""
+        self.voice = {channel_id: count for channel_id, count in occupancy.items() if count}
+        self.voice_total = sum(self.voice.values())
+        self.voice_seeded = True
+
+    def record_join(self, now=None):
+        now = now or time.time()
+        self.joins.append(now)
+        self._trim_joins(now)
+
+    def _trim_joins(self, now):
+        while self.joins and now - self.joins[0] > self.join_window:
+            self.joins.popleft()
+
+    def join_count(self, seconds, now=None) -> int:
+        """Joins in the last ``seconds`` (at most ``join_window``)"""
+        now = now or time.time()
+        self._trim_joins(now)
+        count = 0
+        for joined in reversed(self.joins):
+            if now - joined > seconds:
+                break
+            count += 1
+        return count
+
+    def channel_rates(self, now=None) -> List[Tuple[int, int]]:
+        """(channel_id, messages) for the last complete minute; forgets idle channels"""
+        minute = int((now or time.time()) // 60) - 1
+        rates = []
+        for channel_id, counter in list(self.channels.items()):
+            if counter.latest() < minute - self.channel_minutes:
+                del self.channels[channel_id]
+                continue
+            count = counter.get(minute)
+            if count:
+                rates.append((channel_id, count))
+        return rates
+
+    def idle_seconds(self, now=None) -> float:
+        return (now or time.time()) - self.last_message
+
+
+class ContextMonitor:
+    """Evaluate context rules against ActivityCounters
+
+    ``evaluate`` returns (rule, key, value) for every condition that has
+    just become true. A rule that stays true is not reported again until
+    it has cleared, so a quiet night yields one low-activity alert rather
+    than one per evaluation. Rules without settings are skipped.
+    """
+
+    def __init__(self, counters: ActivityCounters, rules: Dict[str, dict]):
+        self.counters = counters
+        self.rules = rules or {}
+        self.active = set()
+
+    def _edge(self, rule, key, triggered, value, alerts):
+        if triggered:
+            if (rule, key) not in self.active:
+                self.active.add((rule, key))
+                alerts.append((rule, key, value))
+        else:
+            self.active.discard((rule, key))
+
+    def evaluate(self, now=None) -> List[Tuple[str, Optional[int], float]]:
+        now = now or time.time()
+        counters = self.counters
+        alerts = []
+
+        rule = self.rules.get('low_activity')
+        if rule:
+            idle = counters.idle_seconds(now)
+            self._edge('low_activity', None, idle >= rule['idle_minutes'] * 60, idle, alerts)
+
+        rule = self.rules.get('high_voice')
+        if rule and counters.voice_seeded:
+            self._edge('high_voice', None, counters.voice_total > rule['members'], counters.voice_total, alerts)
+
+        rule = self.rules.get('join_surge')
+        if rule:
+            joins = counters.join_count(rule['minutes'] * 60, now)
+            self._edge('join_surge', None, joins >= rule['joins'], joins, alerts)
+
+        rule = self.rules.get('message_surge')
+        if rule:
+            surging = {}
+            for channel_id, count in counters.channel_rates(now):
+                if count >= rule['per_minute']:
+                    surging[channel_id] = count
+            for rule_name, key in list(self.active):
+                if rule_name == 'message_surge' and key not in surging:
+                    self.active.discard((rule_name, key))
+            for channel_id, count in surging.items():
+                self._edge('message_surge', channel_id, True, count, alerts)
+
+        return alerts
@@ -0,0 +1,240 @@
+"""
+Audit sink utilities for Merrywinter Security Consulting Bot
+Buffers audit-log embeds and sends them as multi-embed messages
+"""
+
+import asyncio
+import time
+from collections import deque, Counter
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import discord
+
+from config.settings import Config
+from utils.logger import logger
+from utils.outbound import PRIORITY_RANKS, PRIORITY_NAMES, SPOOLED
+
+# Discord limits per message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+CATEGORY_LABELS = {
+    'member': 'member events',
+    'message': 'message events',
+    'voice': 'voice events',
+    'reaction': 'reactions',
+    'nickname': 'nickname changes',
+    'role': 'role changes',
+    'channel': 'channel events',
+    'invite': 'invite events',
+}
+
+
+class FloodState:
+    """Rate tracking and running summary for one event category"""
+
+    __slots__ = ('recent', 'flooding', 'counts', 'started')
+
+    def __init__(self):
+        self.recent = deque()
+        self.flooding = False
+        self.counts = Counter()
+        self.started = 0.0
+
+
+class AuditSink:
+    """Coalesce audit events into batched multi-embed messages
+
+    Events are buffered for ``window`` seconds and sent packed up to ten
+    embeds per message. When a collapsible category exceeds
+    ``flood_threshold`` events within ``flood_window`` seconds it switches to
+    summary mode: individual embeds are replaced by one summary per flood
+    window ("143 reactions in 30s") until the rate drops again. The buffer
+    holds at most ``max_queue`` embeds; collapsible events beyond that are
+    folded into summaries and other events are dropped and counted.
+
+    Each event carries an outbound priority. Batches are packed most urgent
+    first and handed to ``outbound`` (the bot's OutboundScheduler) at the
+    priority of their most urgent embed; a critical event flushes at once.
+    """
+
+    def __init__(self, channel_getter: Callable, window=2.0, flood_threshold=20, flood_window=30.0, max_queue=500,
+                 outbound=None):
+        self.channel_getter = channel_getter
+        self.outbound = outbound
+        self.window = window
+        self.flood_threshold = flood_threshold
+        self.flood_window = flood_window
+        self.max_queue = max_queue
+        self.queue = deque()
+        self.floods: Dict[str, FloodState] = {}
+        self.stats = {'submitted': 0, 'messages_sent': 0, 'embeds_sent': 0, 'collapsed': 0,
+                      'summaries': 0, 'dropped': 0, 'failed': 0, 'spooled': 0}
+        self._event = asyncio.Event()
+        self._urgent = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self):
+        return len(self.queue)
+
+    def submit(self, embed, category='general', collapsible=True, priority='low'):
+        """Queue an audit embed for the next batch"""
+        self.stats['submitted'] += 1
+        now = time.monotonic()
+
+        if collapsible:
+            state = self.floods.get(category)
+            if state is None:
+                state = self.floods[category] = FloodState()
+
+            state.recent.append(now)
+            while state.recent and now - state.recent[0] > self.flood_window:
+                state.recent.popleft()
+
+            if not state.flooding and len(state.recent) >= self.flood_threshold:
+                state.flooding = True
+                state.started = now
+                logger.warning(f"Audit flood: {len(state.recent)} {CATEGORY_LABELS.get(category, category)} "
+                               f"in {int(self.flood_window)}s, switching to summaries")
+
+            if state.flooding or len(self.queue) >= self.max_queue:
+                state.counts[embed.title or category] += 1
+                self.stats['collapsed'] += 1
+                if not state.flooding:
+                    state.flooding = True
+                    state.started = now
+                self._wake()
+                return
+
+        if len(self.queue) >= self.max_queue:
+            self.stats['dropped'] += 1
+            return
+
+        self.queue.append((PRIORITY_RANKS.get(priority, PRIORITY_RANKS['low']), embed))
+        if priority == 'critical':
+            self._urgent.set()
+        self._wake()
+
+    def _wake(self):
+        """Start the flush loop if needed and signal pending work"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._event.set()
+
+    def stop(self):
+        """Stop the flush loop"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _summary_embed(self, category, state, now):
+        """Build a summary embed for a flooding category"""
+        total = sum(state.counts.values())
+        elapsed = max(1, int(now - state.started))
+        label = CATEGORY_LABELS.get(category, f"{category} events")
+
+        embed = discord.Embed(
+            title=f"📊 {total} {label} in {elapsed}s",
+            description="High event volume; individual entries were collapsed into this summary.",
+            color=Config.COLORS['info'],
+            timestamp=datetime.utcnow()
+        )
+        breakdown = "\n".join(f"**{title}** × {count}" for title, count in state.counts.most_common(10))
+        embed.add_field(name="🔍 Breakdown", value=breakdown[:1024], inline=False)
+        embed.set_footer(text=f"F.R.O.S.T AI • {Config.AI_VERSION}")
+        return embed
+
+    def _collect_summaries(self, now, force=False):
+        """Emit summaries for flood windows that have elapsed"""
+        summaries = []
+        for category, state in self.floods.items():
+            if not state.flooding or (not force and now - state.started < self.flood_window):
+                continue
+
+            if state.counts:
+                summaries.append(self._summary_embed(category, state, now))
+                self.stats['summaries'] += 1
+                state.counts.clear()
+
+            while state.recent and now - state.recent[0] > self.flood_window:
+                state.recent.popleft()
+            if len(state.recent) < self.flood_threshold:
+                state.flooding = False
+            state.started = now
+        return summaries
+
+    def _pack(self, entries):
+        """Split (rank, embed) entries into messages within Discord's limits, most urgent first"""
+        batch, size, rank = [], 0, None
+        for entry_rank, embed in sorted(entries, key=lambda entry: entry[0]):
+            embed_size = len(embed)
+            if batch and (len(batch) >= MAX_EMBEDS_PER_MESSAGE or size + embed_size > MAX_EMBED_CHARS_PER_MESSAGE):
+                yield rank, batch
+                batch, size, rank = [], 0, None
+            batch.append(embed)
+            size += embed_size
+            rank = entry_rank if rank is None else min(rank, entry_rank)
+        if batch:
+            yield rank, batch
+
+    async def _send(self, channel, embeds, rank):
+        """Send one packed message"""
+        try:
+            if self.outbound is not None:
+                message = await self.outbound.send(channel, PRIORITY_NAMES[rank], durable=True, embeds=embeds)
+                if message is SPOOLED:
+                    # Delivery failed; the spool will retry in order
+                    self.stats['spooled'] += len(embeds)
+                    return
+                if message is None:
+                    # Evicted from a full outbound queue
+                    self.stats['dropped'] += len(embeds)
+                    return
+            else:
+                await channel.send(embeds=embeds)
+            self.stats['messages_sent'] += 1
+            self.stats['embeds_sent'] += len(embeds)
+        except Exception as e:
+            self.stats['failed'] += len(embeds)
+            logger.error(f"Failed to send audit batch of {len(embeds)} embeds: {e}")
+
+    async def flush(self, force_summaries=False):
+        """Send everything buffered, plus any due flood summaries"""
+        now = time.monotonic()
+        entries = list(self.queue)
+        self.queue.clear()
+        entries.extend((PRIORITY_RANKS['medium'], summary) for summary in self._collect_summaries(now, force=force_summaries))
+        if not entries:
+            return
+
+        channel = self.channel_getter()
+        if channel is None:
+            self.stats['dropped'] += len(entries)
+            return
+
+        for rank, batch in self._pack(entries):
+            await self._send(channel, batch, rank)
+
+    async def _run(self):
+        """Flush every ``window`` seconds while there is work"""
+        while True:
+            try:
+                await self._event.wait()
+                self._event.clear()
+                try:
+                    # Critical events cut the buffering window short
+                    await asyncio.wait_for(self._urgent.wait(), timeout=self.window)
+                except asyncio.TimeoutError:
+                    pass
+                self._urgent.clear()
+                await self.flush()
+
+                # Keep waking while flood summaries are still accumulating
+                if any(state.flooding for state in self.floods.values()):
+                    self._event.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit sink error: {e}")
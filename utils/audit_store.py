@@ -0,0 +1,418 @@
+"""
+Audit event store utilities for Merrywinter Security Consulting Bot
+Append-only local record of audit events with indexed search
+"""
+
+import asyncio
+import json
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+import aiofiles
+
+from utils.logger import logger
+
+# Per-event index entry: timestamp, user id, channel id, type code, offset and length in the segment
+INDEX_RECORD = struct.Struct('<dQQHQI')
+
+
+class AuditEventStore:
+    """Segmented append-only audit log with in-memory column indexes
+
+    Events are appended as JSON lines to numbered segment files
+    (``events-N.jsonl``); each segment has a binary sidecar (``events-N.idx``)
+    with one fixed-size entry per event. On startup only the sidecars are
+    read, which rebuilds compact columns (timestamp, user, channel, type,
+    file offset) and posting lists per user, channel and event type. Event
+    bodies stay on disk and are read by offset for the page being shown.
+
+    Timestamps are kept non-decreasing, so a time range maps to a position
+    range by bisection. A search picks the shortest matching posting list,
+    narrows it to the time range and checks the remaining filters against
+    the columns, so cost depends on the size of that list, not on the total
+    number of events. Retention drops whole segments.
+    """
+
+    def __init__(self, directory='data/audit', segment_events=100000, retention_days=90, flush_interval=1.0,
+                 max_buffer=1000):
+        self.directory = directory
+        self.segment_events = segment_events
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        # Columns indexed by position (0 = oldest event kept)
+        self.timestamps = array('d')
+        self.users = array('Q')
+        self.channels = array('Q')
+        self.types = array('H')
+        self.offsets = array('Q')
+        self.lengths = array('I')
+
+        # Posting lists of positions, ascending
+        self.by_user: Dict[int, array] = {}
+        self.by_channel: Dict[int, array] = {}
+        self.by_type: Dict[int, array] = {}
+
+        # Segment file index and first position for each live segment
+        self.segments: List[int] = []
+        self.segment_starts: List[int] = []
+        self.active_size = 0
+
+        self.type_codes: Dict[str, int] = {}
+        self.type_names: List[str] = []
+
+        self.buffer = []
+        self.stats = {'recorded': 0, 'written': 0, 'searches': 0, 'pruned_segments': 0, 'recovered': 0}
+        self._last_ts = 0.0
+        self._last_prune = 0.0
+        self._lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.timestamps) + len(self.buffer)
+
+    @property
+    def event_types(self) -> List[str]:
+        return list(self.type_names)
+
+    def _path(self, index, suffix):
+        return os.path.join(self.directory, f"events-{index:06d}.{suffix}")
+
+    # ------------------------------------------------------------------
+    # Loading and retention
+    # ------------------------------------------------------------------
+
+    async def load(self):
+        """Rebuild indexes from segment sidecars (once)"""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            started = time.perf_counter()
+            await self._load_types()
+
+            indexes = sorted(
+                int(name[7:13]) for name in os.listdir(self.directory)
+                if name.startswith('events-') and name.endswith('.jsonl')
+            )
+            for index in indexes:
+                await self._load_segment(index)
+
+            if not self.segments:
+                self._open_segment(0)
+
+            self._loaded = True
+            self._prune_expired()
+            logger.info(f"Audit store loaded {len(self.timestamps)} events from {len(self.segments)} segments "
+                        f"in {time.perf_counter() - started:.2f}s")
+
+    async def _load_types(self):
+        path = os.path.join(self.directory, 'types.json')
+        if os.path.exists(path):
+            async with aiofiles.open(path, 'r') as f:
+                self.type_names = json.loads(await f.read())
+            self.type_codes = {name: code for code, name in enumerate(self.type_names)}
+
+    async def _save_types(self):
+        path = os.path.join(self.directory, 'types.json')
+        async with aiofiles.open(path + '.tmp', 'w') as f:
+            await f.write(json.dumps(self.type_names))
+        os.replace(path + '.tmp', path)
+
+    async def _load_segment(self, index):
+        """Index one segment, re-indexing any events written after its sidecar"""
+        data_path, index_path = self._path(index, 'jsonl'), self._path(index, 'idx')
+        raw = b''
+        if os.path.exists(index_path):
+            async with aiofiles.open(index_path, 'rb') as f:
+                raw = await f.read()
+        # A torn final entry is ignored and overwritten
+        usable = len(raw) - len(raw) % INDEX_RECORD.size
+        if usable != len(raw):
+            async with aiofiles.open(index_path, 'r+b') as f:
+                await f.truncate(usable)
+
+        self._open_segment(index)
+        end = 0
+        for ts, user_id, channel_id, code, offset, length in INDEX_RECORD.iter_unpack(raw[:usable]):
+            self._index(ts, user_id, channel_id, code, offset, length)
+            end = offset + length
+
+        size = os.path.getsize(data_path)
+        if size > end:
+            end = await self._recover_tail(index, end, size)
+        self.active_size = end
+
+    async def _recover_tail(self, index, start, size) -> int:
+        """Index events whose sidecar entries were lost in a crash"""
+        entries, offset = [], start
+        async with aiofiles.open(self._path(index, 'jsonl'), 'rb') as f:
+            await f.seek(start)
+            tail = await f.read(size - start)
+
+        for line in tail.splitlines(keepends=True):
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("partial line")
+                event = json.loads(line)
+            except ValueError:
+                break
+            code = await self._type_code(event.get('type', 'unknown'))
+            ts = self._last_ts = max(event.get('ts', 0.0), self._last_ts)
+            entries.append((ts, event.get('user_id') or 0, event.get('channel_id') or 0, code, offset, len(line)))
+            offset += len(line)
+
+        if offset < size:
+            # Drop a half-written event so later appends start on a clean line
+            async with aiofiles.open(self._path(index, 'jsonl'), 'r+b') as f:
+                await f.truncate(offset)
+
+        if entries:
+            async with aiofiles.open(self._path(index, 'idx'), 'ab') as f:
+                await f.write(b''.join(INDEX_RECORD.pack(*entry) for entry in entries))
+            for entry in entries:
+                self._index(*entry)
+            self.stats['recovered'] += len(entries)
+            logger.warning(f"Audit store re-indexed {len(entries)} events in segment {index}")
+        return offset
+
+    def _open_segment(self, index):
+        self.segments.append(index)
+        self.segment_starts.append(len(self.timestamps))
+        self.active_size = 0
+
+    def _index(self, ts, user_id, channel_id, code, offset, length):
+        position = len(self.timestamps)
+        self._last_ts = ts
+        self.timestamps.append(ts)
+        self.users.append(user_id)
+        self.channels.append(channel_id)
+        self.types.append(code)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+        for postings, key in ((self.by_user, user_id), (self.by_channel, channel_id), (self.by_type, code)):
+            if key or postings is self.by_type:
+                entries = postings.get(key)
+                if entries is None:
+                    entries = postings[key] = array('I')
+                entries.append(position)
+
+    def _prune_expired(self):
+        """Drop whole segments older than the retention period"""
+        self._last_prune = time.time()
+        if not self.retention_days or len(self.segments) < 2:
+            return
+
+        cutoff = time.time() - self.retention_days * 86400
+        drop = 0
+        # The active segment is never dropped
+        for i in range(len(self.segments) - 1):
+            last = self.segment_starts[i + 1] - 1
+            if last >= 0 and self.timestamps[last] >= cutoff:
+                break
+            drop = i + 1
+        if not drop:
+            return
+
+        shift = self.segment_starts[drop]
+        for index in self.segments[:drop]:
+            for suffix in ('jsonl', 'idx'):
+                try:
+                    os.remove(self._path(index, suffix))
+                except FileNotFoundError:
+                    pass
+
+        self.segments = self.segments[drop:]
+        self.segment_starts = [start - shift for start in self.segment_starts[drop:]]
+        for column in (self.timestamps, self.users, self.channels, self.types, self.offsets, self.lengths):
+            del column[:shift]
+        for postings in (self.by_user, self.by_channel, self.by_type):
+            for key in list(postings):
+                entries = postings[key]
+                kept = array('I', (position - shift for position in entries[bisect_left(entries, shift):]))
+                if kept:
+                    postings[key] = kept
+                else:
+                    del postings[key]
+
+        self.stats['pruned_segments'] += drop
+        logger.info(f"Audit store dropped {drop} expired segments ({shift} events)")
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(self, event_type, user_id=None, channel_id=None, actor_id=None, summary='', **details):
+        """Queue an audit event for the next write"""
+        ts = max(time.time(), self._last_ts)
+        self._last_ts = ts
+        self.buffer.append({
+            'ts': ts,
+            'type': event_type,
+            'user_id': user_id,
+            'channel_id': channel_id,
+            'actor_id': actor_id,
+            'summary': summary,
+            'details': details
+        })
+        self.stats['recorded'] += 1
+        self._wake()
+
+    def _wake(self):
+        if self._event is None:
+            self._event = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        if len(self.buffer) >= self.max_buffer:
+            self._event.set()
+
+    async def _type_code(self, name) -> int:
+        code = self.type_codes.get(name)
+        if code is None:
+            code = self.type_codes[name] = len(self.type_names)
+            self.type_names.append(name)
+            await self._save_types()
+        return code
+
+    async def flush(self):
+        """Write buffered events and index them"""
+        if not self._loaded:
+            await self.load()
+
+        async with self._lock:
+            while self.buffer:
+                if len(self.timestamps) - self.segment_starts[-1] >= self.segment_events:
+                    self._open_segment(self.segments[-1] + 1)
+
+                room = self.segment_events - (len(self.timestamps) - self.segment_starts[-1])
+                events, self.buffer = self.buffer[:room], self.buffer[room:]
+
+                lines, entries, offset = [], [], self.active_size
+                for event in events:
+                    line = (json.dumps(event, default=str) + '\n').encode()
+                    code = await self._type_code(event['type'])
+                    entries.append((event['ts'], event['user_id'] or 0, event['channel_id'] or 0, code, offset, len(line)))
+                    lines.append(line)
+                    offset += len(line)
+
+                segment = self.segments[-1]
+                # Data first: a crash before the sidecar write is repaired on load
+                async with aiofiles.open(self._path(segment, 'jsonl'), 'ab') as f:
+                    await f.write(b''.join(lines))
+                async with aiofiles.open(self._path(segment, 'idx'), 'ab') as f:
+                    await f.write(b''.join(INDEX_RECORD.pack(*entry) for entry in entries))
+
+                for entry in entries:
+                    self._index(*entry)
+                self.active_size = offset
+                self.stats['written'] += len(entries)
+
+    async def _run(self):
+        """Write buffered events every ``flush_interval`` seconds"""
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._event.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._event.clear()
+                if self.buffer:
+                    await self.flush()
+                if time.time() - self._last_prune > 3600:
+                    async with self._lock:
+                        self._prune_expired()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit store error: {e}")
+                await asyncio.sleep(5)
+
+    async def close(self):
+        """Write anything buffered and stop the writer"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.buffer:
+            await self.flush()
+
+    # ------------------------------------------------------------------
+    # Searching
+    # ------------------------------------------------------------------
+
+    async def search(self, user_id=None, channel_id=None, event_type=None, since=None, until=None, offset=0, limit=10):
+        """Find events newest first
+
+        Returns ``(total, events)`` where ``total`` counts every match and
+        ``events`` holds at most ``limit`` of them after skipping ``offset``.
+        """
+        await self.flush()
+        self.stats['searches'] += 1
+        # Held so pruning cannot shift positions between lookup and read
+        async with self._lock:
+            return await self._search(user_id, channel_id, event_type, since, until, offset, limit)
+
+    async def _search(self, user_id, channel_id, event_type, since, until, offset, limit):
+        lo = bisect_left(self.timestamps, since) if since is not None else 0
+        hi = bisect_right(self.timestamps, until) if until is not None else len(self.timestamps)
+        if lo >= hi:
+            return 0, []
+
+        filters = []
+        if user_id is not None:
+            filters.append((self.by_user.get(user_id), self.users, user_id))
+        if channel_id is not None:
+            filters.append((self.by_channel.get(channel_id), self.channels, channel_id))
+        if event_type is not None:
+            code = self.type_codes.get(event_type)
+            filters.append((self.by_type.get(code) if code is not None else None, self.types, code))
+        if any(postings is None for postings, _, _ in filters):
+            return 0, []
+
+        if filters:
+            filters.sort(key=lambda item: len(item[0]))
+            postings = filters[0][0]
+            start, end = bisect_left(postings, lo), bisect_left(postings, hi)
+            candidates = postings[start:end]
+        else:
+            candidates = range(lo, hi)
+
+        checks = [(column, value) for _, column, value in filters[1:]]
+        if not checks:
+            # Single index: the page is a slice
+            total = len(candidates)
+            first = max(0, total - offset - limit)
+            page = list(reversed(candidates[first:max(0, total - offset)]))
+        else:
+            total, page = 0, []
+            for position in reversed(candidates):
+                if all(column[position] == value for column, value in checks):
+                    if offset <= total < offset + limit:
+                        page.append(position)
+                    total += 1
+
+        return total, await self._read(page)
+
+    async def _read(self, positions) -> List[dict]:
+        """Load event bodies for positions, one file open per segment"""
+        by_segment: Dict[int, List[int]] = {}
+        for position in positions:
+            segment = self.segments[bisect_right(self.segment_starts, position) - 1]
+            by_segment.setdefault(segment, []).append(position)
+
+        events = {}
+        for segment, members in by_segment.items():
+            async with aiofiles.open(self._path(segment, 'jsonl'), 'rb') as f:
+                for position in sorted(members, key=lambda p: self.offsets[p]):
+                    await f.seek(self.offsets[position])
+                    events[position] = json.loads(await f.read(self.lengths[position]))
+        return [events[position] for position in positions]
@@ -0,0 +1,71 @@
+"""
+Clearance utilities for Merrywinter Security Consulting Bot
+Security clearance memoized per role and per member
+"""
+
+from typing import Dict, Tuple
+
+from config.settings import Config
+
+
+class ClearanceCache:
+    """Clearance levels resolved from role IDs instead of role names
+
+    ``Config.get_security_level`` lowercases every role name on each call.
+    Here each role's rank is looked up once by ID, from the role registry or
+    else by name (again if the role is renamed), and a member's level is the
+    highest rank among their roles. The result is kept per member together
+    with a hash of their role IDs, so an unchanged member costs one hash; a
+    changed role set simply misses. Entries are dropped when a member update settles or leaves, and
+    everything is dropped when a guild role changes.
+    """
+
+    def __init__(self):
+        self.roles: Dict[int, Tuple[str, int]] = {}
+        self.members: Dict[int, Tuple[int, str]] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'invalidated': 0}
+
+    def role_rank(self, role) -> int:
+        """Clearance rank granted by one discord.Role"""
+        cached = self.roles.get(role.id)
+        if cached is None or cached[0] != role.name:
+            rank = Config.registered_clearance(role.id)
+            if rank is None:
+                rank = Config.get_role_rank(role.name)
+            cached = self.roles[role.id] = (role.name, rank)
+        return cached[1]
+
+    def level_for_roles(self, roles) -> str:
+        """Clearance level for a list of discord.Role objects"""
+        return Config.get_level_name(max((self.role_rank(role) for role in roles), default=0))
+
+    def level_for_member(self, member) -> str:
+        """Clearance level for a discord.Member, memoized on their role set"""
+        roles = getattr(member, 'roles', None)
+        if roles is None:
+            # Users outside the guild (DMs) hold no roles
+            return 'CIVILIAN'
+
+        signature = hash(frozenset(role.id for role in roles))
+        cached = self.members.get(member.id)
+        if cached is not None and cached[0] == signature:
+            self.stats['hits'] += 1
+            return cached[1]
+
+        self.stats['misses'] += 1
+        level = self.level_for_roles(roles)
+        self.members[member.id] = (signature, level)
+        return level
+
+    def invalidate(self, member_id):
+        """Forget one member (roles changed or they left)"""
+        if self.members.pop(member_id, None) is not None:
+            self.stats['invalidated'] += 1
+
+    def clear(self):
+        """Forget everything (guild roles or Config role lists changed)"""
+        self.roles.clear()
+        self.members.clear()
+
+
+clearance_cache = ClearanceCache()
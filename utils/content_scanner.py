@@ -0,0 +1,152 @@
+"""
+Content scanning utilities for Merrywinter Security Consulting Bot
+CPU-bound message scanning that can run off the event loop
+"""
+
+import asyncio
+import re
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config.settings import Config
+from utils.fingerprint import MinHasher
+from utils.logger import logger
+
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+SUSPICIOUS_PATTERNS = [
+    r'nitro.*free',
+    r'discord.*gift',
+    r'free.*robux',
+    r'hack.*account',
+    r'generator.*discord',
+    r'steam.*free.*game'
+]
+
+_COMPILED_PATTERNS = [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in SUSPICIOUS_PATTERNS]
+
+SUSPICIOUS_URL_INDICATORS = [
+    'bit.ly', 'tinyurl.com', 'short.link',  # URL shorteners
+    'discord.com.', 'discordapp.com.',      # Typosquatting
+    'steam.com.', 'steampowered.com.',      # Steam typosquatting
+]
+
+# One hasher per signature length, built lazily in each worker process
+_hashers = {}
+
+
+def is_suspicious_url(url):
+    """Check if URL matches suspicious patterns"""
+    lowered = url.lower()
+    return any(indicator in lowered for indicator in SUSPICIOUS_URL_INDICATORS)
+
+
+class ScanVerdict:
+    """Result of scanning one message
+
+    ``links`` holds ``(kind, url, domain)`` tuples in message order, where kind
+    is ``'phishing'`` or ``'suspicious'``; scanning stops at the first phishing
+    link. ``pattern`` is the first suspicious pattern matched, and
+    ``signature`` the MinHash signature used for near-duplicate detection.
+    """
+
+    __slots__ = ('links', 'pattern', 'signature')
+
+    def __init__(self, links=None, pattern=None, signature=None):
+        self.links = links or []
+        self.pattern = pattern
+        self.signature = signature
+
+
+def scan_content(content, num_permutations=32, min_length=12):
+    """Run the stateless content checks on a message
+
+    Module-level and free of bot state so it can run in a worker thread or
+    process; all actions are applied by the caller on the event loop.
+    """
+    links = []
+    for url in URL_PATTERN.findall(content):
+        domain = urllib.parse.urlparse(url).netloc.lower()
+        if any(phishing_domain in domain for phishing_domain in Config.PHISHING_DOMAINS):
+            links.append(('phishing', url, domain))
+            break
+        if is_suspicious_url(url):
+            links.append(('suspicious', url, domain))
+
+    pattern = None
+    lowered = content.lower()
+    for raw_pattern, compiled in _COMPILED_PATTERNS:
+        if compiled.search(lowered):
+            pattern = raw_pattern
+            break
+
+    signature = None
+    if num_permutations and len(content) >= min_length:
+        hasher = _hashers.get(num_permutations)
+        if hasher is None:
+            hasher = _hashers[num_permutations] = MinHasher(num_permutations)
+        signature = hasher.signature(content)
+
+    return ScanVerdict(links, pattern, signature)
+
+
+class ContentScanPool:
+    """Executor-backed scanning stage with a bounded number of submissions
+
+    The scan is pure-Python regex and MinHash work that holds the GIL, so
+    only a process pool keeps it off the event loop; ``thread`` mode
+    overlaps with I/O at best. Scan cost grows with message length (about
+    1 ms per 200 characters), so content shorter than ``inline_threshold``
+    is scanned inline, where it is cheaper than pickling it to a worker.
+    At most ``max_pending`` scans are queued or running in the pool at once.
+    When the pool is saturated, or has broken, messages are scanned inline so
+    a backlog never grows without bound.
+    """
+
+    def __init__(self, mode='process', workers=2, max_pending=64, inline_threshold=500):
+        self.mode = mode
+        self.workers = workers
+        self.max_pending = max_pending
+        self.inline_threshold = inline_threshold
+        self.pending = 0
+        self.stats = {'offloaded': 0, 'inline': 0, 'saturated': 0, 'errors': 0}
+
+        if mode == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        elif mode == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='frost-scan')
+        else:
+            self.executor = None
+
+    async def scan(self, content, num_permutations=32, min_length=12):
+        """Scan content in the pool, falling back to inline scanning"""
+        if self.executor is None or len(content) < self.inline_threshold:
+            self.stats['inline'] += 1
+            return scan_content(content, num_permutations, min_length)
+
+        if self.pending >= self.max_pending:
+            self.stats['saturated'] += 1
+            self.stats['inline'] += 1
+            return scan_content(content, num_permutations, min_length)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            verdict = await loop.run_in_executor(self.executor, scan_content, content, num_permutations, min_length)
+            self.stats['offloaded'] += 1
+            return verdict
+        except (BrokenProcessPool, RuntimeError) as e:
+            # Pool died or was shut down; keep moderating inline
+            logger.error(f"Content scan pool unavailable, scanning inline: {e}")
+            self.stats['errors'] += 1
+            self.executor = None
+            return scan_content(content, num_permutations, min_length)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        """Stop the worker pool without waiting for queued scans"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,152 @@
+"""
+DM deliverability utilities for Merrywinter Security Consulting Bot
+Remembers who cannot receive DMs so notifications stop retrying them
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import discord
+
+# Discord error code for "Cannot send messages to this user" (DMs closed or bot blocked)
+CANNOT_MESSAGE_USER = 50007
+
+
+class DMStatus:
+    """Delivery history for one user"""
+
+    __slots__ = ('sent', 'failed', 'skipped', 'reason', 'failed_at', 'retry_at', 'streak')
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self.reason: Optional[str] = None
+        self.failed_at = 0.0
+        self.retry_at = 0.0
+        # Consecutive failures; each one doubles the wait before the next attempt
+        self.streak = 0
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data) -> 'DMStatus':
+        status = cls()
+        for slot in cls.__slots__:
+            if slot in data:
+                setattr(status, slot, data[slot])
+        return status
+
+
+class DeliverabilityCache:
+    """Per-user DM outcomes with a retry time after each failure
+
+    A failed DM records why it failed and until when the user is skipped:
+    ``closed_ttl`` seconds when their DMs are closed (or the user is gone),
+    ``error_ttl`` for other errors, doubling with each consecutive failure
+    up to ``max_ttl``. Senders check ``deliverable`` first and report the
+    outcome with ``record_success`` / ``record_failure``; one successful DM
+    clears the failure. Saved to storage by the bot while ``dirty``.
+    """
+
+    def __init__(self, closed_ttl=86400, error_ttl=600, max_ttl=7 * 86400):
+        self.closed_ttl = closed_ttl
+        self.error_ttl = error_ttl
+        self.max_ttl = max_ttl
+        self.users: Dict[int, DMStatus] = {}
+        self.dirty = False
+
+    def _status(self, user_id) -> DMStatus:
+        status = self.users.get(user_id)
+        if status is None:
+            status = self.users[user_id] = DMStatus()
+        return status
+
+    def deliverable(self, user_id, now=None) -> bool:
+        """Whether a DM to this user is worth attempting; counts a skip if not"""
+        status = self.users.get(user_id)
+        if status is None or status.retry_at <= (now or time.time()):
+            return True
+        status.skipped += 1
+        self.dirty = True
+        return False
+
+    def record_success(self, user_id):
+        status = self._status(user_id)
+        status.sent += 1
+        status.reason = None
+        status.retry_at = 0.0
+        status.streak = 0
+        self.dirty = True
+
+    def record_failure(self, user_id, error, now=None) -> str:
+        """Record a failed DM and return the failure reason"""
+        now = now or time.time()
+        reason = self.reason_for(error)
+        base = self.closed_ttl if reason in ('dms_closed', 'forbidden', 'unknown_user') else self.error_ttl
+
+        status = self._status(user_id)
+        status.failed += 1
+        status.streak += 1
+        status.reason = reason
+        status.failed_at = now
+        status.retry_at = now + min(self.max_ttl, base * 2 ** (status.streak - 1))
+        self.dirty = True
+        return reason
+
+    @staticmethod
+    def reason_for(error) -> str:
+        if isinstance(error, discord.Forbidden):
+            return 'dms_closed' if getattr(error, 'code', None) == CANNOT_MESSAGE_USER else 'forbidden'
+        if isinstance(error, discord.NotFound):
+            return 'unknown_user'
+        if isinstance(error, discord.HTTPException):
+            return f"http_{error.status}"
+        return type(error).__name__
+
+    async def send(self, user, **kwargs) -> Optional[discord.Message]:
+        """DM a user unless they are known to be unreachable; None if skipped or failed"""
+        if not self.deliverable(user.id):
+            return None
+        try:
+            message = await user.send(**kwargs)
+        except discord.HTTPException as e:
+            self.record_failure(user.id, e)
+            return None
+        self.record_success(user.id)
+        return message
+
+    def blocked(self, now=None) -> List[tuple]:
+        """(user_id, status) for users currently being skipped, most failures first"""
+        now = now or time.time()
+        return sorted(((user_id, status) for user_id, status in self.users.items() if status.retry_at > now),
+                      key=lambda item: item[1].failed, reverse=True)
+
+    def totals(self) -> dict:
+        return {
+            'users': len(self.users),
+            'sent': sum(status.sent for status in self.users.values()),
+            'failed': sum(status.failed for status in self.users.values()),
+            'skipped': sum(status.skipped for status in self.users.values()),
+            'blocked': len(self.blocked())
+        }
+
+    def to_dict(self) -> dict:
+        self.dirty = False
+        return {str(user_id): status.to_dict() for user_id, status in self.users.items()}
+
+    def load_dict(self, data):
+        for user_id, saved in (data or {}).items():
+            self.users[int(user_id)] = DMStatus.from_dict(saved)
+
+
+async def send_dm(bot, user, **kwargs) -> Optional[discord.Message]:
+    """DM through the bot's deliverability cache when it has one; None if not delivered"""
+    cache = getattr(bot, 'dm_deliverability', None)
+    if cache is not None:
+        return await cache.send(user, **kwargs)
+    try:
+        return await user.send(**kwargs)
+    except discord.HTTPException:
+        return None
@@ -0,0 +1,124 @@
+"""
+DM fan-out utilities for Merrywinter Security Consulting Bot
+Concurrent direct-message delivery within Discord's rate limits
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable
+
+import discord
+
+from utils.logger import logger
+from utils.outbound import TokenBucket
+
+
+class FanoutReport:
+    """Outcome of one fan-out"""
+
+    __slots__ = ('sent', 'closed', 'failed', 'skipped', 'elapsed')
+
+    def __init__(self):
+        self.sent = 0
+        self.closed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.sent + self.closed + self.failed + self.skipped
+
+    def summary(self) -> str:
+        return (f"{self.sent} delivered • {self.closed} DMs closed • {self.failed} failed • "
+                f"{self.skipped} skipped • {self.elapsed:.1f}s")
+
+
+class DMFanout:
+    """Send one DM per recipient, several at a time
+
+    At most ``concurrency`` sends are in flight, and each takes a token from
+    ``bucket`` first. Pass the outbound scheduler's global bucket so the
+    fan-out and channel traffic share one bot-wide budget. A
+    ``discord.RateLimited`` empties the bucket for its retry-after and the
+    send is retried up to ``retries`` times. Recipients with DMs closed (Forbidden) are counted
+    separately from other failures. With a ``deliverability`` cache,
+    recipients known to be unreachable are skipped without an API call and
+    every outcome is recorded there. Anything slow after the first message,
+    such as the encrypted-transmission edits, should be scheduled on the
+    timer wheel by ``send`` rather than awaited, so it holds no slot.
+    """
+
+    def __init__(self, concurrency=5, bucket=None, retries=1, deliverability=None):
+        self.concurrency = concurrency
+        self.deliverability = deliverability
+        self.bucket = bucket or TokenBucket(concurrency * 2, concurrency * 2)
+        self.retries = retries
+        self.stats = {'runs': 0, 'sent': 0, 'closed': 0, 'failed': 0, 'skipped': 0, 'rate_limited': 0}
+
+    async def _token(self):
+        while True:
+            wait = self.bucket.delay(time.monotonic())
+            if wait <= 0:
+                self.bucket.take()
+                return
+            await asyncio.sleep(wait)
+
+    async def run(self, recipients: Iterable, send: Callable[..., Awaitable]) -> FanoutReport:
+        """Call ``send(recipient)`` for every recipient and report the totals"""
+        report = FanoutReport()
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        cache = self.deliverability
+
+        async def deliver(recipient):
+            async with semaphore:
+                for attempt in range(self.retries + 1):
+                    await self._token()
+                    try:
+                        await send(recipient)
+                        report.sent += 1
+                        if cache is not None:
+                            cache.record_success(recipient.id)
+                        return
+                    except discord.Forbidden as e:
+                        report.closed += 1
+                        if cache is not None:
+                            cache.record_failure(recipient.id, e)
+                        return
+                    except discord.RateLimited as e:
+                        # Only raised when the client's max_ratelimit_timeout
+                        # is exceeded; shorter 429s are retried by discord.py
+                        self.stats['rate_limited'] += 1
+                        self.bucket.penalize(e.retry_after)
+                        if attempt < self.retries:
+                            continue
+                        report.failed += 1
+                        logger.error(f"DM to {recipient} failed: {e}")
+                        return
+                    except discord.HTTPException as e:
+                        report.failed += 1
+                        if cache is not None:
+                            cache.record_failure(recipient.id, e)
+                        logger.error(f"DM to {recipient} failed: {e}")
+                        return
+                    except Exception as e:
+                        report.failed += 1
+                        logger.error(f"DM to {recipient} failed: {e}")
+                        return
+
+        pending = []
+        for recipient in recipients:
+            if cache is not None and not cache.deliverable(recipient.id):
+                report.skipped += 1
+            else:
+                pending.append(deliver(recipient))
+        await asyncio.gather(*pending)
+
+        report.elapsed = time.perf_counter() - started
+        self.stats['runs'] += 1
+        self.stats['sent'] += report.sent
+        self.stats['closed'] += report.closed
+        self.stats['failed'] += report.failed
+        self.stats['skipped'] += report.skipped
+        return report
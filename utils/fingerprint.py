@@ -0,0 +1,175 @@
+"""
+Message fingerprinting utilities for Merrywinter Security Consulting Bot
+MinHash signatures with LSH band buckets for near-duplicate detection
+"""
+
+import re
+import random
+import zlib
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+SHINGLE_SIZE = 4
+
+_normalize_pattern = re.compile(r'[\W_]+')
+
+
+def normalize_content(content: str) -> str:
+    """Lowercase content and collapse punctuation/whitespace runs"""
+    return _normalize_pattern.sub(' ', content.lower()).strip()
+
+
+def shingles(content: str) -> set:
+    """Return the set of character shingles of normalized content"""
+    encoded = normalize_content(content).encode('utf-8')
+    if not encoded:
+        return set()
+    if len(encoded) <= SHINGLE_SIZE:
+        return {encoded}
+    return {encoded[i:i + SHINGLE_SIZE] for i in range(len(encoded) - SHINGLE_SIZE + 1)}
+
+
+class MinHasher:
+    """Deterministic MinHash signature generator
+
+    Each hash function is CRC32 with a different seed, which keeps hashing in
+    C and makes signatures comparable across processes.
+    """
+
+    def __init__(self, num_permutations=32, seed=1393349090):
+        rng = random.Random(seed)
+        self.num_permutations = num_permutations
+        self.seeds = [rng.getrandbits(32) for _ in range(num_permutations)]
+
+    def signature(self, content: str) -> Optional[Tuple[int, ...]]:
+        """Compute the MinHash signature of a message, or None if empty"""
+        content_shingles = shingles(content)
+        if not content_shingles:
+            return None
+        crc32 = zlib.crc32
+        return tuple(
+            min(crc32(shingle, seed) for shingle in content_shingles)
+            for seed in self.seeds
+        )
+
+
+def signature_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class FingerprintEntry:
+    """A single fingerprinted message held in the rolling window"""
+
+    __slots__ = ('timestamp', 'user_id', 'channel_id', 'message_id', 'signature', 'band_keys', 'handled',
+                 'escalated')
+
+    def __init__(self, timestamp, user_id, channel_id, message_id, signature, band_keys):
+        self.timestamp = timestamp
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.signature = signature
+        self.band_keys = band_keys
+        self.handled = False
+        self.escalated = False
+
+
+class NearDuplicateIndex:
+    """Rolling per-guild index of MinHash signatures bucketed by LSH bands
+
+    Signatures are split into ``bands`` bands; messages sharing any whole band
+    become candidates and are confirmed by estimated similarity. Buckets are
+    capped, so each insert compares against a bounded number of entries.
+    """
+
+    def __init__(self, window_seconds=30, similarity_threshold=0.5, bands=16, max_bucket_size=64):
+        self.window_seconds = window_seconds
+        self.similarity_threshold = similarity_threshold
+        self.bands = bands
+        self.max_bucket_size = max_bucket_size
+        self._guilds: Dict[int, dict] = {}
+        self._last_sweep = 0.0
+
+    def _get_guild(self, guild_id):
+        """Get or create the window state for a guild"""
+        state = self._guilds.get(guild_id)
+        if state is None:
+            state = {'window': deque(), 'buckets': {}}
+            self._guilds[guild_id] = state
+        return state
+
+    def _band_keys(self, signature):
+        """Split a signature into hashable per-band bucket keys"""
+        rows = len(signature) // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def _expire(self, state, now):
+        """Drop entries that have left the time window"""
+        window = state['window']
+        buckets = state['buckets']
+        cutoff = now - self.window_seconds
+
+        while window and window[0].timestamp <= cutoff:
+            entry = window.popleft()
+            for key in entry.band_keys:
+                bucket = buckets.get(key)
+                if bucket and bucket[0] is entry:
+                    bucket.popleft()
+                    if not bucket:
+                        del buckets[key]
+
+    def _sweep(self, now):
+        """Expire every guild's window and forget guilds left empty"""
+        self._last_sweep = now
+        for guild_id, state in list(self._guilds.items()):
+            self._expire(state, now)
+            if not state['window']:
+                del self._guilds[guild_id]
+
+    def add(self, guild_id, user_id, channel_id, message_id, signature, now) -> List[FingerprintEntry]:
+        """Insert a signature and return the near-duplicate entries it matched
+
+        The returned list includes the new entry itself so callers can reason
+        about the whole cluster.
+        """
+        if now - self._last_sweep > self.window_seconds:
+            self._sweep(now)
+        state = self._get_guild(guild_id)
+        self._expire(state, now)
+
+        entry = FingerprintEntry(now, user_id, channel_id, message_id, signature, self._band_keys(signature))
+        matches = {}
+        checked = set()
+
+        for key in entry.band_keys:
+            bucket = state['buckets'].get(key)
+            if bucket is None:
+                bucket = deque()
+                state['buckets'][key] = bucket
+            else:
+                for candidate in bucket:
+                    if id(candidate) in checked:
+                        continue
+                    checked.add(id(candidate))
+                    if signature_similarity(candidate.signature, signature) >= self.similarity_threshold:
+                        matches[id(candidate)] = candidate
+
+            # The oldest entry is evicted from this band only and still
+            # expires from the window normally.
+            if len(bucket) >= self.max_bucket_size:
+                bucket.popleft()
+            bucket.append(entry)
+
+        state['window'].append(entry)
+
+        cluster = list(matches.values())
+        cluster.append(entry)
+        return cluster
+
+    def stats(self, guild_id):
+        """Return window statistics for a guild"""
+        state = self._guilds.get(guild_id)
+        if not state:
+            return {'entries': 0, 'buckets': 0}
+        return {'entries': len(state['window']), 'buckets': len(state['buckets'])}
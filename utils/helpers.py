@@ -4,11 +4,14 @@ Helper utilities for Merrywinter Security Consulting Bot
 
 import discord
 from config.settings import Config
+from utils.clearance import clearance_cache
 
 def get_user_clearance(roles):
-    """Get user's security clearance level based on roles"""
-    role_names = [role.name for role in roles]
-    return Config.get_security_level(role_names)
+    """Get user's security clearance level from a member or their roles"""
+    if hasattr(roles, 'id'):
+        # A member (or user) rather than a list of roles
+        return clearance_cache.level_for_member(roles)
+    return clearance_cache.level_for_roles(roles)
 
 def create_embed(title, description, color=None):
     """Create a standardized embed"""
@@ -0,0 +1,138 @@
+"""
+Member update utilities for Merrywinter Security Consulting Bot
+Debounces bursts of member updates into one net change per member
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Tuple
+
+from utils.logger import logger
+
+
+class MemberDiff:
+    """Net change to a member over one debounce window"""
+
+    __slots__ = ('member', 'added_roles', 'removed_roles', 'nick_before', 'nick_after', 'updates')
+
+    def __init__(self, member, added_roles, removed_roles, nick_before, nick_after, updates):
+        self.member = member
+        self.added_roles = added_roles
+        self.removed_roles = removed_roles
+        self.nick_before = nick_before
+        self.nick_after = nick_after
+        self.updates = updates
+
+    @property
+    def roles_changed(self) -> bool:
+        return bool(self.added_roles or self.removed_roles)
+
+    @property
+    def nick_changed(self) -> bool:
+        return self.nick_before != self.nick_after
+
+    @property
+    def changed(self) -> bool:
+        return self.roles_changed or self.nick_changed
+
+
+class PendingMemberUpdate:
+    """State before the first update of a burst and the latest member seen"""
+
+    __slots__ = ('before_roles', 'before_nick', 'latest', 'first_seen', 'last_seen', 'updates')
+
+    def __init__(self, before, now):
+        self.before_roles = {role.id: role for role in before.roles}
+        self.before_nick = before.nick
+        self.latest = before
+        self.first_seen = now
+        self.last_seen = now
+        self.updates = 0
+
+
+class MemberUpdateDebouncer:
+    """Merge consecutive member updates into one net diff per member
+
+    Bulk role edits and ``!promote``/``!demote`` fire on_member_update once
+    per role. The first update of a burst records the member's roles and
+    nickname; later ones only replace the latest member. Once no update has
+    arrived for ``window`` seconds (or ``max_delay`` after the first one,
+    whichever comes first) the net difference is passed to ``on_settled``;
+    a role added and removed again within the burst cancels out. Settling is
+    scheduled on the bot's timer wheel, re-armed lazily when it fires early.
+    """
+
+    def __init__(self, timer_wheel, on_settled: Callable, window=2.0, max_delay=10.0):
+        self.timer_wheel = timer_wheel
+        self.on_settled = on_settled
+        self.window = window
+        self.max_delay = max_delay
+        self.pending: Dict[Tuple[int, int], PendingMemberUpdate] = {}
+        self.stats = {'updates': 0, 'settled': 0, 'merged': 0, 'no_change': 0}
+
+    def push(self, before, after):
+        """Buffer one on_member_update"""
+        key = (after.guild.id, after.id)
+        now = asyncio.get_running_loop().time()
+        self.stats['updates'] += 1
+
+        pending = self.pending.get(key)
+        if pending is None:
+            pending = self.pending[key] = PendingMemberUpdate(before, now)
+            self._arm(key, self.window)
+        else:
+            self.stats['merged'] += 1
+
+        pending.latest = after
+        pending.last_seen = now
+        pending.updates += 1
+
+    def _arm(self, key, delay):
+        if self.timer_wheel is None or self.timer_wheel.schedule(delay, self._settle, key,
+                                                                 name='member_update_settle') is None:
+            # No room on the wheel: settle on a plain timer instead
+            asyncio.get_running_loop().call_later(delay, lambda: asyncio.ensure_future(self._settle(key)))
+
+    async def _settle(self, key):
+        pending = self.pending.get(key)
+        if pending is None:
+            return
+
+        now = asyncio.get_running_loop().time()
+        due = min(pending.last_seen + self.window, pending.first_seen + self.max_delay)
+        tick = getattr(self.timer_wheel, 'tick', 0)
+        if due - now > tick:
+            # More updates arrived since this was scheduled
+            self._arm(key, due - now)
+            return
+
+        del self.pending[key]
+        diff = self._diff(pending)
+        if not diff.changed:
+            self.stats['no_change'] += 1
+            return
+
+        self.stats['settled'] += 1
+        try:
+            await self.on_settled(diff)
+        except Exception as e:
+            logger.error(f"Failed to process member update for {diff.member}: {e}")
+
+    @staticmethod
+    def _diff(pending) -> MemberDiff:
+        member = pending.latest
+        after_roles = {role.id: role for role in member.roles}
+        added: List = [role for role_id, role in after_roles.items() if role_id not in pending.before_roles]
+        removed: List = [role for role_id, role in pending.before_roles.items() if role_id not in after_roles]
+        return MemberDiff(member, added, removed, pending.before_nick, member.nick, pending.updates)
+
+    async def flush(self):
+        """Settle everything still buffered (shutdown)"""
+        for key in list(self.pending):
+            pending = self.pending.get(key)
+            if pending is not None:
+                pending.first_seen = pending.last_seen = float('-inf')
+                await self._settle(key)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self.pending)
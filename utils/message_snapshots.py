@@ -0,0 +1,141 @@
+"""
+Message snapshot utilities for Merrywinter Security Consulting Bot
+Compact, byte-bounded cache of recent messages for delete/edit auditing
+"""
+
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+# Rough per-entry cost beyond the content itself (object, slots, dict entry, ints)
+SNAPSHOT_OVERHEAD = 200
+
+
+class MessageSnapshot:
+    """What the audit log needs from a message, and nothing else"""
+
+    __slots__ = ('id', 'author_id', 'author_name', 'channel_id', 'created', 'attachments', 'bot',
+                 '_content', '_compressed')
+
+    def __init__(self, message_id, author_id, author_name, channel_id, created, content=b'', compressed=False,
+                 attachments=0, bot=False):
+        self.id = message_id
+        self.author_id = author_id
+        self.author_name = author_name
+        self.channel_id = channel_id
+        self.created = created
+        self.attachments = attachments
+        self.bot = bot
+        self._content = content
+        self._compressed = compressed
+
+    @property
+    def content(self) -> str:
+        data = zlib.decompress(self._content) if self._compressed else self._content
+        return data.decode('utf-8', errors='replace')
+
+    @property
+    def size(self) -> int:
+        return SNAPSHOT_OVERHEAD + len(self._content) + len(self.author_name)
+
+
+class MessageSnapshotCache:
+    """LRU of MessageSnapshots bounded by an approximate byte budget
+
+    discord.py's own cache keeps whole Message objects for the last N
+    messages, so deletes and edits of anything older arrive as raw events
+    with no content. This cache keeps only id, author, channel, creation
+    time and content truncated to ``max_content`` characters; content of at
+    least ``compress_min`` bytes is zlib-compressed when that saves space.
+    Entries are evicted least recently seen first once the total exceeds
+    ``max_bytes``, so coverage depends on how much text passes through, not
+    on a message count. Bot messages are kept without content so their
+    deletion can be recognised and skipped.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, max_content=1000, compress=True, compress_min=128):
+        self.max_bytes = max_bytes
+        self.max_content = max_content
+        self.compress = compress
+        self.compress_min = compress_min
+        self.entries: 'OrderedDict[int, MessageSnapshot]' = OrderedDict()
+        self.bytes = 0
+        self.stats = {'stored': 0, 'hits': 0, 'misses': 0, 'evicted': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _encode(self, text):
+        raw = text[:self.max_content].encode('utf-8')
+        self.stats['raw_bytes'] += len(raw)
+        if self.compress and len(raw) >= self.compress_min:
+            packed = zlib.compress(raw, 6)
+            if len(packed) < len(raw):
+                self.stats['stored_bytes'] += len(packed)
+                return packed, True
+        self.stats['stored_bytes'] += len(raw)
+        return raw, False
+
+    def snapshot(self, message) -> MessageSnapshot:
+        """Build a snapshot of a discord.Message without caching it"""
+        bot = message.author.bot
+        content, compressed = self._encode('' if bot else message.content or '')
+        return MessageSnapshot(
+            message.id, message.author.id, str(message.author), message.channel.id,
+            message.created_at.timestamp(), content, compressed, len(message.attachments), bot
+        )
+
+    def put(self, message) -> MessageSnapshot:
+        """Snapshot a discord.Message and cache it"""
+        snapshot = self.snapshot(message)
+        self._insert(snapshot)
+        self.stats['stored'] += 1
+        return snapshot
+
+    def _insert(self, snapshot):
+        old = self.entries.pop(snapshot.id, None)
+        if old is not None:
+            self.bytes -= old.size
+        self.entries[snapshot.id] = snapshot
+        self.bytes += snapshot.size
+
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.stats['evicted'] += 1
+
+    def get(self, message_id) -> Optional[MessageSnapshot]:
+        snapshot = self.entries.get(message_id)
+        self.stats['hits' if snapshot else 'misses'] += 1
+        return snapshot
+
+    def pop(self, message_id) -> Optional[MessageSnapshot]:
+        """Remove and return a snapshot (message deleted)"""
+        snapshot = self.entries.pop(message_id, None)
+        if snapshot is None:
+            self.stats['misses'] += 1
+            return None
+        self.bytes -= snapshot.size
+        self.stats['hits'] += 1
+        return snapshot
+
+    def replace_content(self, message_id, text) -> Optional[MessageSnapshot]:
+        """Store edited content; returns the snapshot as it was before the edit"""
+        before = self.get(message_id)
+        if before is None:
+            return None
+        content, compressed = self._encode('' if before.bot else text)
+        self._insert(MessageSnapshot(before.id, before.author_id, before.author_name, before.channel_id,
+                                     before.created, content, compressed, before.attachments, before.bot))
+        return before
+
+    def usage(self) -> dict:
+        """Entries, bytes used and compression ratio"""
+        raw, stored = self.stats['raw_bytes'], self.stats['stored_bytes']
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'compression_ratio': round(raw / stored, 2) if stored else 1.0,
+            'hit_rate': round(self.stats['hits'] / max(1, self.stats['hits'] + self.stats['misses']), 3)
+        }
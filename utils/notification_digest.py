@@ -0,0 +1,85 @@
+"""
+Notification digest utilities for Merrywinter Security Consulting Bot
+Batches low-urgency notifications into one message per target per interval
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List
+
+
+class DigestEntry:
+    """One notification waiting for the next digest"""
+
+    __slots__ = ('title', 'message', 'priority', 'created')
+
+    def __init__(self, title, message, priority, created=None):
+        self.title = title
+        self.message = message
+        self.priority = priority
+        self.created = created or time.time()
+
+
+class PendingDigest:
+    """Notifications collected for one target"""
+
+    __slots__ = ('target', 'entries', 'dropped')
+
+    def __init__(self, target):
+        self.target = target
+        self.entries: List[DigestEntry] = []
+        self.dropped = 0
+
+
+class NotificationDigest:
+    """Collect notifications per target and deliver them together
+
+    The first notification for a target (a channel, or a user for DMs)
+    schedules a flush ``interval`` seconds later on the timer wheel;
+    everything added for that target until then goes out as a single
+    message through ``on_flush(target, entries, dropped)``. At most
+    ``max_entries`` are kept per target; later ones are only counted.
+    """
+
+    def __init__(self, on_flush: Callable, interval=900, timer_wheel=None, max_entries=50):
+        self.on_flush = on_flush
+        self.interval = interval
+        self.timer_wheel = timer_wheel
+        self.max_entries = max_entries
+        self.pending: Dict[tuple, PendingDigest] = {}
+        self.stats = {'queued': 0, 'digests': 0}
+
+    def add(self, key, target, title, message, priority):
+        """Queue a notification for ``target`` (``key`` identifies it, e.g. ('channel', id))"""
+        digest = self.pending.get(key)
+        if digest is None:
+            digest = self.pending[key] = PendingDigest(target)
+            self._arm(key)
+        digest.target = target
+
+        self.stats['queued'] += 1
+        if len(digest.entries) >= self.max_entries:
+            digest.dropped += 1
+        else:
+            digest.entries.append(DigestEntry(title, message, priority))
+
+    def _arm(self, key):
+        if self.timer_wheel is None or self.timer_wheel.schedule(self.interval, self._flush, key,
+                                                                 name='notification_digest') is None:
+            asyncio.get_running_loop().call_later(self.interval, lambda: asyncio.ensure_future(self._flush(key)))
+
+    async def _flush(self, key):
+        digest = self.pending.pop(key, None)
+        if digest is None or not digest.entries:
+            return
+        self.stats['digests'] += 1
+        await self.on_flush(digest.target, digest.entries, digest.dropped)
+
+    async def flush(self):
+        """Deliver everything pending now (shutdown)"""
+        for key in list(self.pending):
+            await self._flush(key)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(digest.entries) + digest.dropped for digest in self.pending.values())
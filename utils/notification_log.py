@@ -0,0 +1,235 @@
+"""
+Notification log utilities for Merrywinter Security Consulting Bot
+Bounded notification history with per-recipient indexes
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import aiofiles
+
+from utils.logger import logger
+
+# Index key for notifications without target users or roles
+BROADCAST = '*'
+
+
+def notification_keys(target_users=None, target_roles=None) -> List[str]:
+    """Index keys for a notification: one per target user and role"""
+    keys = [f"user:{user_id}" for user_id in target_users or []]
+    keys.extend(f"role:{name.lower()}" for name in target_roles or [])
+    return keys or [BROADCAST]
+
+
+class NotificationLog:
+    """Segmented append-only notification history with a small in-memory tail
+
+    Each notification is appended as one JSON line to a numbered segment
+    (``notifications-N.jsonl``) and never rewritten. The last ``ring_size``
+    notifications stay in memory; for everything else only posting lists
+    of (seq, segment, offset, length) are kept per recipient key
+    (``user:<id>``, ``role:<name>``, or ``*`` for broadcasts), rebuilt by
+    reading the segments once on startup. ``recent(keys)`` merges the
+    posting lists of the caller's keys newest first and reads only the
+    entries it returns. Retention deletes whole segments older than
+    ``retention_days`` and trims the posting lists by bisection.
+    """
+
+    def __init__(self, directory='data/notifications', segment_entries=5000, retention_days=30, ring_size=500):
+        self.directory = directory
+        self.segment_entries = segment_entries
+        self.retention_days = retention_days
+
+        self.ring = deque(maxlen=ring_size)
+        self.postings: Dict[str, list] = {}
+
+        # Live segments: file index, first seq, newest timestamp
+        self.segments: List[int] = []
+        self.segment_first: List[int] = []
+        self.segment_last_ts: List[float] = []
+        self.active_count = 0
+        self.active_size = 0
+
+        self.next_seq = 0
+        self.stats = {'appended': 0, 'reads': 0, 'disk_reads': 0, 'pruned_segments': 0}
+        self._last_prune = 0.0
+        self._lock = asyncio.Lock()
+        self._loaded = False
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __len__(self):
+        return self.next_seq - (self.segment_first[0] if self.segment_first else 0)
+
+    def _path(self, index):
+        return os.path.join(self.directory, f"notifications-{index:06d}.jsonl")
+
+    async def load(self, legacy_file: Optional[str] = None):
+        """Rebuild the indexes from disk and import a legacy JSON history once"""
+        async with self._lock:
+            if self._loaded:
+                return
+            indexes = sorted(
+                int(name[14:20]) for name in os.listdir(self.directory)
+                if name.startswith('notifications-') and name.endswith('.jsonl')
+            )
+            for index in indexes:
+                await self._load_segment(index)
+            if not self.segments:
+                self._open_segment(0)
+            self._loaded = True
+
+        if legacy_file and os.path.exists(legacy_file):
+            await self._import_legacy(legacy_file)
+        self._prune_expired()
+        logger.info(f"Notification log loaded {len(self)} entries from {len(self.segments)} segments")
+
+    async def _load_segment(self, index):
+        path = self._path(index)
+        async with aiofiles.open(path, 'rb') as f:
+            data = await f.read()
+
+        self.segments.append(index)
+        self.segment_first.append(self.next_seq)
+        self.segment_last_ts.append(0.0)
+        self.active_count = self.active_size = 0
+
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("partial line")
+                entry = json.loads(line)
+            except ValueError:
+                break
+            self._index(entry, index, offset, len(line))
+            offset += len(line)
+
+        if offset < len(data):
+            # Drop a half-written line so later appends start clean
+            async with aiofiles.open(path, 'r+b') as f:
+                await f.truncate(offset)
+        self.active_size = offset
+
+    def _open_segment(self, index):
+        self.segments.append(index)
+        self.segment_first.append(self.next_seq)
+        self.segment_last_ts.append(time.time())
+        self.active_count = self.active_size = 0
+
+    def _index(self, entry, segment, offset, length):
+        seq = max(self.next_seq, entry.get('seq', self.next_seq))
+        for key in entry.get('keys') or [BROADCAST]:
+            self.postings.setdefault(key, []).append((seq, segment, offset, length))
+        self.ring.append((seq, entry))
+        self.segment_last_ts[-1] = max(self.segment_last_ts[-1], entry.get('ts', 0.0))
+        self.active_count += 1
+        self.next_seq = seq + 1
+
+    async def _import_legacy(self, path):
+        """Move the old whole-file history into the log"""
+        try:
+            async with aiofiles.open(path, 'r') as f:
+                legacy = json.loads(await f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not import legacy notifications from {path}: {e}")
+            return
+        cutoff = time.time() - self.retention_days * 86400 if self.retention_days else 0
+        imported = 0
+        for notification in legacy if isinstance(legacy, list) else []:
+            try:
+                ts = datetime.fromisoformat(notification['timestamp']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if ts < cutoff:
+                continue
+            notification.pop('channel', None)
+            await self.append(notification, ts=ts)
+            imported += 1
+        os.replace(path, f"{path}.imported")
+        logger.info(f"Imported {imported} legacy notifications from {path}")
+
+    async def append(self, notification: dict, ts: Optional[float] = None) -> int:
+        """Append a notification (JSON-serializable) and return its sequence number"""
+        entry = dict(notification)
+        entry['ts'] = ts or time.time()
+        entry['keys'] = notification_keys(entry.get('target_users'), entry.get('target_roles'))
+
+        if not self._loaded:
+            await self.load()
+        async with self._lock:
+            if self.active_count >= self.segment_entries:
+                self._open_segment(self.segments[-1] + 1)
+            entry['seq'] = self.next_seq
+            line = (json.dumps(entry, default=str) + '\n').encode()
+            async with aiofiles.open(self._path(self.segments[-1]), 'ab') as f:
+                await f.write(line)
+            self._index(entry, self.segments[-1], self.active_size, len(line))
+            self.active_size += len(line)
+            self.stats['appended'] += 1
+
+        if entry['ts'] - self._last_prune > 3600:
+            self._prune_expired()
+        return entry['seq']
+
+    def _prune_expired(self):
+        """Delete whole segments whose newest entry is past retention"""
+        self._last_prune = time.time()
+        if not self.retention_days:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        drop = 0
+        # The active segment is never dropped
+        while drop < len(self.segments) - 1 and self.segment_last_ts[drop] < cutoff:
+            try:
+                os.remove(self._path(self.segments[drop]))
+            except FileNotFoundError:
+                pass
+            drop += 1
+        if not drop:
+            return
+
+        del self.segments[:drop], self.segment_last_ts[:drop]
+        del self.segment_first[:drop]
+        first = (self.segment_first[0],)
+        for key in list(self.postings):
+            postings = self.postings[key]
+            del postings[:bisect_left(postings, first)]
+            if not postings:
+                del self.postings[key]
+        self.stats['pruned_segments'] += drop
+        logger.info(f"Notification log dropped {drop} expired segments")
+
+    async def recent(self, keys: Iterable[str], limit=10) -> List[dict]:
+        """Newest notifications indexed under any of ``keys``"""
+        if not self._loaded:
+            await self.load()
+        self.stats['reads'] += 1
+        lists = [reversed(self.postings[key]) for key in set(keys) if key in self.postings]
+        picked, seen = [], set()
+        for posting in heapq.merge(*lists, reverse=True):
+            if posting[0] not in seen:
+                seen.add(posting[0])
+                picked.append(posting)
+                if len(picked) >= limit:
+                    break
+        return [await self._read(posting) for posting in picked]
+
+    async def _read(self, posting) -> dict:
+        seq, segment, offset, length = posting
+        if self.ring and seq >= self.ring[0][0]:
+            cached = self.ring[seq - self.ring[0][0]]
+            if cached[0] == seq:
+                return cached[1]
+        self.stats['disk_reads'] += 1
+        async with aiofiles.open(self._path(segment), 'rb') as f:
+            await f.seek(offset)
+            return json.loads(await f.read(length))
+
@@ -0,0 +1,205 @@
+"""
+Notification scheduler utilities for Merrywinter Security Consulting Bot
+Future-dated delivery, quiet hours and per-user notification preferences
+"""
+
+import asyncio
+import heapq
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.logger import logger
+
+# Lower is more urgent; a user's filter lets through everything up to its rank
+PRIORITY_RANK = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+
+def parse_quiet_hours(text) -> Optional[dict]:
+    """Parse ``"22:00-07:00"`` (UTC) into a quiet_hours setting; None for "off"
+
+    Raises ValueError for anything else.
+    """
+    if text.strip().lower() in ('off', 'none', ''):
+        return None
+    start, end = (part.strip() for part in text.split('-'))
+    for part in (start, end):
+        datetime.strptime(part, '%H:%M')
+    if start == end:
+        raise ValueError("quiet hours must not start and end at the same time")
+    return {'start': start, 'end': end}
+
+
+def _minutes(clock) -> int:
+    hours, minutes = clock.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+class Preference:
+    """Routing settings for one user"""
+
+    __slots__ = ('max_rank', 'enable_dms', 'quiet_start', 'quiet_end')
+
+    def __init__(self, priority_filter='medium', enable_dms=True, quiet_hours=None):
+        self.max_rank = PRIORITY_RANK.get(priority_filter, PRIORITY_RANK['medium'])
+        self.enable_dms = enable_dms
+        self.quiet_start = self.quiet_end = None
+        if quiet_hours:
+            self.quiet_start = _minutes(quiet_hours['start'])
+            self.quiet_end = _minutes(quiet_hours['end'])
+
+    def quiet_until(self, now: datetime) -> Optional[datetime]:
+        """End of the quiet period ``now`` falls in, or None"""
+        if self.quiet_start is None:
+            return None
+        minute = now.hour * 60 + now.minute
+        if self.quiet_start < self.quiet_end:
+            quiet = self.quiet_start <= minute < self.quiet_end
+        else:
+            # Wraps past midnight, e.g. 22:00-07:00
+            quiet = minute >= self.quiet_start or minute < self.quiet_end
+        if not quiet:
+            return None
+        end = now.replace(hour=self.quiet_end // 60, minute=self.quiet_end % 60, second=0, microsecond=0)
+        return end if end > now else end + timedelta(days=1)
+
+
+class PreferenceIndex:
+    """In-memory view of ``user_preferences`` used to route every DM
+
+    Built once from the saved preferences and updated by
+    /notification-settings, so routing a notification to hundreds of users
+    is one pass over a dict. Users without saved preferences receive
+    everything immediately, as before. ``subscribers`` holds the users who
+    saved preferences with DMs enabled; they are DMed notifications aimed
+    at roles they hold.
+    """
+
+    def __init__(self):
+        self.users: Dict[int, Preference] = {}
+        self.subscribers = set()
+
+    def load(self, preferences: Dict):
+        for user_id, settings in (preferences or {}).items():
+            self.update(int(user_id), settings)
+
+    def update(self, user_id, settings):
+        preference = self.users[user_id] = Preference(
+            settings.get('priority_filter', 'medium'),
+            settings.get('enable_dms', True),
+            settings.get('quiet_hours')
+        )
+        if preference.enable_dms:
+            self.subscribers.add(user_id)
+        else:
+            self.subscribers.discard(user_id)
+
+    def route(self, user_ids: Iterable[int], priority, now: Optional[datetime] = None
+              ) -> Tuple[List[int], Dict[datetime, List[int]], int]:
+        """Split recipients into (send now, deferred by release time, filtered out)
+
+        CRITICAL notifications ignore quiet hours but not a disabled DM setting.
+        """
+        now = now or datetime.utcnow()
+        rank = PRIORITY_RANK[priority]
+        immediate, deferred, filtered = [], {}, 0
+        for user_id in user_ids:
+            preference = self.users.get(user_id)
+            if preference is None:
+                immediate.append(user_id)
+            elif not preference.enable_dms or rank > preference.max_rank:
+                filtered += 1
+            else:
+                release = preference.quiet_until(now) if rank else None
+                if release is None:
+                    immediate.append(user_id)
+                else:
+                    deferred.setdefault(release, []).append(user_id)
+        return immediate, deferred, filtered
+
+
+class DeliveryScheduler:
+    """Min-heap of notifications waiting for their delivery time
+
+    ``schedule(due, payload)`` pushes in O(log n); a single task sleeps
+    until the earliest due time (woken early when an earlier entry is
+    pushed), pops everything due and hands each payload to
+    ``on_due(payload)``. Payloads are plain dicts so the pending entries
+    can be saved with ``to_list`` and restored with ``load_list``; entries
+    whose time passed while the bot was down are delivered on start.
+    """
+
+    def __init__(self, on_due: Callable):
+        self.on_due = on_due
+        self.heap: List[tuple] = []
+        self.next_seq = 0
+        self.dirty = False
+        self.stats = {'scheduled': 0, 'delivered': 0, 'failed': 0}
+        self._event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, due: float, payload: dict):
+        """Deliver ``payload`` at epoch time ``due``"""
+        seq = self.next_seq
+        self.next_seq += 1
+        heapq.heappush(self.heap, (due, seq, payload))
+        self.stats['scheduled'] += 1
+        self.dirty = True
+        self._wake(due)
+
+    def _wake(self, due=None):
+        if self._event is None:
+            self._event = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        elif due is None or (self.heap and self.heap[0][0] == due):
+            # New earliest entry: re-arm the sleep
+            self._event.set()
+
+    async def _run(self):
+        while True:
+            try:
+                timeout = self.heap[0][0] - time.time() if self.heap else None
+                if timeout is None or timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._event.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._event.clear()
+
+                now = time.time()
+                while self.heap and self.heap[0][0] <= now:
+                    payload = heapq.heappop(self.heap)[2]
+                    self.dirty = True
+                    try:
+                        await self.on_due(payload)
+                        self.stats['delivered'] += 1
+                    except Exception as e:
+                        self.stats['failed'] += 1
+                        logger.error(f"Scheduled notification failed: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification scheduler error: {e}")
+                await asyncio.sleep(5)
+
+    def to_list(self) -> List[dict]:
+        self.dirty = False
+        return [{'due': due, 'payload': payload} for due, _, payload in sorted(self.heap)]
+
+    def load_list(self, entries):
+        for entry in entries or []:
+            seq = self.next_seq
+            self.next_seq += 1
+            self.heap.append((entry['due'], seq, entry['payload']))
+        heapq.heapify(self.heap)
+        if self.heap:
+            self._wake()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
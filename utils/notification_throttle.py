@@ -0,0 +1,122 @@
+"""
+Notification throttling utilities for Merrywinter Security Consulting Bot
+Per-rule cooldowns and burst limits with suppressed-alert summaries
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict
+
+# Applied to rules missing from the configuration
+DEFAULT_RULE = {'cooldown': 60, 'burst': 10, 'window': 60}
+
+
+class ThrottleRule:
+    """Limits for one kind of automatic notification"""
+
+    __slots__ = ('name', 'cooldown', 'burst', 'window')
+
+    def __init__(self, name, cooldown=60, burst=10, window=60):
+        self.name = name
+        # Seconds between two notifications for the same key (channel, member...)
+        self.cooldown = cooldown
+        # Notifications per ``window`` seconds for the rule as a whole
+        self.burst = burst
+        self.window = window
+
+
+class Suppressed:
+    """Alerts held back for one rule since its last summary"""
+
+    __slots__ = ('count', 'keys', 'title', 'priority', 'since')
+
+    def __init__(self, title, priority, now):
+        self.count = 0
+        self.keys = set()
+        self.title = title
+        self.priority = priority
+        self.since = now
+
+
+class NotificationThrottle:
+    """Decide in O(1) whether an automatic notification may go out
+
+    Every rule has a cooldown per key and a burst limit for the rule as a
+    whole: an excited channel repeating "urgent" is held by the cooldown on
+    that channel, and a raid (a different member per alert) by the burst.
+    Suppressed alerts cost a couple of dict operations and no API call.
+    They are counted, and ``window`` seconds after the first one a single
+    summary is handed to ``on_summary(rule, suppressed)`` (scheduled on the
+    timer wheel), so a flood produces at most one summary per rule per
+    window.
+    """
+
+    def __init__(self, rules: Dict[str, dict], on_summary: Callable, timer_wheel=None, max_keys=10000):
+        self.rules = {name: ThrottleRule(name, **limits) for name, limits in (rules or {}).items()}
+        self.on_summary = on_summary
+        self.timer_wheel = timer_wheel
+        self.max_keys = max_keys
+        self.last_sent: Dict[tuple, float] = {}
+        self.recent: Dict[str, list] = {}
+        self.suppressed: Dict[str, Suppressed] = {}
+        self.stats = {'allowed': 0, 'suppressed': 0, 'summaries': 0}
+
+    def rule(self, name) -> ThrottleRule:
+        rule = self.rules.get(name)
+        if rule is None:
+            rule = self.rules[name] = ThrottleRule(name, **DEFAULT_RULE)
+        return rule
+
+    def allow(self, rule_name, key=None, title='', priority='medium', now=None) -> bool:
+        """Count one alert; True if it should be sent"""
+        rule = self.rule(rule_name)
+        now = now or time.monotonic()
+
+        last = self.last_sent.get((rule_name, key))
+        recent = self.recent.setdefault(rule_name, [0.0, 0])
+        if now - recent[0] >= rule.window:
+            recent[0], recent[1] = now, 0
+
+        if (last is not None and now - last < rule.cooldown) or recent[1] >= rule.burst:
+            self._suppress(rule, key, title, priority, now)
+            return False
+
+        recent[1] += 1
+        if len(self.last_sent) >= self.max_keys:
+            self._prune(now)
+        self.last_sent[(rule_name, key)] = now
+        self.stats['allowed'] += 1
+        return True
+
+    def _suppress(self, rule, key, title, priority, now):
+        self.stats['suppressed'] += 1
+        held = self.suppressed.get(rule.name)
+        if held is None:
+            held = self.suppressed[rule.name] = Suppressed(title, priority, now)
+            self._arm(rule.name, rule.window)
+        held.count += 1
+        if len(held.keys) < 50:
+            held.keys.add(key)
+
+    def _arm(self, rule_name, delay):
+        if self.timer_wheel is None or self.timer_wheel.schedule(delay, self._summarize, rule_name,
+                                                                 name='notification_summary') is None:
+            asyncio.get_running_loop().call_later(delay, lambda: asyncio.ensure_future(self._summarize(rule_name)))
+
+    async def _summarize(self, rule_name):
+        held = self.suppressed.pop(rule_name, None)
+        if held is None or not held.count:
+            return
+        self.stats['summaries'] += 1
+        await self.on_summary(rule_name, held)
+
+    def _prune(self, now):
+        """Forget keys whose cooldown has passed"""
+        for (rule_name, key), sent in list(self.last_sent.items()):
+            if now - sent >= self.rule(rule_name).cooldown:
+                del self.last_sent[(rule_name, key)]
+
+    async def flush(self):
+        """Emit every pending summary now (shutdown)"""
+        for rule_name in list(self.suppressed):
+            await self._summarize(rule_name)
@@ -0,0 +1,241 @@
+"""
+Outbound delivery utilities for Merrywinter Security Consulting Bot
+Priority-ordered channel sends paced by per-route token buckets
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, Optional
+
+import discord
+
+from utils.logger import logger
+
+PRIORITY_RANKS = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+PRIORITY_NAMES = {rank: name for name, rank in PRIORITY_RANKS.items()}
+
+# Returned by send() when delivery failed and the message went to the spool
+SPOOLED = object()
+
+
+def is_permanent_failure(error) -> bool:
+    """Client errors (4xx other than 429) fail the same way on every retry"""
+    return isinstance(error, discord.HTTPException) and 400 <= error.status < 500 and error.status != 429
+
+
+class TokenBucket:
+    """Token bucket approximating one Discord rate-limit route"""
+
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def delay(self, now) -> float:
+        """Seconds until a token is available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def penalize(self, retry_after):
+        """Empty the bucket for ``retry_after`` seconds after a 429"""
+        self.tokens = min(self.tokens, 0.0) - retry_after * self.rate
+
+
+class OutboundMessage:
+    """A queued channel send"""
+
+    __slots__ = ('rank', 'seq', 'kwargs', 'future', 'enqueued', 'durable')
+
+    def __init__(self, rank, seq, kwargs, future, enqueued, durable=False):
+        self.rank = rank
+        self.seq = seq
+        self.kwargs = kwargs
+        self.future = future
+        self.enqueued = enqueued
+        self.durable = durable
+
+    def __lt__(self, other):
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class ChannelQueue:
+    """Pending sends and rate-limit state for one channel"""
+
+    __slots__ = ('channel', 'heap', 'bucket', 'task')
+
+    def __init__(self, channel, bucket):
+        self.channel = channel
+        self.heap = []
+        self.bucket = bucket
+        self.task: Optional[asyncio.Task] = None
+
+
+class OutboundScheduler:
+    """Per-channel priority queues drained within Discord's rate limits
+
+    Messages are held here instead of being handed straight to the HTTP
+    client, which would serve them in arrival order. Each channel has a
+    heap ordered by priority (critical > high > medium > low, FIFO within a
+    level) and a token bucket modelling the per-channel send route; a global
+    bucket models the bot-wide limit. A worker per busy channel sends the
+    most urgent message whenever both buckets have a token, so a critical
+    alert overtakes a logging flood. When a channel queue is full the least
+    urgent, newest message is dropped.
+
+    Durable messages that fail with a transient error go to ``spool`` (a
+    DeliverySpool) instead of being lost. While a channel has a spooled
+    backlog, its durable messages are spooled behind it so they are not
+    delivered ahead of older ones.
+    """
+
+    def __init__(self, channel_burst=5, channel_rate=1.0, global_rate=45.0, max_queue=200, spool=None):
+        self.spool = spool
+        self.channel_burst = channel_burst
+        self.channel_rate = channel_rate
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.max_queue = max_queue
+        self.channels: Dict[int, ChannelQueue] = {}
+        self._seq = itertools.count()
+        self.stats = {priority: {'sent': 0, 'failed': 0, 'dropped': 0, 'spooled': 0, 'max_wait_ms': 0.0}
+                      for priority in PRIORITY_RANKS}
+
+    def queue_depth(self, channel_id=None) -> int:
+        """Messages waiting, for one channel or overall"""
+        if channel_id is not None:
+            queue = self.channels.get(channel_id)
+            return len(queue.heap) if queue else 0
+        return sum(len(queue.heap) for queue in self.channels.values())
+
+    def submit(self, channel, priority='medium', durable=False, **kwargs) -> Optional[asyncio.Future]:
+        """Queue ``channel.send(**kwargs)`` without waiting for delivery"""
+        return self._enqueue(channel, priority, kwargs, None, durable)
+
+    async def send(self, channel, priority='medium', durable=False, **kwargs):
+        """Queue a send and wait for it
+
+        Returns the sent message, None if it was dropped, or ``SPOOLED`` if it
+        was handed to the spool for later delivery.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(channel, priority, kwargs, future, durable)
+        return await future
+
+    def _enqueue(self, channel, priority, kwargs, future, durable=False):
+        rank = PRIORITY_RANKS.get(priority, PRIORITY_RANKS['medium'])
+        queue = self.channels.get(channel.id)
+        if queue is None:
+            queue = self.channels[channel.id] = ChannelQueue(channel, TokenBucket(self.channel_burst, self.channel_rate))
+        queue.channel = channel
+
+        item = OutboundMessage(rank, next(self._seq), kwargs, future, time.monotonic(), durable)
+        heapq.heappush(queue.heap, item)
+
+        if len(queue.heap) > self.max_queue:
+            # Evict the least urgent, most recent message
+            victim = max(queue.heap)
+            queue.heap.remove(victim)
+            heapq.heapify(queue.heap)
+            self._resolve(victim, None)
+            self.stats[PRIORITY_NAMES[victim.rank]]['dropped'] += 1
+
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.get_running_loop().create_task(self._drain(queue))
+        return future
+
+    @staticmethod
+    def _resolve(item, result, error=None):
+        if item.future is None or item.future.done():
+            return
+        if error is not None:
+            item.future.set_exception(error)
+        else:
+            item.future.set_result(result)
+
+    async def _drain(self, queue):
+        """Send queued messages for one channel as tokens allow"""
+        while queue.heap:
+            if self._must_spool(queue, queue.heap[0]):
+                await self._spool(queue, heapq.heappop(queue.heap))
+                continue
+
+            now = time.monotonic()
+            wait = max(queue.bucket.delay(now), self.global_bucket.delay(now))
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            queue.bucket.take()
+            self.global_bucket.take()
+            item = heapq.heappop(queue.heap)
+            stats = self.stats[PRIORITY_NAMES[item.rank]]
+            stats['max_wait_ms'] = max(stats['max_wait_ms'], round((now - item.enqueued) * 1000, 1))
+
+            try:
+                message = await queue.channel.send(**item.kwargs)
+                stats['sent'] += 1
+                self._resolve(item, message)
+            except Exception as e:
+                if isinstance(e, discord.RateLimited):
+                    # Only raised past the client's max_ratelimit_timeout
+                    queue.bucket.penalize(e.retry_after)
+                # A rejected message (bad embed, missing access) would block
+                # the channel's spool forever, so only transient errors spool
+                if item.durable and self.spool is not None and not is_permanent_failure(e):
+                    await self._spool(queue, item)
+                    continue
+                stats['failed'] += 1
+                if item.future is None:
+                    logger.error(f"Outbound send to #{getattr(queue.channel, 'name', queue.channel.id)} failed: {e}")
+                self._resolve(item, None, e)
+
+    def _must_spool(self, queue, item):
+        """Durable messages queue behind an existing spooled backlog"""
+        return item.durable and self.spool is not None and self.spool.has_backlog(queue.channel.id)
+
+    async def _spool(self, queue, item):
+        """Hand a durable message to the spool"""
+        priority = PRIORITY_NAMES[item.rank]
+        if await self.spool.put(queue.channel.id, priority, item.kwargs):
+            self.stats[priority]['spooled'] += 1
+            self._resolve(item, SPOOLED)
+        else:
+            self.stats[priority]['failed'] += 1
+            self._resolve(item, None)
+
+
+# Fallback sends started by post(), held so they are not garbage collected
+_background_sends = set()
+
+
+def _finish_background_send(task):
+    _background_sends.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background send failed: {task.exception()}")
+
+
+def post(bot, channel, priority='medium', durable=False, **kwargs):
+    """Queue a send without waiting for it, for alerts raised in event handlers"""
+    outbound = getattr(bot, 'outbound', None)
+    if outbound is not None:
+        outbound.submit(channel, priority, durable=durable, **kwargs)
+        return
+    task = asyncio.get_running_loop().create_task(channel.send(**kwargs))
+    _background_sends.add(task)
+    task.add_done_callback(_finish_background_send)
+
+
+async def deliver(bot, channel, priority='medium', durable=False, **kwargs):
+    """Send through the bot's outbound scheduler when it has one"""
+    outbound = getattr(bot, 'outbound', None)
+    if outbound is None:
+        return await channel.send(**kwargs)
+    return await outbound.send(channel, priority, durable=durable, **kwargs)
@@ -0,0 +1,276 @@
+"""
+Punishment scheduling utilities for Merrywinter Security Consulting Bot
+Persistent expirations for moderation timeouts
+"""
+
+import asyncio
+import heapq
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import discord
+
+from utils.logger import logger
+
+# Actions understood by the scheduler
+TIMEOUT_EXPIRY = 'timeout'
+
+
+class PendingPunishment:
+    """A moderation restriction waiting to expire"""
+
+    __slots__ = ('id', 'due', 'guild_id', 'user_id', 'action', 'reason', 'attempts')
+
+    def __init__(self, entry_id, due, guild_id, user_id, action, reason=None, attempts=0):
+        self.id = entry_id
+        self.due = due
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.action = action
+        self.reason = reason
+        self.attempts = attempts
+
+    def to_record(self):
+        """Journal record that recreates this entry"""
+        return {
+            'op': 'add',
+            'id': self.id,
+            'due': self.due,
+            'guild_id': self.guild_id,
+            'user_id': self.user_id,
+            'action': self.action,
+            'reason': self.reason,
+            'attempts': self.attempts
+        }
+
+
+class PunishmentScheduler:
+    """Heap of pending expirations backed by an append-only journal
+
+    Every change is journaled before it takes effect in memory: ``add`` when
+    a restriction is scheduled, ``reschedule`` after a transient failure and
+    ``done``/``cancel`` once it no longer needs to fire. On startup the
+    journal is replayed, so anything not marked done fires (late, if it was
+    due while offline). When a timeout expires it is recorded in the audit
+    store and moderation log, unless the member's timeout was extended in the
+    meantime. A crash between firing and journaling ``done`` can at worst
+    report an expiry twice.
+    """
+
+    def __init__(self, storage, batch_size=25, max_attempts=5, idle_poll=60, compact_threshold=500):
+        self.storage = storage
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.idle_poll = idle_poll
+        self.compact_threshold = compact_threshold
+        self.heap = []
+        self.entries: Dict[str, PendingPunishment] = {}
+        # user_id -> {guild_id: pending entries}, so has_pending is O(1)
+        self.pending_users: Dict[int, Dict[int, int]] = {}
+        self.stats = {'scheduled': 0, 'fired': 0, 'retried': 0, 'failed': 0, 'cancelled': 0}
+        self._loaded = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self):
+        """Replay the journal and compact it when it has grown"""
+        records = await self.storage.load_scheduled_punishment_records()
+
+        entries = {}
+        for record in records:
+            op = record.get('op')
+            if op == 'add':
+                entries[record['id']] = PendingPunishment(
+                    record['id'], record['due'], record['guild_id'], record['user_id'],
+                    record['action'], record.get('reason'), record.get('attempts', 0)
+                )
+            elif op == 'reschedule' and record['id'] in entries:
+                entries[record['id']].due = record['due']
+                entries[record['id']].attempts = record.get('attempts', 0)
+            elif op in ('done', 'cancel'):
+                entries.pop(record['id'], None)
+
+        # Keep anything scheduled before the load finished
+        entries.update(self.entries)
+        self.entries = {}
+        self.pending_users = {}
+        for entry in entries.values():
+            self._add(entry)
+        self.heap = [(entry.due, entry.id) for entry in entries.values()]
+        heapq.heapify(self.heap)
+        self._loaded = True
+
+        if len(records) > len(entries) + self.compact_threshold:
+            await self.storage.rewrite_scheduled_punishment_records([entry.to_record() for entry in entries.values()])
+
+        logger.info(f"Loaded {len(entries)} scheduled punishments")
+
+    async def schedule(self, guild_id, user_id, action, delay, reason=None) -> str:
+        """Schedule ``action`` for a member ``delay`` seconds from now"""
+        entry = PendingPunishment(uuid.uuid4().hex[:12], time.time() + delay, guild_id, user_id,
+                                  action, reason)
+        await self.storage.append_scheduled_punishment_records([entry.to_record()])
+
+        self._add(entry)
+        heapq.heappush(self.heap, (entry.due, entry.id))
+        self.stats['scheduled'] += 1
+        self._wakeup.set()
+        return entry.id
+
+    async def cancel(self, guild_id, user_id, action=None) -> int:
+        """Cancel pending expirations for a member, optionally of one action type"""
+        if guild_id not in self.pending_users.get(user_id, ()):
+            return 0
+        matches = [
+            entry for entry in self.entries.values()
+            if entry.guild_id == guild_id and entry.user_id == user_id and (action is None or entry.action == action)
+        ]
+        if not matches:
+            return 0
+
+        await self.storage.append_scheduled_punishment_records([{'op': 'cancel', 'id': entry.id} for entry in matches])
+        for entry in matches:
+            # Heap items are dropped lazily when popped; a concurrent cancel
+            # may already have removed the entry
+            self._remove(entry.id)
+
+        self.stats['cancelled'] += len(matches)
+        return len(matches)
+
+    def pending_count(self, guild_id=None, action=None) -> int:
+        """Number of pending expirations"""
+        return sum(
+            1 for entry in self.entries.values()
+            if (guild_id is None or entry.guild_id == guild_id) and (action is None or entry.action == action)
+        )
+
+    def has_pending(self, user_id, guild_id=None) -> bool:
+        """Whether a member has any restriction waiting to expire"""
+        guilds = self.pending_users.get(user_id)
+        if not guilds:
+            return False
+        return guild_id is None or guild_id in guilds
+
+    def _add(self, entry: PendingPunishment):
+        self.entries[entry.id] = entry
+        guilds = self.pending_users.setdefault(entry.user_id, {})
+        guilds[entry.guild_id] = guilds.get(entry.guild_id, 0) + 1
+
+    def _remove(self, entry_id):
+        """Forget an entry; a no-op when it is already gone"""
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return
+        guilds = self.pending_users[entry.user_id]
+        guilds[entry.guild_id] -= 1
+        if not guilds[entry.guild_id]:
+            del guilds[entry.guild_id]
+            if not guilds:
+                del self.pending_users[entry.user_id]
+
+    def start(self, bot):
+        """Start the background firing loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(bot))
+
+    def stop(self):
+        """Stop the background firing loop"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _pop_due(self, now) -> List[PendingPunishment]:
+        """Pop up to one batch of due entries, skipping stale heap items"""
+        batch = []
+        while self.heap and self.heap[0][0] <= now and len(batch) < self.batch_size:
+            due, entry_id = heapq.heappop(self.heap)
+            entry = self.entries.get(entry_id)
+            if entry is not None and entry.due == due:
+                batch.append(entry)
+        return batch
+
+    async def _run(self, bot):
+        """Fire due entries in batches, sleeping until the next deadline"""
+        await bot.wait_until_ready()
+        if not self._loaded:
+            await self.load()
+
+        while True:
+            try:
+                batch = self._pop_due(time.time())
+                if batch:
+                    await self._fire_batch(bot, batch)
+                    continue
+
+                timeout = self.heap[0][0] - time.time() if self.heap else self.idle_poll
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, min(timeout, self.idle_poll)))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Punishment scheduler error: {e}")
+                await asyncio.sleep(5)
+
+    async def _fire_batch(self, bot, batch):
+        """Execute a batch concurrently and journal the outcomes in one write"""
+        results = await asyncio.gather(*(self._execute(bot, entry) for entry in batch), return_exceptions=True)
+
+        records = []
+        now = time.time()
+        for entry, result in zip(batch, results):
+            if self.entries.get(entry.id) is not entry:
+                # Cancelled (e.g. /untimeout) while the batch ran; already journaled
+                continue
+            if result is True:
+                records.append({'op': 'done', 'id': entry.id})
+                self._remove(entry.id)
+                self.stats['fired'] += 1
+            elif entry.attempts + 1 >= self.max_attempts:
+                logger.error(f"Giving up on {entry.action} for user {entry.user_id} after {entry.attempts + 1} attempts")
+                records.append({'op': 'done', 'id': entry.id, 'failed': True})
+                self._remove(entry.id)
+                self.stats['failed'] += 1
+            else:
+                entry.attempts += 1
+                entry.due = now + min(300, 2 ** entry.attempts * 5)
+                records.append({'op': 'reschedule', 'id': entry.id, 'due': entry.due, 'attempts': entry.attempts})
+                heapq.heappush(self.heap, (entry.due, entry.id))
+                self.stats['retried'] += 1
+
+        if records:
+            await self.storage.append_scheduled_punishment_records(records)
+
+    async def _execute(self, bot, entry) -> bool:
+        """Apply one expiration; False means retry later"""
+        guild = bot.get_guild(entry.guild_id)
+        member = guild.get_member(entry.user_id) if guild else None
+        if member is None:
+            # Left the server (or the guild is gone); nothing to report
+            return True
+
+        try:
+            if entry.action != TIMEOUT_EXPIRY:
+                logger.warning(f"Dropping scheduled punishment with unknown action {entry.action!r}")
+                return True
+
+            until = member.timed_out_until
+            if until and until > datetime.now(timezone.utc):
+                # Timeout was extended after scheduling; not over yet
+                return True
+            if hasattr(bot, 'log_moderation_action'):
+                await bot.log_moderation_action(member, "TIMEOUT EXPIRED", entry.reason or "No reason recorded", guild)
+            logger.info(f"Timeout expired for {member} ({entry.reason})")
+            return True
+        except discord.NotFound:
+            return True
+        except discord.Forbidden:
+            logger.error(f"No permission to process {entry.action} expiry for {member}")
+            return True
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to process {entry.action} expiry for {member}: {e}")
+            return False
@@ -0,0 +1,148 @@
+"""
+Raid detection utilities for Merrywinter Security Consulting Bot
+Per-guild sliding windows of member joins with incremental counters
+"""
+
+import re
+from collections import deque, Counter
+from typing import Dict, List, Optional
+
+_name_pattern = re.compile(r'[^a-z]+')
+
+
+def username_key(name: str) -> Optional[str]:
+    """Reduce a username to its letter skeleton ("Raider_0042" -> "raider")"""
+    key = _name_pattern.sub('', name.lower())
+    return key if len(key) >= 3 else None
+
+
+class JoinRecord:
+    """A single member join held in the detection window"""
+
+    __slots__ = ('timestamp', 'user_id', 'account_age', 'name_key', 'is_new')
+
+    def __init__(self, timestamp, user_id, account_age, name_key, is_new):
+        self.timestamp = timestamp
+        self.user_id = user_id
+        self.account_age = account_age
+        self.name_key = name_key
+        self.is_new = is_new
+
+
+class GuildJoinWindow:
+    """Join window for one guild; counters are updated on append and expiry"""
+
+    __slots__ = ('joins', 'new_accounts', 'name_counts', 'last_triggered', 'last_reasons', 'total_triggers')
+
+    def __init__(self):
+        self.joins = deque()
+        self.new_accounts = 0
+        self.name_counts = Counter()
+        self.last_triggered = None
+        self.last_reasons = []
+        self.total_triggers = 0
+
+
+class JoinBurstDetector:
+    """Detect join raids by rate, share of new accounts and similar usernames
+
+    Every join is appended once and expired once, so maintaining the window
+    and evaluating all three signals is O(1) amortized per join.
+    """
+
+    def __init__(self, window_seconds, join_threshold, new_account_age_days=7,
+                 new_account_ratio=0.6, new_account_min_joins=5,
+                 similar_name_threshold=4, cooldown_seconds=300):
+        self.window_seconds = window_seconds
+        self.join_threshold = join_threshold
+        self.new_account_age = new_account_age_days * 86400
+        self.new_account_ratio = new_account_ratio
+        self.new_account_min_joins = new_account_min_joins
+        self.similar_name_threshold = similar_name_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._guilds: Dict[int, GuildJoinWindow] = {}
+
+    def _get_window(self, guild_id) -> GuildJoinWindow:
+        """Get or create the join window for a guild"""
+        window = self._guilds.get(guild_id)
+        if window is None:
+            window = GuildJoinWindow()
+            self._guilds[guild_id] = window
+        return window
+
+    def _expire(self, window: GuildJoinWindow, now):
+        """Drop joins that have left the time window"""
+        cutoff = now - self.window_seconds
+        joins = window.joins
+
+        while joins and joins[0].timestamp <= cutoff:
+            record = joins.popleft()
+            if record.is_new:
+                window.new_accounts -= 1
+            if record.name_key:
+                window.name_counts[record.name_key] -= 1
+                if window.name_counts[record.name_key] <= 0:
+                    del window.name_counts[record.name_key]
+
+    def record_join(self, guild_id, user_id, username, account_age, now) -> List[str]:
+        """Record a join and return the raid signals it triggered (if any)
+
+        ``account_age`` is in seconds; ``now`` is a monotonic timestamp.
+        """
+        window = self._get_window(guild_id)
+        self._expire(window, now)
+
+        record = JoinRecord(now, user_id, account_age, username_key(username), account_age < self.new_account_age)
+        window.joins.append(record)
+        if record.is_new:
+            window.new_accounts += 1
+        if record.name_key:
+            window.name_counts[record.name_key] += 1
+
+        reasons = []
+        join_count = len(window.joins)
+
+        if join_count >= self.join_threshold:
+            reasons.append('join_rate')
+
+        if (join_count >= self.new_account_min_joins and
+                window.new_accounts / join_count >= self.new_account_ratio):
+            reasons.append('new_accounts')
+
+        if record.name_key and window.name_counts[record.name_key] >= self.similar_name_threshold:
+            reasons.append('similar_names')
+
+        if not reasons:
+            return []
+
+        # Only report once per cooldown so a single raid doesn't re-trigger
+        # the lockdown on every subsequent join.
+        if window.last_triggered is not None and now - window.last_triggered < self.cooldown_seconds:
+            return []
+
+        window.last_triggered = now
+        window.last_reasons = reasons
+        window.total_triggers += 1
+        return reasons
+
+    def snapshot(self, guild_id, now) -> dict:
+        """Return the current detector state for a guild"""
+        window = self._get_window(guild_id)
+        self._expire(window, now)
+
+        join_count = len(window.joins)
+        top_name = window.name_counts.most_common(1)
+
+        return {
+            'joins': join_count,
+            'join_threshold': self.join_threshold,
+            'window_seconds': self.window_seconds,
+            'new_accounts': window.new_accounts,
+            'new_account_ratio': window.new_accounts / join_count if join_count else 0.0,
+            'top_name': top_name[0] if top_name else None,
+            'last_triggered_ago': now - window.last_triggered if window.last_triggered is not None else None,
+            'last_reasons': list(window.last_reasons),
+            'total_triggers': window.total_triggers,
+            'cooling_down': (window.last_triggered is not None and
+                             now - window.last_triggered < self.cooldown_seconds)
+        }
@@ -0,0 +1,123 @@
+"""
+Roster utilities for Merrywinter Security Consulting Bot
+Live index of members by clearance tier and by role
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from utils.clearance import clearance_cache
+
+
+class RosterIndex:
+    """Clearance tier -> member IDs and role ID -> member IDs for one guild
+
+    Filled once from the member cache and then kept current from member
+    join, leave and update events, so roster and DM targeting queries cost
+    the size of the answer rather than a pass over ``guild.members`` with a
+    clearance lookup per member. Bots are not indexed. Role lists from
+    Config are names; ``role_ids`` resolves them against the guild's roles
+    at query time, so renaming a role never leaves the index stale.
+    """
+
+    def __init__(self):
+        self.guild_id = None
+        self.tiers: Dict[str, Set[int]] = {}
+        self.by_role: Dict[int, Set[int]] = {}
+        self.members: Dict[int, Tuple[str, FrozenSet[int]]] = {}
+
+    @classmethod
+    def from_guild(cls, guild) -> 'RosterIndex':
+        index = cls()
+        index.rebuild(guild)
+        return index
+
+    def __len__(self):
+        return len(self.members)
+
+    def rebuild(self, guild):
+        """Index every cached member of a guild from scratch"""
+        self.guild_id = guild.id
+        self.tiers.clear()
+        self.by_role.clear()
+        self.members.clear()
+        for member in guild.members:
+            self.add(member)
+
+    def add(self, member):
+        """Index a member (joined, or roles changed)"""
+        if member.bot:
+            return
+        if member.id in self.members:
+            self.remove(member.id)
+
+        tier = clearance_cache.level_for_member(member)
+        role_ids = frozenset(role.id for role in member.roles)
+        self.members[member.id] = (tier, role_ids)
+        self.tiers.setdefault(tier, set()).add(member.id)
+        for role_id in role_ids:
+            self.by_role.setdefault(role_id, set()).add(member.id)
+
+    def remove(self, member_id):
+        """Drop a member from the index (left the guild)"""
+        entry = self.members.pop(member_id, None)
+        if entry is None:
+            return
+        tier, role_ids = entry
+        self._discard(self.tiers, tier, member_id)
+        for role_id in role_ids:
+            self._discard(self.by_role, role_id, member_id)
+
+    def update(self, member):
+        """Re-index a member if their roles changed"""
+        entry = self.members.get(member.id)
+        if entry is None or entry[1] != frozenset(role.id for role in member.roles):
+            self.add(member)
+
+    @staticmethod
+    def _discard(index, key, member_id):
+        members = index.get(key)
+        if members is not None:
+            members.discard(member_id)
+            if not members:
+                del index[key]
+
+    def tier(self, level) -> Set[int]:
+        """IDs of members whose clearance is exactly ``level``"""
+        return self.tiers.get(level, set())
+
+    def tier_counts(self) -> Dict[str, int]:
+        return {level: len(members) for level, members in self.tiers.items()}
+
+    @staticmethod
+    def role_ids(guild, role_names: Iterable[str]) -> List[int]:
+        """IDs of the guild roles with any of these names (case-insensitive)"""
+        wanted = {name.lower() for name in role_names if name}
+        return [role.id for role in guild.roles if role.name.lower() in wanted]
+
+    def with_roles(self, role_ids: Iterable[int]) -> Set[int]:
+        """IDs of members holding at least one of these roles"""
+        result = set()
+        for role_id in role_ids:
+            result |= self.by_role.get(role_id, set())
+        return result
+
+    def with_role_names(self, guild, role_names: Iterable[str]) -> Set[int]:
+        """IDs of members holding at least one role with one of these names"""
+        return self.with_roles(self.role_ids(guild, role_names))
+
+    def resolve(self, guild, member_ids: Iterable[int]) -> List:
+        """Member objects for IDs still in the guild's cache"""
+        members = []
+        for member_id in member_ids:
+            member = guild.get_member(member_id)
+            if member is not None:
+                members.append(member)
+        return members
+
+
+def guild_roster(bot, guild) -> RosterIndex:
+    """The bot's live roster for ``guild``, or a one-off index if it has none"""
+    roster = getattr(bot, 'roster', None)
+    if roster is None or roster.guild_id != guild.id:
+        roster = RosterIndex.from_guild(guild)
+    return roster
@@ -0,0 +1,320 @@
+"""
+Delivery spool utilities for Merrywinter Security Consulting Bot
+Segmented append-only on-disk spool for messages that could not be delivered
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import aiofiles
+import discord
+
+from utils.logger import logger
+from utils.outbound import is_permanent_failure
+
+
+def serialize_payload(kwargs) -> Optional[dict]:
+    """Convert send() keyword arguments to JSON, or None if unsupported"""
+    payload = {}
+    for key, value in kwargs.items():
+        if key == 'content':
+            payload['content'] = value
+        elif key == 'embed' and value is not None:
+            payload['embeds'] = payload.get('embeds', []) + [value.to_dict()]
+        elif key == 'embeds' and value:
+            payload['embeds'] = payload.get('embeds', []) + [embed.to_dict() for embed in value]
+        elif value is not None:
+            return None
+    return payload
+
+
+def deserialize_payload(payload) -> dict:
+    """Rebuild send() keyword arguments from a spooled payload"""
+    kwargs = {}
+    if payload.get('content'):
+        kwargs['content'] = payload['content']
+    if payload.get('embeds'):
+        kwargs['embeds'] = [discord.Embed.from_dict(data) for data in payload['embeds']]
+    return kwargs
+
+
+class SpoolRecord:
+    """An undelivered message held in the spool"""
+
+    __slots__ = ('seq', 'segment', 'channel_id', 'priority', 'payload')
+
+    def __init__(self, seq, segment, channel_id, priority, payload):
+        self.seq = seq
+        self.segment = segment
+        self.channel_id = channel_id
+        self.priority = priority
+        self.payload = payload
+
+
+class ChannelBacklog:
+    """Ordered spooled records and retry state for one channel"""
+
+    __slots__ = ('records', 'attempts', 'next_attempt')
+
+    def __init__(self):
+        self.records = deque()
+        self.attempts = 0
+        self.next_attempt = 0.0
+
+
+class DeliverySpool:
+    """Durable FIFO per channel for messages whose delivery failed
+
+    Records are appended to numbered segment files (``spool-N.jsonl``);
+    delivered sequence numbers go to a sibling ``spool-N.ack`` file. On
+    startup every segment is replayed minus its acks. A segment and its ack
+    file are deleted once every record in it is delivered and a newer
+    segment is active, so disk use tracks the undelivered backlog.
+
+    A background drainer retries each channel's oldest record with
+    exponential backoff and never skips ahead, so per-channel order is kept.
+    Records Discord rejects outright (a 4xx other than 429) are discarded
+    instead of retried, as is the whole backlog of a channel that still
+    cannot be resolved after ``max_unresolved`` attempts (deleted channel).
+    While a channel has a backlog, new messages for it should be spooled
+    behind it rather than sent live (see ``has_backlog``). Delivery is
+    at-least-once: a crash between sending and acking resends one message.
+    """
+
+    def __init__(self, directory='data/spool', segment_records=500, max_records=10000, max_backoff=300,
+                 max_unresolved=12):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.max_records = max_records
+        self.max_backoff = max_backoff
+        self.max_unresolved = max_unresolved
+        self.backlogs: Dict[int, ChannelBacklog] = {}
+        self.segment_pending: Dict[int, int] = {}
+        self.active_segment = 0
+        self.active_count = 0
+        self.next_seq = 0
+        self.stats = {'spooled': 0, 'delivered': 0, 'discarded': 0, 'retries': 0}
+        self._lock = asyncio.Lock()
+        self._event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def depth(self) -> int:
+        return sum(len(backlog.records) for backlog in self.backlogs.values())
+
+    def has_backlog(self, channel_id) -> bool:
+        """Whether messages for this channel are waiting in the spool"""
+        backlog = self.backlogs.get(channel_id)
+        return bool(backlog and backlog.records)
+
+    def _segment_path(self, index, suffix='jsonl'):
+        return os.path.join(self.directory, f"spool-{index:08d}.{suffix}")
+
+    async def load(self):
+        """Replay segments minus acknowledged records (once)"""
+        async with self._load_lock:
+            if not self._loaded:
+                await self._replay()
+
+    async def _replay(self):
+        indexes = sorted(
+            int(name[6:14]) for name in os.listdir(self.directory)
+            if name.startswith('spool-') and name.endswith('.jsonl')
+        )
+
+        for index in indexes:
+            acked = set()
+            ack_path = self._segment_path(index, 'ack')
+            if os.path.exists(ack_path):
+                async with aiofiles.open(ack_path, 'r') as f:
+                    async for line in f:
+                        if line.strip().isdigit():
+                            acked.add(int(line))
+
+            count = 0
+            async with aiofiles.open(self._segment_path(index), 'r') as f:
+                async for line in f:
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    count += 1
+                    self.next_seq = max(self.next_seq, data['seq'] + 1)
+                    if data['seq'] in acked:
+                        continue
+                    self._track(SpoolRecord(data['seq'], index, data['channel_id'], data['priority'], data['payload']))
+
+            self.active_segment = index
+            self.active_count = count
+
+        # Always start writing a fresh segment so old ones can be retired
+        self.active_segment += 1
+        self.active_count = 0
+
+        for index in indexes:
+            if not self.segment_pending.get(index):
+                self._remove_segment(index)
+
+        self._loaded = True
+        if self.depth:
+            logger.info(f"Delivery spool loaded {self.depth} undelivered messages")
+            self._event.set()
+
+    def _track(self, record):
+        backlog = self.backlogs.get(record.channel_id)
+        if backlog is None:
+            backlog = self.backlogs[record.channel_id] = ChannelBacklog()
+        backlog.records.append(record)
+        self.segment_pending[record.segment] = self.segment_pending.get(record.segment, 0) + 1
+
+    def _remove_segment(self, index):
+        self.segment_pending.pop(index, None)
+        for suffix in ('jsonl', 'ack'):
+            try:
+                os.remove(self._segment_path(index, suffix))
+            except FileNotFoundError:
+                pass
+
+    async def put(self, channel_id, priority, kwargs) -> bool:
+        """Append a message to the spool; False if it cannot be spooled"""
+        payload = serialize_payload(kwargs)
+        if payload is None:
+            return False
+        if not self._loaded:
+            await self.load()
+        if self.depth >= self.max_records:
+            self.stats['discarded'] += 1
+            logger.error(f"Delivery spool full, discarding message for channel {channel_id}")
+            return False
+
+        async with self._lock:
+            if self.active_count >= self.segment_records:
+                if not self.segment_pending.get(self.active_segment):
+                    self._remove_segment(self.active_segment)
+                self.active_segment += 1
+                self.active_count = 0
+
+            record = SpoolRecord(self.next_seq, self.active_segment, channel_id, priority, payload)
+            self.next_seq += 1
+            line = json.dumps({
+                'seq': record.seq,
+                'channel_id': channel_id,
+                'priority': priority,
+                'payload': payload,
+                'spooled_at': datetime.utcnow().isoformat()
+            })
+            async with aiofiles.open(self._segment_path(record.segment), 'a') as f:
+                await f.write(line + '\n')
+            self.active_count += 1
+
+        self._track(record)
+        self.stats['spooled'] += 1
+        self._event.set()
+        return True
+
+    async def _ack(self, record):
+        """Record delivery and retire fully delivered segments"""
+        async with self._lock:
+            async with aiofiles.open(self._segment_path(record.segment, 'ack'), 'a') as f:
+                await f.write(f"{record.seq}\n")
+
+            self.segment_pending[record.segment] -= 1
+            if not self.segment_pending[record.segment] and record.segment != self.active_segment:
+                self._remove_segment(record.segment)
+
+    def start(self, channel_getter: Callable, sender: Callable):
+        """Start the background drainer
+
+        ``channel_getter(channel_id)`` resolves a channel and
+        ``sender(channel, priority, **kwargs)`` delivers one message, raising
+        on failure.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain(channel_getter, sender))
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _drain(self, channel_getter, sender):
+        """Retry each channel's backlog in order, backing off on failure"""
+        await self.load()
+
+        while True:
+            try:
+                # Clear before scanning so a put() during the awaits below
+                # wakes the next wait instead of being lost
+                self._event.clear()
+                now = time.monotonic()
+                next_wake = None
+
+                for channel_id, backlog in list(self.backlogs.items()):
+                    if not backlog.records:
+                        del self.backlogs[channel_id]
+                        continue
+                    if backlog.next_attempt > now:
+                        next_wake = min(next_wake or backlog.next_attempt, backlog.next_attempt)
+                        continue
+                    await self._drain_channel(channel_id, backlog, channel_getter, sender)
+                    if backlog.records:
+                        next_wake = min(next_wake or backlog.next_attempt, backlog.next_attempt)
+
+                timeout = max(0.5, next_wake - time.monotonic()) if next_wake else None
+                try:
+                    await asyncio.wait_for(self._event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Delivery spool drainer error: {e}")
+                await asyncio.sleep(5)
+
+    async def _drain_channel(self, channel_id, backlog, channel_getter, sender):
+        """Deliver one channel's records oldest first until one fails"""
+        channel = channel_getter(channel_id)
+        if channel is None:
+            if backlog.attempts >= self.max_unresolved:
+                # Still unresolvable after ~30 minutes of backoff: the channel is gone
+                logger.error(f"Discarding {len(backlog.records)} spooled messages for unknown channel {channel_id}")
+                while backlog.records:
+                    self.stats['discarded'] += 1
+                    await self._ack(backlog.records.popleft())
+                return
+            # Not resolvable yet (startup, reconnect); try again later
+            self._back_off(backlog)
+            return
+
+        while backlog.records:
+            record = backlog.records[0]
+            try:
+                await sender(channel, record.priority, **deserialize_payload(record.payload))
+            except Exception as e:
+                if not is_permanent_failure(e):
+                    logger.warning(f"Spooled delivery to #{getattr(channel, 'name', channel_id)} failed: {e}")
+                    self._back_off(backlog)
+                    return
+                # Rejected outright; drop it rather than block the channel
+                logger.error(f"Discarding spooled message for #{getattr(channel, 'name', channel_id)}: {e}")
+                self.stats['discarded'] += 1
+            else:
+                self.stats['delivered'] += 1
+
+            backlog.records.popleft()
+            backlog.attempts = 0
+            await self._ack(record)
+
+    def _back_off(self, backlog):
+        backlog.attempts += 1
+        self.stats['retries'] += 1
+        backlog.next_attempt = time.monotonic() + min(self.max_backoff, 2 ** backlog.attempts)
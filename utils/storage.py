@@ -10,6 +10,8 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
+from utils.logger import logger
+
 class Storage:
     """Storage handler for bot data"""
     
@@ -28,6 +30,8 @@ class Storage:
         self.equipment_inventory_file = f'{self.data_dir}/equipment_inventory.json'
         self.training_progress_file = f'{self.data_dir}/training_progress.json'
         self.after_action_reports_file = f'{self.data_dir}/after_action_reports.json'
+        self.lockdown_snapshots_file = f'{self.data_dir}/lockdown_snapshots.json'
+        self.scheduled_punishments_file = f'{self.data_dir}/scheduled_punishments.jsonl'
         
         self._ensure_data_directory()
         self._lock = asyncio.Lock()
@@ -200,14 +204,6 @@ class Storage:
         """Load warning points"""
         return await self._load_json('data/warning_points.json')
     
-    async def save_notifications(self, notifications):
-        """Save notifications"""
-        await self._save_json('data/notifications.json', notifications)
-    
-    async def load_notifications(self):
-        """Load notifications"""
-        return await self._load_json('data/notifications.json')
-    
     async def save_roblox_links(self, links):
         """Save Roblox account links"""
         await self._save_json('data/roblox_links.json', links)
@@ -232,6 +228,30 @@ class Storage:
         """Load attendance data"""
         return await self._load_json('data/attendance_data.json')
     
+    async def save_voice_totals(self, totals):
+        """Save daily time-in-voice totals"""
+        await self._save_json('data/voice_totals.json', totals)
+    
+    async def load_voice_totals(self):
+        """Load daily time-in-voice totals"""
+        return await self._load_json('data/voice_totals.json')
+    
+    async def save_dm_deliverability(self, data):
+        """Save per-user DM delivery outcomes"""
+        await self._save_json('data/dm_deliverability.json', data)
+    
+    async def load_dm_deliverability(self):
+        """Load per-user DM delivery outcomes"""
+        return await self._load_json('data/dm_deliverability.json')
+    
+    async def save_scheduled_notifications(self, scheduled):
+        """Save notifications and DMs waiting for their delivery time"""
+        await self._save_json('data/scheduled_notifications.json', scheduled)
+    
+    async def load_scheduled_notifications(self):
+        """Load notifications and DMs waiting for their delivery time"""
+        return await self._load_json('data/scheduled_notifications.json')
+    
     async def save_user_preferences(self, preferences):
         """Save user preferences"""
         await self._save_json('data/user_preferences.json', preferences)
@@ -245,19 +265,6 @@ class Storage:
         try:
             current_time = datetime.utcnow()
             
-            # Clean up old notification data (older than 30 days)
-            notifications = await self.load_notifications()
-            if notifications:
-                filtered_notifications = []
-                for notification in notifications:
-                    try:
-                        notification_time = datetime.fromisoformat(notification['timestamp'])
-                        if (current_time - notification_time).days < 30:
-                            filtered_notifications.append(notification)
-                    except:
-                        continue
-                await self.save_notifications(filtered_notifications)
-            
             # Clean up old warning points (older than 90 days)
             warning_points = await self.load_warning_points()
             if warning_points:
@@ -405,4 +412,53 @@ class Storage:
     
     async def load_after_action_reports(self):
         """Load after action reports data"""
-        return await self._load_json(self.after_action_reports_file)
\ No newline at end of file
+        return await self._load_json(self.after_action_reports_file)
+    
+    # Lockdown Snapshot Methods
+    async def save_lockdown_snapshots(self, snapshots):
+        """Save channel overwrite snapshots taken before a lockdown"""
+        async with self._lock:
+            await self._save_json(self.lockdown_snapshots_file, snapshots)
+    
+    async def load_lockdown_snapshots(self):
+        """Load channel overwrite snapshots taken before a lockdown"""
+        return await self._load_json(self.lockdown_snapshots_file)
+    
+    # Scheduled Punishment Methods
+    async def append_scheduled_punishment_records(self, records):
+        """Append records to the scheduled punishment journal"""
+        async with self._lock:
+            async with aiofiles.open(self.scheduled_punishments_file, 'a') as f:
+                await f.write(''.join(json.dumps(record) + '\n' for record in records))
+    
+    async def load_scheduled_punishment_records(self):
+        """Load every record from the scheduled punishment journal"""
+        if not os.path.exists(self.scheduled_punishments_file):
+            return []
+        
+        records = []
+        async with self._lock:
+            async with aiofiles.open(self.scheduled_punishments_file, 'rb') as f:
+                data = await f.read()
+            
+            complete = data.rfind(b'\n') + 1
+            for number, line in enumerate(data[:complete].splitlines(), 1):
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping corrupt scheduled punishment record on line {number}")
+            
+            if complete < len(data):
+                # Drop a torn final line from an interrupted write so later
+                # appends start on a fresh line
+                async with aiofiles.open(self.scheduled_punishments_file, 'r+b') as f:
+                    await f.truncate(complete)
+        return records
+    
+    async def rewrite_scheduled_punishment_records(self, records):
+        """Atomically replace the journal with a compacted set of records"""
+        temp_file = f'{self.scheduled_punishments_file}.tmp'
+        async with self._lock:
+            async with aiofiles.open(temp_file, 'w') as f:
+                await f.write(''.join(json.dumps(record) + '\n' for record in records))
+            os.replace(temp_file, self.scheduled_punishments_file)
@@ -0,0 +1,172 @@
+"""
+Timer wheel utilities for Merrywinter Security Consulting Bot
+Central scheduler for deferred actions (delete message, edit embed, lift restriction)
+"""
+
+import asyncio
+import math
+from typing import Optional
+
+import discord
+
+from utils.logger import logger
+
+
+class ScheduledAction:
+    """A deferred coroutine call waiting in a wheel slot"""
+
+    __slots__ = ('slot', 'rounds', 'callback', 'args', 'kwargs', 'name', 'due', 'cancelled')
+
+    def __init__(self, slot, rounds, callback, args, kwargs, name, due):
+        self.slot = slot
+        self.rounds = rounds
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name
+        self.due = due
+        self.cancelled = False
+
+
+class TimerWheel:
+    """Hashed timer wheel for deferred actions
+
+    Handlers schedule an action and return immediately instead of sleeping,
+    so a spam wave leaves a small record per action rather than a suspended
+    coroutine. Insert and cancel are O(1): an action is stored in the slot
+    its deadline hashes to, with the number of full wheel turns still to
+    wait. A single driver task advances one slot per ``tick`` and runs the
+    actions that are due. At most ``max_pending`` actions are held; beyond
+    that new actions are dropped, counted and logged (once per time the
+    wheel fills), and ``schedule`` returns None so callers that must not
+    lose an action can fall back to ``loop.call_later``.
+    """
+
+    def __init__(self, tick=0.25, slots=256, max_pending=5000):
+        self.tick = tick
+        self.slots = slots
+        self.max_pending = max_pending
+        self.wheel = [dict() for _ in range(slots)]
+        self.cursor = 0
+        self.pending = 0
+        self.metrics = {'scheduled': 0, 'fired': 0, 'cancelled': 0, 'dropped': 0, 'failed': 0}
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._running = set()
+        self._full = False
+
+    def schedule(self, delay, callback, *args, name=None, **kwargs) -> Optional[ScheduledAction]:
+        """Run ``await callback(*args, **kwargs)`` after ``delay`` seconds
+
+        Returns a handle for ``cancel``, or None when the wheel is full.
+        """
+        if self.pending >= self.max_pending:
+            self.metrics['dropped'] += 1
+            if not self._full:
+                self._full = True
+                logger.warning(f"Timer wheel full ({self.max_pending} pending); dropping "
+                               f"{name or getattr(callback, '__name__', 'action')} and later actions until it drains")
+            return None
+        self._full = False
+
+        self._ensure_running()
+
+        ticks = max(1, math.ceil(delay / self.tick))
+        slot = (self.cursor + ticks) % self.slots
+        rounds = (ticks - 1) // self.slots
+        loop = asyncio.get_running_loop()
+
+        action = ScheduledAction(slot, rounds, callback, args, kwargs,
+                                 name or getattr(callback, '__name__', 'action'), loop.time() + delay)
+        self.wheel[slot][action] = None
+        self.pending += 1
+        self.metrics['scheduled'] += 1
+        return action
+
+    def cancel(self, action: Optional[ScheduledAction]) -> bool:
+        """Cancel a scheduled action if it has not fired yet"""
+        if action is None or action.cancelled or action.slot is None:
+            return False
+
+        del self.wheel[action.slot][action]
+        action.slot = None
+        action.cancelled = True
+        self.pending -= 1
+        self.metrics['cancelled'] += 1
+        return True
+
+    def delete_later(self, message, delay):
+        """Delete a message after ``delay`` seconds"""
+        return self.schedule(delay, message.delete, name='delete_message')
+
+    def edit_later(self, message, delay, **kwargs):
+        """Edit a message after ``delay`` seconds"""
+        return self.schedule(delay, message.edit, name='edit_message', **kwargs)
+
+    def stats(self):
+        """Current wheel metrics"""
+        return {
+            'pending': self.pending,
+            'running': len(self._running),
+            'max_lag_ms': round(self.max_lag * 1000, 1),
+            **self.metrics
+        }
+
+    def _ensure_running(self):
+        """Start the driver task on first use"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._drive())
+
+    def stop(self):
+        """Stop the driver task; pending actions are discarded"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _drive(self):
+        """Advance the wheel one slot per tick, catching up after stalls"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick
+
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+            now = loop.time()
+            while now >= next_tick:
+                self.max_lag = max(self.max_lag, now - next_tick)
+                self._advance()
+                next_tick += self.tick
+
+    def _advance(self):
+        """Move the cursor and fire every action due in the new slot"""
+        self.cursor = (self.cursor + 1) % self.slots
+        bucket = self.wheel[self.cursor]
+        if not bucket:
+            return
+
+        due = []
+        for action in bucket:
+            if action.rounds:
+                action.rounds -= 1
+            else:
+                due.append(action)
+
+        for action in due:
+            del bucket[action]
+            action.slot = None
+            self.pending -= 1
+            task = asyncio.create_task(self._execute(action))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, action):
+        """Run one action, counting failures instead of raising"""
+        try:
+            await action.callback(*action.args, **action.kwargs)
+            self.metrics['fired'] += 1
+        except discord.NotFound:
+            # Target already gone (message deleted, member left)
+            self.metrics['fired'] += 1
+        except Exception as e:
+            self.metrics['failed'] += 1
+            logger.error(f"Scheduled action {action.name} failed: {e}")
@@ -0,0 +1,276 @@
+"""
+Voice session utilities for Merrywinter Security Consulting Bot
+Per-member voice sessions with daily time-in-voice totals
+"""
+
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+
+class OpenSession:
+    """A member's current voice session"""
+
+    __slots__ = ('channel_id', 'joined', 'since', 'moves', 'left_at')
+
+    def __init__(self, channel_id, joined):
+        self.channel_id = channel_id
+        self.joined = joined
+        # Time up to which this session has been added to the totals
+        self.since = joined
+        self.moves = 0
+        # Set while disconnected; the session resumes if they rejoin within the grace period
+        self.left_at: Optional[float] = None
+
+
+class VoiceTotals:
+    """Voice time for one member during a reporting period"""
+
+    __slots__ = ('sessions', 'seconds', 'moves')
+
+    def __init__(self):
+        self.sessions = 0
+        self.seconds = 0.0
+        self.moves = 0
+
+
+class DayTotals:
+    """Seconds in voice for one UTC day"""
+
+    __slots__ = ('members', 'channels', 'pairs', 'attended')
+
+    def __init__(self):
+        self.members = Counter()
+        self.channels = Counter()
+        self.pairs = Counter()
+        self.attended = set()
+
+
+def _day(ts) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d')
+
+
+def _next_midnight(ts) -> float:
+    moment = datetime.fromtimestamp(ts, timezone.utc)
+    return (moment.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)).timestamp()
+
+
+class VoiceSessionTracker:
+    """Voice sessions opened and closed in O(1) per state change
+
+    Each member in voice has one OpenSession keyed by user id. Time is added
+    to the daily totals (per member, per channel and per member/channel
+    pair, split at UTC midnight) whenever a member moves or leaves and on
+    every ``sweep``. A leave does not end the session straight away: if the
+    member rejoins within ``reconnect_grace`` seconds (a client reconnect)
+    the same session continues. Sessions left for longer are closed on the
+    next sweep.
+
+    Channels are mapped to attendance event types by id
+    (``attendance_channels``) or by name keywords (``attendance_keywords``).
+    Once a member has spent ``attendance_min_seconds`` in such a channel on
+    a given day, one attendance entry is queued for them; collect queued
+    attendance and finished sessions with ``take_events``.
+    """
+
+    def __init__(self, reconnect_grace=60, retention_days=30, attendance_channels=None, attendance_keywords=None,
+                 attendance_min_seconds=600):
+        self.reconnect_grace = reconnect_grace
+        self.retention_days = retention_days
+        self.attendance_channels: Dict[int, str] = attendance_channels or {}
+        self.attendance_keywords: Dict[str, List[str]] = attendance_keywords or {}
+        self.attendance_min_seconds = attendance_min_seconds
+
+        self.sessions: Dict[int, OpenSession] = {}
+        self.days: Dict[str, DayTotals] = {}
+        self.channel_names: Dict[int, str] = {}
+        self.channel_types: Dict[int, Optional[str]] = {}
+
+        self.period_totals: Dict[int, VoiceTotals] = {}
+        self.period_channels = Counter()
+        self.period_started = time.time()
+
+        self.attendance: List[Tuple[int, str, str]] = []
+        self.ended: List[Tuple[int, int, float]] = []
+        self.dirty = False
+
+    @property
+    def open_count(self) -> int:
+        return sum(1 for session in self.sessions.values() if session.left_at is None)
+
+    def _classify(self, channel):
+        """Remember a channel's name and attendance type"""
+        if channel.id not in self.channel_types:
+            event_type = self.attendance_channels.get(channel.id)
+            if event_type is None:
+                name = channel.name.lower()
+                event_type = next(
+                    (kind for kind, words in self.attendance_keywords.items() if any(word in name for word in words)),
+                    None
+                )
+            self.channel_types[channel.id] = event_type
+        self.channel_names[channel.id] = channel.name
+
+    def update(self, user_id, before_channel, after_channel, now=None):
+        """Apply a voice state change (channels may be None)"""
+        before_id = before_channel.id if before_channel else None
+        after_id = after_channel.id if after_channel else None
+        if before_id == after_id:
+            return
+        now = now or time.time()
+        if after_channel is not None:
+            self._classify(after_channel)
+
+        session = self.sessions.get(user_id)
+
+        if after_id is None:
+            if session is not None and session.left_at is None:
+                self._accrue(user_id, session, now)
+                session.left_at = now
+            return
+
+        if session is not None and session.left_at is not None:
+            if now - session.left_at <= self.reconnect_grace:
+                # Reconnect: pick the session back up without counting the gap
+                session.left_at = None
+                session.since = now
+                if session.channel_id != after_id:
+                    self._move(user_id, session, after_id)
+                return
+            self._close(user_id, session)
+            session = None
+
+        if session is None:
+            self.sessions[user_id] = OpenSession(after_id, now)
+            return
+
+        # Moved (or a leave event was missed): credit the old channel first
+        self._accrue(user_id, session, now)
+        self._move(user_id, session, after_id)
+
+    def seed(self, user_id, channel, now=None):
+        """Open a session for someone already in voice (after a restart)"""
+        if user_id not in self.sessions:
+            self._classify(channel)
+            self.sessions[user_id] = OpenSession(channel.id, now or time.time())
+
+    def _move(self, user_id, session, channel_id):
+        session.channel_id = channel_id
+        session.moves += 1
+        self.period_totals.setdefault(user_id, VoiceTotals()).moves += 1
+
+    def _close(self, user_id, session):
+        del self.sessions[user_id]
+        self.period_totals.setdefault(user_id, VoiceTotals()).sessions += 1
+        self.ended.append((user_id, session.channel_id, session.left_at - session.joined))
+
+    def _accrue(self, user_id, session, now):
+        """Add time since the last accrual to the day, period and attendance totals"""
+        channel_id = session.channel_id
+        start = session.since
+        session.since = now
+        if now <= start:
+            return
+
+        period_seconds = now - max(start, self.period_started)
+        if period_seconds > 0:
+            self.period_totals.setdefault(user_id, VoiceTotals()).seconds += period_seconds
+            self.period_channels[channel_id] += period_seconds
+
+        while start < now:
+            end = min(now, _next_midnight(start))
+            day = _day(start)
+            totals = self.days.get(day)
+            if totals is None:
+                totals = self.days[day] = DayTotals()
+            seconds = end - start
+            totals.members[user_id] += seconds
+            totals.channels[channel_id] += seconds
+            totals.pairs[(user_id, channel_id)] += seconds
+
+            event_type = self.channel_types.get(channel_id)
+            if (event_type and (user_id, channel_id) not in totals.attended
+                    and totals.pairs[(user_id, channel_id)] >= self.attendance_min_seconds):
+                totals.attended.add((user_id, channel_id))
+                name = self.channel_names.get(channel_id, str(channel_id))
+                self.attendance.append((user_id, event_type, f"{name} ({day})"))
+            start = end
+
+        self.dirty = True
+
+    def sweep(self, now=None):
+        """Credit time for open sessions and close those left past the grace period"""
+        now = now or time.time()
+        for user_id, session in list(self.sessions.items()):
+            if session.left_at is None:
+                self._accrue(user_id, session, now)
+            elif now - session.left_at > self.reconnect_grace:
+                self._close(user_id, session)
+
+        cutoff = _day(now - self.retention_days * 86400)
+        for day in [day for day in self.days if day < cutoff]:
+            del self.days[day]
+            self.dirty = True
+
+    def take_events(self):
+        """Return and clear queued attendance entries and finished sessions"""
+        attendance, ended = self.attendance, self.ended
+        self.attendance, self.ended = [], []
+        return attendance, ended
+
+    def drain_period(self, now=None):
+        """Return per-member and per-channel totals since the last drain"""
+        totals, channels = self.period_totals, self.period_channels
+        self.period_totals, self.period_channels = {}, Counter()
+        self.period_started = now or time.time()
+        return totals, channels
+
+    def member_days(self, user_id, days=7, now=None) -> List[Tuple[str, float]]:
+        """Seconds in voice per day for one member, most recent first"""
+        now = now or time.time()
+        result = []
+        for offset in range(days):
+            day = _day(now - offset * 86400)
+            totals = self.days.get(day)
+            result.append((day, totals.members.get(user_id, 0.0) if totals else 0.0))
+        return result
+
+    def member_channels(self, user_id, days=7, now=None) -> Counter:
+        """Seconds per channel for one member over the last ``days`` days"""
+        now = now or time.time()
+        channels = Counter()
+        for offset in range(days):
+            totals = self.days.get(_day(now - offset * 86400))
+            if totals:
+                for (member_id, channel_id), seconds in totals.pairs.items():
+                    if member_id == user_id:
+                        channels[channel_id] += seconds
+        return channels
+
+    def to_dict(self) -> dict:
+        """Serializable daily totals"""
+        self.dirty = False
+        return {
+            day: {
+                'members': {str(user_id): round(seconds) for user_id, seconds in totals.members.items()},
+                'channels': {str(channel_id): round(seconds) for channel_id, seconds in totals.channels.items()},
+                'pairs': {f"{user_id}:{channel_id}": round(seconds) for (user_id, channel_id), seconds in totals.pairs.items()},
+                'attended': [f"{user_id}:{channel_id}" for user_id, channel_id in totals.attended]
+            }
+            for day, totals in self.days.items()
+        }
+
+    def load_dict(self, data):
+        """Restore daily totals saved by ``to_dict``"""
+        for day, saved in (data or {}).items():
+            totals = DayTotals()
+            totals.members.update({int(key): value for key, value in saved.get('members', {}).items()})
+            totals.channels.update({int(key): value for key, value in saved.get('channels', {}).items()})
+            for key, value in saved.get('pairs', {}).items():
+                user_id, channel_id = key.split(':')
+                totals.pairs[(int(user_id), int(channel_id))] = value
+            for key in saved.get('attended', []):
+                user_id, channel_id = key.split(':')
+                totals.attended.add((int(user_id), int(channel_id)))
+            self.days[day] = totals